@@ -0,0 +1,262 @@
+"""End-to-end benchmark of fetching and extracting a tag through the Controller.
+
+    python -m benchmarks.bench_controller --latency 0.02 --tag footer
+    python -m benchmarks.bench_controller --corpus saved_pages --compare old.json
+
+A local fixture server serves every page of the corpus and each page is
+requested through Controller.get_one_tag, which runs FetchUrlUseCaseImpl,
+ConvertIntoBeautifulSoupUseCaseImpl and GetOneTagUseCaseImpl. Every page is
+measured in a fresh process so peak RSS belongs to that page alone and no
+parse is reused. Results are written as JSON tagged with the git commit, so
+runs of two commits can be compared with --compare.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from typing import Optional
+
+from benchmarks.fixture_server import (
+    DEFAULT_SIZES,
+    FixtureServer,
+    generate_corpus,
+    load_corpus,
+)
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_DIR, "benchmarks", "results")
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident set size of this process in bytes, None where unknown"""
+    # VmHWM starts over in a new process image, while ru_maxrss keeps the
+    # peak of the parent that spawned us
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    rank = q * (len(ordered) - 1)
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def run_case(
+    url: str, tag: str, requests: int, warmup: int, concurrency: int, parser: str
+) -> dict:
+    """Fetch and extract url repeatedly, runs in its own process"""
+    from interface_adapter.controller.controller import Controller
+    from usecases.impl.convert_into_beautifulsoup_use_case_impl import (
+        ConvertIntoBeautifulSoupUseCaseImpl,
+    )
+    from usecases.impl.fetch_url_use_case_impl import FetchUrlUseCaseImpl
+    from usecases.impl.get_one_tag_use_case_impl import GetOneTagUseCaseImpl
+
+    controller = Controller(
+        fetch_url_use_case=FetchUrlUseCaseImpl(),
+        convert_into_beautifulsoup_use_case=ConvertIntoBeautifulSoupUseCaseImpl(parser),
+        get_one_tag_use_case=GetOneTagUseCaseImpl(),
+    )
+
+    def one(_) -> tuple[float, str]:
+        started = time.perf_counter()
+        _, error = controller.get_one_tag(url, tag)
+        return time.perf_counter() - started, error
+
+    for _ in range(warmup):
+        one(None)
+    baseline = peak_rss()
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(one, range(requests)))
+    else:
+        results = [one(None) for _ in range(requests)]
+    elapsed = time.perf_counter() - started
+
+    latencies = [seconds for seconds, _ in results]
+    errors = [error for _, error in results if error]
+    peak = peak_rss()
+    return {
+        "requests": requests,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else "",
+        "seconds": elapsed,
+        "pages_per_s": requests / elapsed,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "peak_rss_mb": peak / 2**20 if peak is not None else None,
+        "baseline_rss_mb": baseline / 2**20 if baseline is not None else None,
+        "parser": controller.convert_into_beatifulsoup_use_case.parser,
+    }
+
+
+def git_commit() -> dict:
+    """The commit being measured and whether the tree had local changes"""
+
+    def git(*args) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    try:
+        return {
+            "commit": git("rev-parse", "HEAD"),
+            "dirty": bool(git("status", "--porcelain")),
+        }
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": "unknown", "dirty": None}
+
+
+def compare(results: dict, path: str):
+    """Print the change of every page measured in both runs"""
+    with open(path, encoding="utf-8") as file:
+        previous = {case["page"]: case for case in json.load(file)["cases"]}
+    print(f"\ncompared with {path}")
+    for case in results["cases"]:
+        old = previous.get(case["page"])
+        if old is None:
+            continue
+        print(
+            f"{case['page']:<24}"
+            f" pages/s {_change(old['pages_per_s'], case['pages_per_s'])}"
+            f"  p99 {_change(old['p99_ms'], case['p99_ms'])}"
+            f"  peak RSS {_change(old['peak_rss_mb'], case['peak_rss_mb'])}"
+        )
+
+
+def _change(old, new) -> str:
+    if not old or new is None:
+        return "n/a"
+    return f"{(new - old) / old * 100:+7.1f}%"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Controller fetch path")
+    parser.add_argument("--corpus", help="directory of saved html pages to serve")
+    parser.add_argument(
+        "--sizes",
+        help="generated pages as name=bytes pairs, e.g. small=8192,huge=52428800",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tag", default="footer", help="tag extracted from every page")
+    parser.add_argument("--requests", type=int, default=50, help="requests per page")
+    parser.add_argument(
+        "--max-mb",
+        type=int,
+        default=500,
+        help="fewer requests for pages this large in total",
+    )
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="server delay in seconds"
+    )
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--parser", default="auto")
+    parser.add_argument(
+        "-o", "--output", help="results file, default results/<commit>.json"
+    )
+    parser.add_argument("--compare", help="earlier results file to compare with")
+    args = parser.parse_args(argv)
+
+    if args.corpus:
+        pages = load_corpus(args.corpus)
+        if not pages:
+            print(f"No html pages found in {args.corpus}", file=sys.stderr)
+            return 1
+    else:
+        sizes = DEFAULT_SIZES
+        if args.sizes:
+            sizes = {
+                name: int(size)
+                for name, size in (pair.split("=") for pair in args.sizes.split(","))
+            }
+        pages = generate_corpus(sizes, args.seed)
+
+    results = {
+        **git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            key: getattr(args, key)
+            for key in (
+                "corpus",
+                "seed",
+                "tag",
+                "requests",
+                "warmup",
+                "concurrency",
+                "latency",
+                "jitter",
+                "parser",
+            )
+        },
+        "cases": [],
+    }
+    print(
+        f"{'page':<24} {'KB':>9} {'pages/s':>9}"
+        f" {'p50 ms':>9} {'p99 ms':>9} {'RSS MB':>8}"
+    )
+    with FixtureServer(pages, args.latency, args.jitter, seed=args.seed) as server:
+        for name, page in pages.items():
+            requests = max(
+                3, min(args.requests, (args.max_mb << 20) // max(len(page), 1))
+            )
+            # A fresh spawned process per page keeps peak RSS and caches apart
+            with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+                case = pool.submit(
+                    run_case, server.url(name), args.tag, requests, args.warmup,
+                    args.concurrency, args.parser,
+                ).result()
+            case = {"page": name, "bytes": len(page), **case}
+            results["cases"].append(case)
+            rss = (
+                f"{case['peak_rss_mb']:>8.1f}"
+                if case["peak_rss_mb"] is not None
+                else f"{'n/a':>8}"
+            )
+            print(
+                f"{name[:24]:<24} {len(page) / 1024:>9.1f} {case['pages_per_s']:>9.1f} "
+                f"{case['p50_ms']:>9.2f} {case['p99_ms']:>9.2f} {rss}"
+            )
+            if case["errors"]:
+                print(f"  {case['errors']} errors, first: {case['first_error']}")
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{results['commit'][:12]}.json")
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"\nresults written to {output}")
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Compare parse time and peak memory of every installed parser backend.
+
+    python -m benchmarks.bench_parsers path/to/saved/pages --repeat 5
+
+Every ``*.html``/``*.htm`` file under the corpus directory is parsed with each
+backend. Peak memory is measured with tracemalloc, so it covers the Python
+tree objects but not buffers allocated inside C extensions such as libxml2.
+"""
+
+import argparse
+import gc
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from usecases.impl.parser_backends import available_backends, get_builder
+
+
+def load_corpus(directory: str) -> list[tuple[str, bytes]]:
+    paths = sorted(
+        path
+        for path in Path(directory).rglob("*")
+        if path.suffix.lower() in (".html", ".htm")
+    )
+    return [(path.name, path.read_bytes()) for path in paths]
+
+
+def measure(backend: str, html: bytes, repeat: int) -> tuple[float, int]:
+    """Return the median parse time in seconds and the peak traced bytes"""
+    build = get_builder(backend)
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        build(html)
+        timings.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    soup = build(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del soup
+    return statistics.median(timings), peak
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark parser backends")
+    parser.add_argument("corpus", help="directory of saved html pages")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backend", action="append", help="limit to a backend")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print(f"No html pages found in {args.corpus}", file=sys.stderr)
+        return 1
+
+    backends = args.backend or available_backends()
+    print(f"{'page':<32} {'size KB':>9} {'backend':<12} {'ms':>9} {'peak MB':>9}")
+    totals = {backend: 0.0 for backend in backends}
+    for name, html in corpus:
+        for backend in backends:
+            seconds, peak = measure(backend, html, args.repeat)
+            totals[backend] += seconds
+            print(
+                f"{name[:32]:<32} {len(html) / 1024:>9.1f} {backend:<12} "
+                f"{seconds * 1000:>9.2f} {peak / 2**20:>9.2f}"
+            )
+
+    print()
+    for backend, seconds in sorted(totals.items(), key=lambda item: item[1]):
+        print(f"{backend:<12} total {seconds * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Measure GUI cold start: import time of main.py and time to the first frame.
+
+    python -m benchmarks.bench_startup --runs 10
+    python -m benchmarks.bench_startup --compare benchmarks/results/startup-abc.json
+
+Every run is a fresh interpreter. Import time comes from ``-X importtime``;
+time to first frame is the wall time from launching the process until the
+window receives its first paint event, with main.main() building the window
+exactly as a user launch does. Without a display the offscreen Qt platform is
+used, which skips the compositor but still lays out and paints every widget.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.bench_controller import REPO_DIR, RESULTS_DIR, git_commit
+
+# Run in the child: report seconds from launch to the first paint, then quit
+_FIRST_FRAME = r"""
+import sys, time
+launched = float(sys.argv[1])
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication(sys.argv[:1])
+
+
+class FirstPaint(QObject):
+    seen = False
+
+    def eventFilter(self, watched, event):
+        if not self.seen and event.type() == QEvent.Type.Paint:
+            self.seen = True
+            print(time.time() - launched, flush=True)
+            QTimer.singleShot(0, app.quit)
+        return False
+
+
+first_paint = FirstPaint()
+app.installEventFilter(first_paint)
+import main
+
+main.main()
+"""
+
+
+def _environment() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_DIR, env.get("PYTHONPATH")]))
+    if sys.platform.startswith("linux") and not (
+        env.get("DISPLAY") or env.get("WAYLAND_DISPLAY")
+    ):
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return env
+
+
+def measure_imports(module: str) -> dict[str, tuple[int, int]]:
+    """Return name -> (self, cumulative) microseconds for one cold import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_DIR,
+        env=_environment(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def measure_first_frame() -> float:
+    """Seconds from launching a process until the main window first paints"""
+    launched = time.time()
+    result = subprocess.run(
+        [sys.executable, "-c", _FIRST_FRAME, repr(launched)],
+        cwd=REPO_DIR,
+        env=_environment(),
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    lines = result.stdout.split()
+    if result.returncode or not lines:
+        raise RuntimeError(f"First frame run failed: {result.stderr.strip()[-500:]}")
+    return float(lines[0])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure GUI cold start")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--module", default="main", help="module whose import is timed")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules listed")
+    parser.add_argument(
+        "-o", "--output", help="results file, default results/startup-<commit>.json"
+    )
+    parser.add_argument("--compare", help="earlier results file to compare with")
+    args = parser.parse_args(argv)
+
+    imports = [measure_imports(args.module) for _ in range(args.runs)]
+    totals = [run[args.module][1] / 1000 for run in imports]
+    # Median self time per module over the runs, to name the slow imports
+    names = set().union(*imports)
+    own = {
+        name: statistics.median(run.get(name, (0, 0))[0] for run in imports) / 1000
+        for name in names
+    }
+    slowest = sorted(own.items(), key=lambda item: item[1], reverse=True)[: args.top]
+    frames = [measure_first_frame() * 1000 for _ in range(args.runs)]
+
+    results = {
+        **git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "import_ms": statistics.median(totals),
+        "import_ms_min": min(totals),
+        "first_frame_ms": statistics.median(frames),
+        "first_frame_ms_min": min(frames),
+        "heavy_modules_loaded": sorted(
+            name
+            for name in ("bs4", "requests", "soupsieve", "lxml", "asyncio")
+            if name in names
+        ),
+        "slowest_imports_ms": dict(slowest),
+    }
+    print(
+        f"import {args.module}: median {results['import_ms']:.1f} ms,"
+        f" min {results['import_ms_min']:.1f} ms"
+    )
+    print(
+        f"first frame: median {results['first_frame_ms']:.1f} ms,"
+        f" min {results['first_frame_ms_min']:.1f} ms"
+    )
+    heavy = ", ".join(results["heavy_modules_loaded"]) or "none"
+    print(f"heavy modules imported at startup: {heavy}")
+    print("\nslowest imports (self ms):")
+    for name, ms in slowest:
+        print(f"  {ms:8.1f}  {name}")
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"startup-{results['commit'][:12]}.json")
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"\nresults written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            previous = json.load(file)
+        for key in ("import_ms", "first_frame_ms"):
+            change = (results[key] - previous[key]) / previous[key] * 100
+            print(
+                f"{key}: {previous[key]:.1f} -> {results[key]:.1f} ms ({change:+.1f}%)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""Local stand-in HTTP server serving a fixed corpus of pages for benchmarks.
+
+Pages are served from memory over keep-alive HTTP/1.1 after a configurable
+delay, so runs are offline and repeatable. The corpus is either a directory
+of saved pages or a synthetic one generated from a seed.
+"""
+
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+# Sizes of the generated pages, from a small article to a huge table dump
+DEFAULT_SIZES = {
+    "small": 8 << 10,
+    "medium": 256 << 10,
+    "large": 5 << 20,
+    "huge": 50 << 20,
+}
+
+_WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud"
+).split()
+
+
+def generate_page(size: int, seed: int = 0) -> bytes:
+    """Build an html page of about size bytes with nested markup.
+
+    The page has a title in the head and a footer as its last element, so a
+    benchmark can ask for a tag that is found at once or only after reading
+    the whole document.
+    """
+    rng = random.Random(seed)
+    head = (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>Fixture page {size}</title></head><body>"
+        "<nav><ul><li><a href=\"/\">Home</a></li><li><a href=\"/about\">About</a>"
+        "</li></ul></nav><main>"
+    ).encode()
+    tail = b"</main><footer><p>End of fixture page</p></footer></body></html>"
+    # A few distinct blocks repeated keeps generation fast for 50 MB pages
+    blocks = []
+    for index in range(16):
+        words = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(20, 60)))
+        blocks.append(
+            (
+                f"<article id=\"a{index}\"><h2>{words[:30]}</h2>"
+                f"<p class=\"text\">{words}</p><table><tr><td>{index}</td>"
+                f"<td><a href=\"/page/{index}\">{words[:12]}</a></td></tr></table>"
+                "</article>"
+            ).encode()
+        )
+    body = bytearray(head)
+    while len(body) + len(tail) < size:
+        body += blocks[rng.randrange(len(blocks))]
+    body += tail
+    return bytes(body)
+
+
+def generate_corpus(
+    sizes: Optional[dict[str, int]] = None, seed: int = 0
+) -> dict[str, bytes]:
+    """Return name -> page for every size class, the same for the same seed"""
+    sizes = sizes or DEFAULT_SIZES
+    return {
+        f"{name}.html": generate_page(size, seed + index)
+        for index, (name, size) in enumerate(sizes.items())
+    }
+
+
+def load_corpus(directory: str) -> dict[str, bytes]:
+    """Return name -> page for the saved .html/.htm pages under directory"""
+    return {
+        path.name: path.read_bytes()
+        for path in sorted(Path(directory).rglob("*"))
+        if path.suffix.lower() in (".html", ".htm")
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes, Nagle would hold the body
+    # back until the client's delayed ACK and add ~40 ms to every response
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server: FixtureServer = self.server.fixture
+        server.delay()
+        page = server.pages.get(self.path.lstrip("/").split("?", 1)[0])
+        if page is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(page)))
+        self.end_headers()
+        self.wfile.write(page)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Serve pages from memory on localhost with an added per-request latency"""
+
+    def __init__(
+        self,
+        pages: dict[str, bytes],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        port: int = 0,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            pages (dict[str, bytes]): Page name, served at /name, to its body
+            latency (float): Seconds waited before answering every request
+            jitter (float): Up to this many seconds are added at random
+            port (int): Port to listen on, 0 picks a free one
+        """
+        self.pages = pages
+        self.latency = latency
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fixture = self
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    def url(self, name: str) -> str:
+        return f"http://127.0.0.1:{self.port}/{name}"
+
+    def delay(self):
+        seconds = self.latency
+        if self.jitter:
+            with self._rng_lock:
+                seconds += self._rng.uniform(0, self.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="fixture-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
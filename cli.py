@@ -0,0 +1,433 @@
+"""Headless batch runner for the extraction pipeline.
+
+Runs the same use cases as the desktop app without importing PyQt6, so it can
+be scheduled from cron or run inside a container:
+
+    python cli.py urls.txt --tag table -o results.jsonl
+    python cli.py jobs.jsonl -o results.jsonl
+    python cli.py --pipeline pipelines/page_outline.yaml
+    python cli.py --pipeline pipelines/page_outline.yaml --checkpoint job.log
+
+Input is either a plain list of urls (one per line, ``#`` starts a comment) or
+a JSONL file whose records carry a ``url`` and optionally a ``tag`` or a
+``structure`` expression (CSS selector or XPath-like path). Pipeline specs
+(see ``pipelines/``) are compiled into one plan and write to their own sinks.
+"""
+
+import argparse
+import json
+import os
+import sys
+from contextlib import nullcontext
+from typing import Iterator, Optional, Tuple
+
+from usecases.impl.fetch_url_use_case_impl import FetchUrlUseCaseImpl as fuUseCase
+from usecases.impl.resilient_fetch_url_use_case_impl import (
+    CircuitBreaker,
+    ResilientFetchUrlUseCaseImpl as rfuUseCase,
+    RetryBudget,
+)
+from usecases.impl.cached_fetch_url_use_case_impl import (
+    CachedFetchUrlUseCaseImpl as cfuUseCase,
+)
+from usecases.impl.async_fetch_url_use_case_impl import (
+    AsyncFetchUrlUseCaseImpl as afuUseCase,
+)
+from usecases.impl.convert_into_beautifulsoup_use_case_impl import (
+    ConvertIntoBeautifulSoupUseCaseImpl as cibsuUseCase,
+)
+from usecases.impl.get_one_tag_use_case_impl import GetOneTagUseCaseImpl as gotuUseCase
+from usecases.impl.get_all_by_html_structure_use_case_impl import (
+    GetAllByHtmlStructureUseCaseImpl as gabhsUseCase,
+)
+from usecases.impl.process_pool_extract_many_use_case_impl import (
+    ProcessPoolExtractManyUseCaseImpl as ppemUseCase,
+)
+from interface_adapter.controller.controller import Controller
+from interface_adapter.controller.document_cache import DocumentCache
+from interface_adapter.controller.metrics import Metrics
+from interface_adapter.controller.job_profiler import JobProfiler
+from interface_adapter.pipeline.checkpoint import JobCheckpoint
+from interface_adapter.pipeline.plan import compile_plan, run_plan
+from interface_adapter.pipeline.spec import load_spec, read_url_list
+from interface_adapter.sinks.sink import Sink, sink_for_path
+from interface_adapter.sinks.database_sink import close_pools
+
+
+def build_controller(args: argparse.Namespace) -> Controller:
+    fetch_url_use_case = fuUseCase(timeout=(args.connect_timeout, args.read_timeout))
+    if args.retries:
+        fetch_url_use_case = rfuUseCase(
+            delegate=fetch_url_use_case,
+            max_retries=args.retries,
+            backoff=args.retry_backoff,
+            budget=RetryBudget(ratio=args.retry_budget),
+            breaker=CircuitBreaker(args.breaker_failures, args.breaker_cooldown),
+        )
+    if args.cache_dir:
+        fetch_url_use_case = cfuUseCase(
+            args.cache_dir,
+            delegate=fetch_url_use_case,
+            max_bytes=args.cache_max_mb << 20,
+        )
+    fetch_url_use_case = afuUseCase(
+        delegate=fetch_url_use_case,
+        max_concurrency=args.concurrency,
+        max_per_host=args.per_host,
+    )
+    return Controller(
+        fetch_url_use_case=fetch_url_use_case,
+        convert_into_beautifulsoup_use_case=cibsuUseCase(parser=args.parser),
+        get_one_tag_use_case=gotuUseCase(),
+        get_all_by_html_structure_use_case=gabhsUseCase(),
+        document_cache=DocumentCache(),
+        extract_many_use_case=(
+            ppemUseCase(args.workers, args.chunk_size, parser=args.parser)
+            if args.workers
+            else None
+        ),
+        metrics=Metrics() if args.metrics_out else None,
+    )
+
+
+def read_jobs(path: str, default_tag: str) -> Iterator[Tuple[str, str, str]]:
+    """Yield (url, kind, expression) jobs from a url list or a JSONL file.
+
+    kind is "tag" for single-tag jobs and "structure" for structure expressions.
+    """
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                record = json.loads(line)
+                if "structure" in record:
+                    yield record["url"], "structure", record["structure"]
+                else:
+                    yield record["url"], "tag", record.get("tag", default_tag)
+            else:
+                yield line, "tag", default_tag
+
+
+def extract_in_process(
+    controller: Controller, jobs_by_url: dict[str, list[Tuple[str, str]]]
+) -> Iterator[Tuple[str, dict, str]]:
+    """Fetch concurrently and extract on this process, one url at a time"""
+    for url, response, error in controller.fetch_many(jobs_by_url):
+        extracted = {"tags": {}, "structures": {}}
+        if error:
+            yield url, extracted, error
+            continue
+        tags = [expression for kind, expression in jobs_by_url[url] if kind == "tag"]
+        if tags:
+            extracted["tags"], error = controller.extract_tags(response.text, tags)
+        for kind, expression in jobs_by_url[url]:
+            if kind == "structure" and not error:
+                extracted["structures"][expression] = controller.extract_all(
+                    response.text, expression
+                )
+        yield url, extracted, error
+
+
+def extract_in_pool(
+    controller: Controller, jobs_by_url: dict[str, list[Tuple[str, str]]]
+) -> Iterator[Tuple[str, dict, str]]:
+    """Fetch concurrently and extract each url's own expressions on worker processes"""
+    per_url = {}
+    for url, url_jobs in jobs_by_url.items():
+        tags, structures = per_url[url] = ([], [])
+        for kind, expression in url_jobs:
+            expressions = tags if kind == "tag" else structures
+            if expression not in expressions:
+                expressions.append(expression)
+    return controller.fetch_and_extract(jobs_by_url, per_url=per_url)
+
+
+def run(controller: Controller, jobs: list[Tuple[str, str, str]], sink: Sink) -> int:
+    """Fetch every url once, run its jobs and write one record per job.
+
+    Returns:
+        int: The number of jobs that finished with an error
+    """
+    jobs_by_url: dict[str, list[Tuple[str, str]]] = {}
+    for url, kind, expression in jobs:
+        jobs_by_url.setdefault(url, []).append((kind, expression))
+
+    if controller.extract_many_use_case is not None:
+        results = extract_in_pool(controller, jobs_by_url)
+    else:
+        results = extract_in_process(controller, jobs_by_url)
+
+    failures = 0
+    for url, extracted, error in results:
+        records = []
+        for kind, expression in jobs_by_url[url]:
+            default = ([] if kind == "structure" else "", error)
+            result, job_error = extracted.get(kind + "s", {}).get(expression, default)
+            failures += bool(job_error)
+            records.append(
+                {
+                    "url": url,
+                    kind: expression,
+                    "result": result,
+                    "error": job_error,
+                }
+            )
+        sink.write(records)
+    return failures
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", nargs="?", help="url list or JSONL file of jobs")
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="file to write, .jsonl, .parquet, .feather or .csv (.gz compresses),"
+        " or a sqlite:/// or postgresql:// database url",
+    )
+    parser.add_argument(
+        "--table", default="results", help="table loaded when -o is a database url"
+    )
+    parser.add_argument(
+        "--key", help="comma-separated columns to upsert on when -o is a database url"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=10_000, help="records per written batch"
+    )
+    parser.add_argument(
+        "--compression", help="output codec, e.g. zstd, snappy, gzip or none"
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="append",
+        default=[],
+        help="pipeline spec to run, may be repeated; input then replaces its sources",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="pipeline job log; finished urls are skipped when run again",
+    )
+    parser.add_argument(
+        "--commit-every", type=int, default=1000, help="urls per checkpoint commit"
+    )
+    parser.add_argument("--tag", default="body", help="tag to extract by default")
+    parser.add_argument(
+        "--parser", default="auto", help="parser backend, auto picks the fastest"
+    )
+    parser.add_argument("--cache-dir", help="on-disk HTTP cache directory")
+    parser.add_argument("--cache-max-mb", type=int, default=1024)
+    parser.add_argument(
+        "--workers", type=int, default=0, help="extract on N worker processes"
+    )
+    parser.add_argument("--chunk-size", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--per-host", type=int, default=4)
+    parser.add_argument(
+        "--metrics-out",
+        help="write per-stage metrics in Prometheus text format to this file,"
+        " - for stderr",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        metavar="DIR",
+        help="write cProfile and tracemalloc reports, next to -o unless DIR is given",
+    )
+    parser.add_argument(
+        "--profile-sample",
+        type=float,
+        default=1.0,
+        help="fraction of runs profiled, e.g. 0.05 for scheduled jobs",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="retries of 429, 5xx and network errors, 0 disables",
+    )
+    parser.add_argument(
+        "--retry-backoff",
+        type=float,
+        default=0.5,
+        help="seconds of the first retry backoff",
+    )
+    parser.add_argument(
+        "--retry-budget",
+        type=float,
+        default=0.2,
+        help="retries allowed per request across the run",
+    )
+    parser.add_argument(
+        "--breaker-failures",
+        type=int,
+        default=5,
+        help="failures in a row that stop fetching a host",
+    )
+    parser.add_argument(
+        "--breaker-cooldown",
+        type=float,
+        default=30.0,
+        help="seconds before a stopped host is probed",
+    )
+    parser.add_argument("--connect-timeout", type=float, default=3.05)
+    parser.add_argument("--read-timeout", type=float, default=30.0)
+    args = parser.parse_args(argv)
+    if not args.pipeline and not (args.input and args.output):
+        parser.error("input and -o are required without --pipeline")
+    if args.checkpoint and not args.pipeline:
+        parser.error("--checkpoint needs --pipeline")
+    return args
+
+
+# Columns of the records run() writes; result is a string for tag jobs and
+# a list for structure jobs, so columnar files hold it as JSON text
+RECORD_SCHEMA = {
+    "url": "string",
+    "tag": "string",
+    "structure": "string",
+    "result": "json",
+    "error": "string",
+}
+
+
+def open_output(args: argparse.Namespace, resume_at: Optional[int] = None) -> Sink:
+    """Open the sink for -o, picked by the file extension"""
+    options = {"batch_size": args.batch_size, "table": args.table}
+    if not args.pipeline:
+        options["schema"] = RECORD_SCHEMA
+    if resume_at is not None:
+        options["resume_at"] = resume_at
+    if args.compression:
+        options["compression"] = args.compression
+    if args.key:
+        options["key"] = args.key.split(",")
+    return sink_for_path(args.output, **options)
+
+
+def run_pipelines(controller: Controller, args: argparse.Namespace) -> int:
+    """Compile the pipeline specs into one plan and run it.
+
+    Returns:
+        int: The number of records that finished with an error
+    """
+    try:
+        pipelines = [load_spec(path) for path in args.pipeline]
+    except (OSError, ValueError) as e:
+        print(f"An error occurred: {str(e)}", file=sys.stderr)
+        return 1
+    if args.input:
+        urls = list(read_url_list(args.input))
+        pipelines = [pipeline.with_urls(urls) for pipeline in pipelines]
+    checkpoint = None
+    sinks = None
+    try:
+        if args.checkpoint:
+            checkpoint = JobCheckpoint(args.checkpoint)
+            print(f"{len(checkpoint)} urls already done", file=sys.stderr)
+        if args.output:
+            if len(pipelines) > 1:
+                print("-o needs a single --pipeline", file=sys.stderr)
+                return 1
+            name = pipelines[0].name
+            resume_at = None
+            if checkpoint is not None:
+                resume_at = checkpoint.sink_offset(name) or 0
+            sinks = {name: open_output(args, resume_at)}
+    except (OSError, ValueError) as e:
+        print(f"An error occurred: {str(e)}", file=sys.stderr)
+        if checkpoint is not None:
+            checkpoint.close()
+        return 1
+
+    plan = compile_plan(pipelines)
+    print(json.dumps(plan.describe()), file=sys.stderr)
+    try:
+        stats, error = run_plan(
+            plan,
+            controller,
+            sinks,
+            checkpoint=checkpoint,
+            commit_every=args.commit_every,
+        )
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+    for name, counts in stats.items():
+        records, failed = counts["records"], counts["failed"]
+        print(f"{name}: {records} records, {failed} failed", file=sys.stderr)
+    if error:
+        print(error, file=sys.stderr)
+        return 1
+    return sum(counts["failed"] for counts in stats.values())
+
+
+def write_metrics(controller: Controller, path: str):
+    """Dump the controller's metrics for --metrics-out"""
+    if path == "-":
+        sys.stderr.write(controller.metrics.to_prometheus())
+        return
+    try:
+        controller.metrics.write_prometheus(path)
+    except OSError as e:
+        print(f"An error occurred: {str(e)}", file=sys.stderr)
+
+
+def shutdown(controller: Controller, args: argparse.Namespace):
+    if controller.extract_many_use_case is not None:
+        controller.extract_many_use_case.shutdown()
+    close_pools()
+    if args.metrics_out:
+        write_metrics(controller, args.metrics_out)
+
+
+def profile_job(args: argparse.Namespace):
+    """Context manager profiling this run when --profile was given"""
+    if args.profile is None:
+        return nullcontext()
+    directory = args.profile or "."
+    if not args.profile and args.output and "://" not in args.output:
+        directory = os.path.dirname(os.path.abspath(args.output))
+    profiler = JobProfiler(directory, sample_rate=args.profile_sample)
+    if args.pipeline:
+        name = "+".join(
+            os.path.splitext(os.path.basename(path))[0] for path in args.pipeline
+        )
+    else:
+        name = os.path.splitext(os.path.basename(args.input))[0]
+    return profiler.profile(name)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    controller = build_controller(args)
+    if args.pipeline:
+        try:
+            with profile_job(args) as report:
+                failed = run_pipelines(controller, args)
+            if report:
+                print(f"profile written to {report}.*", file=sys.stderr)
+            return 1 if failed else 0
+        finally:
+            shutdown(controller, args)
+    jobs = list(read_jobs(args.input, args.tag))
+
+    try:
+        with open_output(args) as sink, profile_job(args) as report:
+            failures = run(controller, jobs, sink)
+        if report:
+            print(f"profile written to {report}.*", file=sys.stderr)
+    except (OSError, ValueError) as e:
+        print(f"An error occurred: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        shutdown(controller, args)
+
+    print(f"{len(jobs)} jobs, {failures} failed", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,21 @@
-from typing import Tuple
+from typing import Iterable, Iterator, Optional, Tuple
 
 from usecases.fetch_url_use_case import FetchUrlUseCase as fu
 from usecases.convert_into_beautifulsoup_use_case import (
     ConvertIntoBeautifulSoupUseCase as cibsu,
 )
 from usecases.get_one_tag_use_case import GetOneTagUseCase as gotu
+from usecases.get_all_by_html_structure import GetAllByHtmlStructureUseCase as gabhs
+from usecases.extract_many_use_case import ExtractManyUseCase as emu
+from interface_adapter.controller.document_cache import DocumentCache
+from interface_adapter.controller.metrics import Metrics
+from interface_adapter.controller.instrumented_use_cases import (
+    InstrumentedFetchUrlUseCase,
+    InstrumentedConvertIntoBeautifulSoupUseCase,
+    InstrumentedGetOneTagUseCase,
+    InstrumentedGetAllByHtmlStructureUseCase,
+    InstrumentedExtractManyUseCase,
+)
 
 
 class Controller:
@@ -13,10 +24,205 @@ class Controller:
         fetch_url_use_case: fu,
         convert_into_beautifulsoup_use_case: cibsu,
         get_one_tag_use_case: gotu,
+        get_all_by_html_structure_use_case: gabhs = None,
+        document_cache: DocumentCache = None,
+        extract_many_use_case: emu = None,
+        metrics: Metrics = None,
     ):
+        """
+        Args:
+            metrics (Metrics): When given, every use case call is timed and
+                counted into it per stage and host
+        """
+        if metrics is not None:
+            fetch_url_use_case = InstrumentedFetchUrlUseCase(
+                fetch_url_use_case, metrics
+            )
+            convert_into_beautifulsoup_use_case = (
+                InstrumentedConvertIntoBeautifulSoupUseCase(
+                    convert_into_beautifulsoup_use_case, metrics
+                )
+            )
+            get_one_tag_use_case = InstrumentedGetOneTagUseCase(
+                get_one_tag_use_case, metrics
+            )
+            if get_all_by_html_structure_use_case is not None:
+                get_all_by_html_structure_use_case = (
+                    InstrumentedGetAllByHtmlStructureUseCase(
+                        get_all_by_html_structure_use_case, metrics
+                    )
+                )
+            if extract_many_use_case is not None:
+                extract_many_use_case = InstrumentedExtractManyUseCase(
+                    extract_many_use_case, metrics
+                )
+        self.metrics = metrics
         self.fetch_url_use_case = fetch_url_use_case
         self.convert_into_beatifulsoup_use_case = convert_into_beautifulsoup_use_case
         self.get_one_tag_use_case = get_one_tag_use_case
+        self.get_all_by_html_structure_use_case = get_all_by_html_structure_use_case
+        self.document_cache = document_cache
+        self.extract_many_use_case = extract_many_use_case
 
     def fetch_url(self, url: str) -> Tuple[str, str]:
         return self.fetch_url_use_case.execute(url)
+
+    def fetch_many(self, urls: Iterable[str]) -> Iterator[Tuple[str, str, str]]:
+        """Yield (url, response, error) for every url as soon as it is fetched"""
+        return self.fetch_url_use_case.fetch_many(urls)
+
+    def parse(self, html: str, parse_only: list[str] = None, stop_at_first=False):
+        """Parse html, reusing an earlier parse of the same content when cached"""
+
+        def convert():
+            return self.convert_into_beatifulsoup_use_case.execute(
+                html, parse_only=parse_only, stop_at_first=stop_at_first
+            )
+
+        if self.document_cache is None:
+            return convert()
+        digest = self.document_cache.digest(html)
+        if parse_only:
+            # A full parse of the same document answers any partial request
+            soup = self.document_cache.get((digest, None, False))
+            if soup is not None:
+                return soup, ""
+            key = (digest, tuple(sorted(parse_only)), stop_at_first)
+        else:
+            key = (digest, None, False)
+        return self.document_cache.get_or_parse(key, convert)
+
+    def extract_tag(self, html: str, tag: str) -> Tuple[str, str]:
+        """Parse the html and return the first matching tag as a string"""
+        results, error = self.extract_tags(html, [tag])
+        if error:
+            return "", error
+        return results[tag]
+
+    def extract_tags(
+        self, html: str, tags: list[str]
+    ) -> Tuple[dict[str, Tuple[str, str]], str]:
+        """Return the first match of every tag, parsing only what is needed.
+
+        Returns:
+            Tuple[dict, str]: (result, error) per tag and an error message for the parse
+        """
+        soup, error = self.parse(html, parse_only=list(tags), stop_at_first=True)
+        if error:
+            return {}, error
+        return self._find_tags(soup, tags), ""
+
+    def stream_tags(
+        self, url: str, tags: list[str], max_bytes: int = None
+    ) -> Tuple[dict[str, Tuple[str, str]], str]:
+        """Download the url in chunks and stop as soon as every tag was found.
+
+        Returns:
+            Tuple[dict, str]: (result, error) per tag and an error message for the fetch
+        """
+        chunks, error = self.fetch_url_use_case.stream(url, max_bytes=max_bytes)
+        if error:
+            return {}, error
+        soup, error = self.convert_into_beatifulsoup_use_case.execute_stream(
+            chunks, parse_only=list(tags)
+        )
+        if error:
+            return {}, error
+        return self._find_tags(soup, tags), ""
+
+    def _find_tags(self, soup, tags: list[str]) -> dict[str, Tuple[str, str]]:
+        results = {}
+        for tag in tags:
+            found, error = self.get_one_tag_use_case.execute(soup, tag)
+            if not error and found is None:
+                error = f"Tag <{tag}> not found"
+            results[tag] = (str(found) if not error else "", error)
+        return results
+
+    def get_one_tag(self, url: str, tag: str) -> Tuple[str, str]:
+        """Fetch the url and return the first matching tag as a string"""
+        response, error = self.fetch_url(url)
+        if error:
+            return "", error
+        return self.extract_tag(response.text, tag)
+
+    def extract_all(self, html: str, structure: str) -> Tuple[list[str], str]:
+        """Parse the html and return every element matching the structure"""
+        if self.get_all_by_html_structure_use_case is None:
+            return [], "Structure extraction is not configured"
+        soup, error = self.parse(html)
+        if error:
+            return [], error
+        found, error = self.get_all_by_html_structure_use_case.execute(
+            soup, structure
+        )
+        if error:
+            return [], error
+        return [str(tag) for tag in found], ""
+
+    def extract(
+        self, html: str, tags: list[str] = (), structures: list[str] = ()
+    ) -> Tuple[dict, str]:
+        """Run every tag and structure extraction over a single parse of html.
+
+        Returns:
+            Tuple[dict, str]: The same "tags" and "structures" mapping the
+                extract-many use case yields, and an error message for the parse
+        """
+        results = {"tags": {}, "structures": {}}
+        if structures:
+            soup, error = self.parse(html)
+        else:
+            soup, error = self.parse(html, parse_only=list(tags), stop_at_first=True)
+        if error:
+            return results, error
+        results["tags"] = self._find_tags(soup, tags)
+        for structure in structures:
+            if self.get_all_by_html_structure_use_case is None:
+                results["structures"][structure] = (
+                    [],
+                    "Structure extraction is not configured",
+                )
+                continue
+            found, error = self.get_all_by_html_structure_use_case.execute(
+                soup, structure
+            )
+            results["structures"][structure] = (
+                [str(tag) for tag in found] if not error else [],
+                error,
+            )
+        return results, ""
+
+    def fetch_and_extract(
+        self,
+        urls: Iterable[str],
+        tags: list[str] = (),
+        structures: list[str] = (),
+        per_url: Optional[dict[str, Tuple[list[str], list[str]]]] = None,
+    ) -> Iterator[Tuple[str, dict, str]]:
+        """Fetch urls and extract from them in parallel as pages arrive.
+
+        Raw page bytes stream from fetch_many into the extract-many use case;
+        fetch errors are passed through with an empty result. per_url maps a
+        url to the (tags, structures) of that page alone, in place of the
+        shared ones, so a page is only parsed as far as its own jobs need.
+        """
+        failed = []
+
+        def documents():
+            for url, response, error in self.fetch_many(urls):
+                if error:
+                    failed.append((url, error))
+                elif per_url is not None and url in per_url:
+                    yield (url, response.content, *per_url[url])
+                else:
+                    yield url, response.content
+
+        extracted = self.extract_many_use_case.execute(documents(), tags, structures)
+        for url, result, error in extracted:
+            while failed:
+                failed_url, failed_error = failed.pop(0)
+                yield failed_url, {}, failed_error
+            yield url, result, error
+        for url, error in failed:
+            yield url, {}, error
@@ -0,0 +1,101 @@
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable
+
+from interface_adapter.controller.controller import Controller
+from usecases.impl.process_pool_extract_many_use_case_impl import extract_document
+
+
+def _tags_only(result: tuple[dict, str]) -> tuple[dict, str]:
+    extracted, error = result
+    return extracted["tags"], error
+
+
+class ControllerExecutor:
+    """Run Controller calls on bounded pools instead of one thread per request.
+
+    I/O bound calls go to a fixed thread pool. When parse_workers is set,
+    parsing is shipped to a process pool so it does not compete with the
+    caller for the GIL. Futures that have not started can be cancelled.
+    """
+
+    def __init__(
+        self, controller: Controller, io_workers: int = 4, parse_workers: int = 0
+    ):
+        self.controller = controller
+        self._io = ThreadPoolExecutor(io_workers, thread_name_prefix="controller-io")
+        self._parse = ProcessPoolExecutor(parse_workers) if parse_workers else None
+        self._pending: set[Future] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Run fn(*args) on the I/O pool"""
+        return self._track(self._io.submit(fn, *args))
+
+    def fetch_url(self, url: str) -> Future:
+        return self.submit(self.controller.fetch_url, url)
+
+    def extract_tags(self, html: str, tags: list[str]) -> Future:
+        """Parse and extract on the process pool, or the I/O pool without one"""
+        if self._parse is None:
+            return self.submit(self.controller.extract_tags, html, tags)
+        parser = self.controller.convert_into_beatifulsoup_use_case.parser
+        future = self._parse.submit(extract_document, html, list(tags), (), parser)
+        result = Future()
+        future.add_done_callback(lambda done: self._copy(done, result, _tags_only))
+        return self._track(result)
+
+    def get_tags(self, url: str, tags: list[str]) -> Future:
+        """Fetch on the I/O pool, then extract the tags from the page"""
+        result = Future()
+        fetched = self.fetch_url(url)
+
+        def on_fetched(future: Future):
+            if future.cancelled():
+                result.cancel()
+                return
+            try:
+                response, error = future.result()
+            except Exception as e:
+                result.set_exception(e)
+                return
+            if error:
+                result.set_result(({}, error))
+                return
+            extracted = self.extract_tags(response.text, tags)
+            extracted.add_done_callback(lambda done: self._copy(done, result))
+
+        fetched.add_done_callback(on_fetched)
+        return self._track(result)
+
+    def cancel_pending(self) -> int:
+        """Cancel every submitted call that has not started yet"""
+        with self._lock:
+            pending = list(self._pending)
+        return sum(future.cancel() for future in pending)
+
+    def shutdown(self, wait: bool = False):
+        self.cancel_pending()
+        self._io.shutdown(wait=wait, cancel_futures=True)
+        if self._parse is not None:
+            self._parse.shutdown(wait=wait, cancel_futures=True)
+
+    def _track(self, future: Future) -> Future:
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._untrack)
+        return future
+
+    def _untrack(self, future: Future):
+        with self._lock:
+            self._pending.discard(future)
+
+    @staticmethod
+    def _copy(source: Future, target: Future, convert: Callable = None):
+        if source.cancelled():
+            target.cancel()
+        elif source.exception() is not None:
+            target.set_exception(source.exception())
+        else:
+            result = source.result()
+            target.set_result(convert(result) if convert else result)
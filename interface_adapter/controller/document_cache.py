@@ -0,0 +1,77 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Hashable, Optional, Tuple
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+
+class DocumentCache:
+    """Thread-safe LRU of parsed documents keyed by a hash of their content.
+
+    Each entry is weighted by the number of nodes in the stored tree, so a
+    partial parse costs what it keeps rather than what its source held, and
+    least recently used entries are evicted once the total goes over
+    ``max_nodes``.
+    """
+
+    def __init__(self, max_nodes: int = 2_000_000):
+        self.max_nodes = max_nodes
+        self.total_nodes = 0
+        self._entries: OrderedDict[Hashable, Tuple["BeautifulSoup", int]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(html) -> bytes:
+        data = html if isinstance(html, bytes) else html.encode("utf-8", "replace")
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    @staticmethod
+    def weight(soup: "BeautifulSoup") -> int:
+        return sum(1 for _ in soup.descendants) + 1
+
+    def get(self, key: Hashable) -> Optional["BeautifulSoup"]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, soup: "BeautifulSoup", weight: int):
+        if weight > self.max_nodes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_nodes -= previous[1]
+            self._entries[key] = (soup, weight)
+            self.total_nodes += weight
+            while self.total_nodes > self.max_nodes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.total_nodes -= evicted
+
+    def get_or_parse(
+        self,
+        key: Hashable,
+        parse: Callable[[], Tuple["BeautifulSoup", str]],
+    ) -> Tuple["BeautifulSoup", str]:
+        """Return the cached soup for key, parsing and caching it on a miss"""
+        soup = self.get(key)
+        if soup is not None:
+            return soup, ""
+        soup, error = parse()
+        if not error:
+            self.put(key, soup, self.weight(soup))
+        return soup, error
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_nodes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
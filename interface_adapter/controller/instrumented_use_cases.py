@@ -0,0 +1,203 @@
+from time import perf_counter
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from usecases.fetch_url_use_case import FetchUrlUseCase
+from usecases.convert_into_beautifulsoup_use_case import (
+    ConvertIntoBeautifulSoupUseCase,
+)
+from usecases.get_one_tag_use_case import GetOneTagUseCase
+from usecases.get_all_by_html_structure import GetAllByHtmlStructureUseCase
+from usecases.extract_many_use_case import ExtractManyUseCase
+from interface_adapter.controller.metrics import Metrics
+
+if TYPE_CHECKING:
+    from requests import Response
+
+# Stage names used as the "stage" label
+FETCH = "fetch"
+STREAM = "stream"
+PARSE = "parse"
+PARSE_PARTIAL = "parse_partial"
+TAG = "tag"
+STRUCTURE = "structure"
+EXTRACT = "extract"
+
+
+def _host(url: str) -> str:
+    try:
+        return urlsplit(url).netloc.lower()
+    except ValueError:
+        return ""
+
+
+class _Instrumented:
+    """Forward everything not instrumented, e.g. request(), to the delegate"""
+
+    def __init__(self, delegate, metrics: Metrics):
+        self.delegate = delegate
+        self.metrics = metrics
+
+    def __getattr__(self, name: str):
+        if name == "delegate":
+            raise AttributeError(name)
+        return getattr(self.delegate, name)
+
+
+class InstrumentedFetchUrlUseCase(_Instrumented, FetchUrlUseCase):
+    """Record fetch latency, bytes, cache hits and errors per host.
+
+    Latency is the time until the response headers arrived as measured by
+    requests, so time spent queued behind concurrency limits in fetch_many is
+    not counted. Failed single fetches are timed on the wall clock instead.
+    """
+
+    def execute(self, url: str) -> Tuple["Response", str]:
+        start = perf_counter()
+        response, error = self.delegate.execute(url)
+        self._record(url, response, error, perf_counter() - start)
+        return response, error
+
+    def fetch_many(self, urls: Iterable[str]) -> Iterator[Tuple[str, "Response", str]]:
+        for url, response, error in self.delegate.fetch_many(urls):
+            self._record(url, response, error)
+            yield url, response, error
+
+    def stream(
+        self, url: str, chunk_size: int = 1 << 16, max_bytes: Optional[int] = None
+    ) -> Tuple[Iterator[str], str]:
+        host = _host(url)
+        start = perf_counter()
+        chunks, error = self.delegate.stream(
+            url, chunk_size=chunk_size, max_bytes=max_bytes
+        )
+        self.metrics.observe(STREAM, perf_counter() - start, host)
+        if error:
+            self.metrics.count("errors", STREAM, host=host)
+            return chunks, error
+        return self._count_chunks(chunks, host), ""
+
+    def _count_chunks(self, chunks: Iterator[str], host: str) -> Iterator[str]:
+        # Decoded text, so this counts characters rather than wire bytes
+        received = 0
+        try:
+            for chunk in chunks:
+                received += len(chunk)
+                yield chunk
+        except Exception:
+            self.metrics.count("errors", STREAM, host=host)
+            raise
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+            self.metrics.count("bytes", STREAM, received, host)
+
+    def _record(self, url: str, response, error: str, seconds: float = None):
+        host = _host(url)
+        if error:
+            self.metrics.count("errors", FETCH, host=host)
+            if seconds is not None:
+                self.metrics.observe(FETCH, seconds, host)
+            return
+        if getattr(response, "from_cache", False):
+            self.metrics.count("cache_hits", FETCH, host=host)
+            return
+        elapsed = getattr(response, "elapsed", None)
+        if elapsed is not None:
+            seconds = elapsed.total_seconds()
+        if seconds is not None:
+            self.metrics.observe(FETCH, seconds, host)
+        self.metrics.count("bytes", FETCH, len(response.content), host)
+
+
+class InstrumentedConvertIntoBeautifulSoupUseCase(
+    _Instrumented, ConvertIntoBeautifulSoupUseCase
+):
+    """Record parse time and errors, full and partial parses apart"""
+
+    def execute(
+        self,
+        html: str,
+        parse_only: Optional[list[str]] = None,
+        stop_at_first: bool = False,
+    ):
+        stage = PARSE_PARTIAL if parse_only else PARSE
+        start = perf_counter()
+        soup, error = self.delegate.execute(
+            html, parse_only=parse_only, stop_at_first=stop_at_first
+        )
+        self.metrics.observe(stage, perf_counter() - start)
+        self.metrics.count("bytes", stage, len(html))
+        if error:
+            self.metrics.count("errors", stage)
+        return soup, error
+
+    def execute_stream(self, chunks: Iterable[str], parse_only: list[str]):
+        # Includes the time spent waiting for the streamed chunks
+        start = perf_counter()
+        soup, error = self.delegate.execute_stream(chunks, parse_only)
+        self.metrics.observe(PARSE_PARTIAL, perf_counter() - start)
+        if error:
+            self.metrics.count("errors", PARSE_PARTIAL)
+        return soup, error
+
+
+class InstrumentedGetOneTagUseCase(_Instrumented, GetOneTagUseCase):
+    """Record tag lookup time, matched elements and errors"""
+
+    def execute(self, soup, tag: str):
+        start = perf_counter()
+        found, error = self.delegate.execute(soup, tag)
+        self.metrics.observe(TAG, perf_counter() - start)
+        if error:
+            self.metrics.count("errors", TAG)
+        elif found is not None:
+            self.metrics.count("matches", TAG)
+        return found, error
+
+
+class InstrumentedGetAllByHtmlStructureUseCase(
+    _Instrumented, GetAllByHtmlStructureUseCase
+):
+    """Record structure matching time, matched elements and errors"""
+
+    def execute(self, soup, structure: str):
+        start = perf_counter()
+        found, error = self.delegate.execute(soup, structure)
+        self.metrics.observe(STRUCTURE, perf_counter() - start)
+        if error:
+            self.metrics.count("errors", STRUCTURE)
+        else:
+            self.metrics.count("matches", STRUCTURE, len(found))
+        return found, error
+
+
+class InstrumentedExtractManyUseCase(_Instrumented, ExtractManyUseCase):
+    """Record the per document extraction time reported by the workers"""
+
+    def execute(
+        self,
+        documents: Iterable[tuple],
+        tags: Sequence[str] = (),
+        structures: Sequence[str] = (),
+    ) -> Iterator[tuple[str, dict, str]]:
+        def counted():
+            for document in documents:
+                self.metrics.count("bytes", EXTRACT, len(document[1]))
+                yield document
+
+        for key, result, error in self.delegate.execute(counted(), tags, structures):
+            seconds = result.get("seconds") if result else None
+            if seconds is not None:
+                self.metrics.observe(EXTRACT, seconds)
+            if error:
+                self.metrics.count("errors", EXTRACT)
+            else:
+                self.metrics.count(
+                    "matches",
+                    EXTRACT,
+                    sum(not failed for _, failed in result["tags"].values())
+                    + sum(len(found) for found, _ in result["structures"].values()),
+                )
+            yield key, result, error
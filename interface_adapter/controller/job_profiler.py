@@ -0,0 +1,135 @@
+import cProfile
+import io
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+
+class JobProfiler:
+    """Opt-in cProfile and tracemalloc capture around whole jobs.
+
+    A sampled job writes ``<name>-<time>.pstats`` for pstats/snakeviz, a
+    ``.prof.txt`` with the top functions by cumulative time and an
+    ``.alloc.txt`` with the allocations the job left behind and its peak
+    traced memory. Overhead is bounded by sampling: only sample_rate of
+    the jobs are profiled, and at most one at a time since tracemalloc is
+    process wide. cProfile sees the thread that runs the job; time spent
+    waiting on fetch threads shows up as waits.
+    """
+
+    def __init__(
+        self,
+        directory: str = ".",
+        sample_rate: float = 1.0,
+        memory: bool = True,
+        top: int = 30,
+        frames: int = 1,
+    ):
+        """
+        Args:
+            directory (str): Where reports go unless a job names its own
+            sample_rate (float): Fraction of jobs profiled, from 0 to 1
+            memory (bool): Also trace allocations, the costlier half
+            top (int): Lines in the text reports
+            frames (int): Traceback depth kept per allocation by tracemalloc
+        """
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.memory = memory
+        self.top = top
+        self.frames = frames
+        self.enabled = True
+        self.last_report: Optional[str] = None
+        self._busy = threading.Lock()
+        self._count = 0
+
+    def _sampled(self) -> bool:
+        if not self.enabled or random.random() >= self.sample_rate:
+            return False
+        return self._busy.acquire(blocking=False)
+
+    @contextmanager
+    def profile(
+        self, name: str, directory: Optional[str] = None
+    ) -> Iterator[Optional[str]]:
+        """Profile the body of the with block when this job is sampled.
+
+        Yields the path prefix the reports are written to, or None when the
+        job is not profiled.
+        """
+        if not self._sampled():
+            yield None
+            return
+        try:
+            directory = directory or self.directory
+            os.makedirs(directory, exist_ok=True)
+            self._count += 1
+            safe_name = re.sub(r"[^\w.-]+", "_", name)[:60] or "job"
+            prefix = os.path.join(
+                directory, f"{safe_name}-{time.strftime('%Y%m%d-%H%M%S')}-{self._count}"
+            )
+            tracing = self.memory and not tracemalloc.is_tracing()
+            if tracing:
+                tracemalloc.start(self.frames)
+            before = tracemalloc.take_snapshot() if self.memory else None
+            if self.memory:
+                tracemalloc.reset_peak()
+            profiler = cProfile.Profile()
+            started = time.perf_counter()
+            profiler.enable()
+            try:
+                yield prefix
+            finally:
+                profiler.disable()
+                elapsed = time.perf_counter() - started
+                if self.memory:
+                    after = tracemalloc.take_snapshot()
+                    _, peak = tracemalloc.get_traced_memory()
+                    if tracing:
+                        tracemalloc.stop()
+                    self._write_allocations(prefix, name, before, after, peak)
+                self._write_profile(prefix, name, profiler, elapsed)
+                self.last_report = prefix
+        finally:
+            self._busy.release()
+
+    def run(self, name: str, fn: Callable, *args, directory: Optional[str] = None):
+        """Call fn(*args) inside profile(name) and return its result"""
+        with self.profile(name, directory):
+            return fn(*args)
+
+    def _write_profile(
+        self, prefix: str, name: str, profiler: cProfile.Profile, elapsed: float
+    ):
+        profiler.dump_stats(prefix + ".pstats")
+        text = io.StringIO()
+        text.write(f"job {name}: {elapsed:.3f} s wall\n\n")
+        stats = pstats.Stats(profiler, stream=text)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        with open(prefix + ".prof.txt", "w", encoding="utf-8") as file:
+            file.write(text.getvalue())
+
+    def _write_allocations(self, prefix: str, name: str, before, after, peak: int):
+        ignore = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ]
+        before = before.filter_traces(ignore)
+        after = after.filter_traces(ignore)
+        growth = after.compare_to(before, "lineno")
+        held = sum(stat.size for stat in after.statistics("filename"))
+        lines = [
+            f"job {name}: peak traced {peak / 2**20:.1f} MB,"
+            f" still held {held / 2**20:.1f} MB",
+            "",
+            f"top {self.top} allocation sites by growth during the job:",
+        ]
+        lines.extend(str(stat) for stat in growth[: self.top])
+        with open(prefix + ".alloc.txt", "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
@@ -0,0 +1,156 @@
+import bisect
+import math
+import threading
+from typing import Optional
+
+# Upper bounds in seconds of the latency buckets, as in the Prometheus clients
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+# Prefix of every exported metric name
+NAMESPACE = "scraper"
+
+
+class Histogram:
+    """Bucketed latency distribution with quantiles estimated from the buckets"""
+
+    __slots__ = ("bounds", "counts", "count", "sum", "max")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        # One slot per bound plus the +Inf bucket, not cumulative
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile inside its bucket, like histogram_quantile"""
+        if not self.count:
+            return math.nan
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+
+class Metrics:
+    """Thread-safe registry of per-stage and per-host counters and latencies.
+
+    Series are keyed by (stage, host); host is "" where a stage does not know
+    the page it works on, e.g. parsing. Recording takes one lock and a few
+    dict operations, so it is cheap enough for every use case call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency: dict[tuple[str, str], Histogram] = {}
+        # name -> (stage, host) -> value
+        self._counters: dict[str, dict[tuple[str, str], float]] = {}
+
+    def observe(self, stage: str, seconds: float, host: str = ""):
+        """Record the latency of one call of a stage"""
+        key = (stage, host)
+        with self._lock:
+            histogram = self._latency.get(key)
+            if histogram is None:
+                histogram = self._latency[key] = Histogram()
+            histogram.observe(seconds)
+
+    def count(self, name: str, stage: str, value: float = 1, host: str = ""):
+        """Add to a counter such as "errors", "bytes" or "matches" """
+        key = (stage, host)
+        with self._lock:
+            counters = self._counters.setdefault(name, {})
+            counters[key] = counters.get(key, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._latency.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> list[dict]:
+        """Return one row per (stage, host) with its counts and latency summary"""
+        with self._lock:
+            keys = set(self._latency)
+            for counters in self._counters.values():
+                keys.update(counters)
+            rows = []
+            for stage, host in sorted(keys):
+                row = {"stage": stage, "host": host}
+                histogram = self._latency.get((stage, host))
+                if histogram is not None:
+                    row.update(
+                        calls=histogram.count,
+                        seconds=histogram.sum,
+                        mean=histogram.sum / histogram.count,
+                        p50=histogram.quantile(0.5),
+                        p99=histogram.quantile(0.99),
+                        max=histogram.max,
+                    )
+                for name, counters in self._counters.items():
+                    value = counters.get((stage, host))
+                    if value is not None:
+                        row[name] = value
+                rows.append(row)
+        return rows
+
+    def to_prometheus(self, namespace: str = NAMESPACE) -> str:
+        """Render every series in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            name = f"{namespace}_stage_seconds"
+            lines.append(
+                f"# HELP {name} Latency of one use case call per stage and host."
+            )
+            lines.append(f"# TYPE {name} histogram")
+            for (stage, host), histogram in sorted(self._latency.items()):
+                labels = _labels(stage, host)
+                cumulative = 0
+                for bound, count in zip(histogram.bounds, histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f'{name}_bucket{{{labels},le="{_number(bound)}"}} {cumulative}'
+                    )
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"{name}_sum{{{labels}}} {_number(histogram.sum)}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+            for counter, series in sorted(self._counters.items()):
+                name = f"{namespace}_{counter}_total"
+                lines.append(f"# TYPE {name} counter")
+                for (stage, host), value in sorted(series.items()):
+                    lines.append(f"{name}{{{_labels(stage, host)}}} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, namespace: str = NAMESPACE):
+        """Write the Prometheus text dump, e.g. for the textfile collector"""
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.to_prometheus(namespace))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(stage: str, host: Optional[str]) -> str:
+    labels = f'stage="{_escape(stage)}"'
+    if host:
+        labels += f',host="{_escape(host)}"'
+    return labels
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
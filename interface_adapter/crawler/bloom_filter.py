@@ -0,0 +1,103 @@
+import hashlib
+import math
+import mmap
+import os
+import struct
+from typing import Optional
+
+_HEADER = struct.Struct("<8sQQQ")
+_MAGIC = b"BLOOM001"
+
+
+class BloomFilter:
+    """Compact set of seen strings with a bounded false-positive rate.
+
+    Ten million urls at a 0.1% error rate fit in about 18 MB. With a path the
+    bits live in a memory-mapped file, so the set survives restarts and only
+    the pages in use stay resident. A false positive means a url is treated
+    as seen; nothing that was added is ever reported missing.
+    """
+
+    def __init__(
+        self, capacity: int, error_rate: float = 0.001, path: Optional[str] = None
+    ):
+        """
+        Args:
+            capacity (int): Number of items expected, the error rate holds up to it
+            error_rate (float): Chance that an unseen item is reported as seen
+            path (str): File backing the bits, reopened when it already exists
+        """
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_bits = max(8, bits + (-bits % 8))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self.path = path
+        self._file = None
+        if path is None:
+            self._bits = bytearray(self.num_bits // 8)
+            self._offset = 0
+        else:
+            self._open(path)
+
+    def _open(self, path: str):
+        size = _HEADER.size + self.num_bits // 8
+        exists = os.path.exists(path)
+        self._file = open(path, "r+b" if exists else "w+b")
+        if exists:
+            magic, num_bits, num_hashes, count = _HEADER.unpack(
+                self._file.read(_HEADER.size)
+            )
+            if magic != _MAGIC:
+                raise ValueError(f"{path} is not a bloom filter")
+            self.num_bits, self.num_hashes, self.count = num_bits, num_hashes, count
+        else:
+            self._file.truncate(size)
+            self._file.write(
+                _HEADER.pack(_MAGIC, self.num_bits, self.num_hashes, self.count)
+            )
+            self._file.flush()
+        self._bits = mmap.mmap(self._file.fileno(), 0)
+        self._offset = _HEADER.size
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first, second = struct.unpack("<QQ", digest)
+        # Double hashing derives every index from two independent halves
+        return [(first + i * second) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, item: str) -> bool:
+        bits, offset = self._bits, self._offset
+        return all(
+            bits[offset + (position >> 3)] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def add(self, item: str) -> bool:
+        """Add an item and return True if it was not already in the set"""
+        bits, offset = self._bits, self._offset
+        added = False
+        for position in self._positions(item):
+            index = offset + (position >> 3)
+            mask = 1 << (position & 7)
+            if not bits[index] & mask:
+                bits[index] |= mask
+                added = True
+        self.count += added
+        return added
+
+    def __len__(self) -> int:
+        return self.count
+
+    def flush(self):
+        if self._file is not None:
+            self._bits[:_HEADER.size] = _HEADER.pack(
+                _MAGIC, self.num_bits, self.num_hashes, self.count
+            )
+            self._bits.flush()
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._bits.close()
+            self._file.close()
+            self._file = None
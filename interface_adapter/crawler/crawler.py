@@ -0,0 +1,82 @@
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+from interface_adapter.controller.controller import Controller
+from interface_adapter.crawler.frontier import CrawlFrontier
+from interface_adapter.pipeline.transforms import compile_transforms
+from usecases.impl.url_normalizer import normalize_url
+
+_href = compile_transforms(["attr:href"])
+
+
+class Crawler:
+    """Fetch pages released by a frontier and queue the links found on them.
+
+    Each batch is fetched concurrently through the controller. Links are
+    pulled from the same parse as the caller's tags and structures, so
+    following them costs no extra parse.
+    """
+
+    def __init__(
+        self,
+        controller: Controller,
+        frontier: CrawlFrontier,
+        follow: str = "a[href]",
+        max_pages: Optional[int] = None,
+        batch_size: int = 16,
+    ):
+        """
+        Args:
+            controller (Controller): Fetches and parses the pages
+            frontier (CrawlFrontier): Decides which url is fetched next
+            follow (str): Structure expression selecting the links to follow
+            max_pages (int): Stop after fetching this many pages
+            batch_size (int): Urls fetched concurrently per batch
+        """
+        self.controller = controller
+        self.frontier = frontier
+        self.follow = follow
+        self.max_pages = max_pages
+        self.batch_size = batch_size
+        self.pages = 0
+
+    def seed(self, urls: Iterable[str]) -> int:
+        """Queue start urls at depth 0 and return how many were new"""
+        return sum(self.frontier.add(url) for url in urls)
+
+    def crawl(
+        self, tags: Sequence[str] = (), structures: Sequence[str] = ()
+    ) -> Iterator[Tuple[str, int, dict, str]]:
+        """Yield (url, depth, extracted, error) for every fetched page.
+
+        extracted has the "tags" and "structures" mapping of Controller.extract
+        and also holds the followed links under the follow expression.
+        """
+        structures = list(dict.fromkeys([*structures, self.follow]))
+        while self.max_pages is None or self.pages < self.max_pages:
+            limit = self.batch_size
+            if self.max_pages is not None:
+                limit = min(limit, self.max_pages - self.pages)
+            batch = self.frontier.next_batch(limit)
+            if not batch:
+                return
+            depths = {item.url: item.depth for item in batch}
+            for url, response, error in self.controller.fetch_many(list(depths)):
+                self.pages += 1
+                depth = depths[url]
+                if error:
+                    yield url, depth, {}, error
+                    continue
+                # A redirect target counts as seen too
+                final_url, invalid = normalize_url(response.url)
+                if not invalid:
+                    self.frontier.seen.add(final_url)
+                extracted, error = self.controller.extract(
+                    response.text, tags, structures
+                )
+                if not error and depth < self.frontier.max_depth:
+                    links, _ = extracted["structures"].get(self.follow, ([], ""))
+                    for link in links:
+                        href = _href(link)
+                        if href:
+                            self.frontier.add(href, depth + 1, base=response.url)
+                yield url, depth, extracted, error
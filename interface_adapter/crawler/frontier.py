@@ -0,0 +1,141 @@
+import heapq
+import itertools
+import time
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+from interface_adapter.crawler.bloom_filter import BloomFilter
+from interface_adapter.crawler.robots import RobotsCache
+from usecases.impl.url_normalizer import normalize_url
+
+
+class CrawlItem:
+    __slots__ = ("url", "depth", "score")
+
+    def __init__(self, url: str, depth: int, score: float):
+        self.url = url
+        self.depth = depth
+        self.score = score
+
+
+class CrawlFrontier:
+    """Pending urls of a crawl, deduplicated and released politely per host.
+
+    Urls are canonicalised before the seen-set check, so each page is queued
+    once however it was spelled. Within a host, shallower and higher scored
+    urls go first; a host is released again only after its delay, which is
+    the larger of the frontier delay and the host's robots.txt crawl-delay.
+    """
+
+    def __init__(
+        self,
+        seen: Optional[BloomFilter] = None,
+        max_depth: int = 3,
+        delay: float = 1.0,
+        robots: Optional[RobotsCache] = None,
+        score: Optional[Callable[[str, int], float]] = None,
+        allow: Optional[Callable[[str], bool]] = None,
+    ):
+        """
+        Args:
+            seen (BloomFilter): Set of urls already queued, sized for a million by
+                default
+            max_depth (int): Links further than this from a seed are dropped
+            delay (float): Minimum seconds between two requests to one host
+            robots (RobotsCache): Drops disallowed urls and supplies crawl delays
+            score (Callable): Returns a priority for (url, depth), higher goes first
+            allow (Callable): Returns False for urls outside the crawl
+        """
+        self.seen = seen if seen is not None else BloomFilter(1_000_000)
+        self.max_depth = max_depth
+        self.delay = delay
+        self.robots = robots
+        self.score = score
+        self.allow = allow
+        self._order = itertools.count()
+        # host -> heap of (depth, -score, order, item)
+        self._queues: dict[str, list] = {}
+        self._delays: dict[str, float] = {}
+        # (time the host may be fetched again, host) for hosts with queued urls
+        self._waiting: list[tuple[float, str]] = []
+        self._scheduled: set[str] = set()
+        self._pending = 0
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def add(self, url: str, depth: int = 0, base: Optional[str] = None) -> bool:
+        """Queue a url unless it is invalid, too deep, excluded or already seen"""
+        if depth > self.max_depth:
+            return False
+        url, error = normalize_url(url, base=base)
+        if error:
+            return False
+        if self.allow is not None and not self.allow(url):
+            return False
+        if url in self.seen:
+            return False
+        if self.robots is not None and not self.robots.allowed(url):
+            self.seen.add(url)
+            return False
+        self.seen.add(url)
+
+        host = urlsplit(url).netloc
+        if host not in self._delays:
+            delay = self.robots.crawl_delay(url) if self.robots is not None else None
+            self._delays[host] = max(self.delay, delay or 0.0)
+        score = self.score(url, depth) if self.score is not None else 0.0
+        item = CrawlItem(url, depth, score)
+        heapq.heappush(
+            self._queues.setdefault(host, []), (depth, -score, next(self._order), item)
+        )
+        self._pending += 1
+        if host not in self._scheduled:
+            self._scheduled.add(host)
+            heapq.heappush(self._waiting, (time.monotonic(), host))
+        return True
+
+    def wait_time(self) -> Optional[float]:
+        """Seconds until some host may be fetched, None when nothing is queued"""
+        if not self._waiting:
+            return None
+        return max(0.0, self._waiting[0][0] - time.monotonic())
+
+    def next_ready(self, limit: int) -> list[CrawlItem]:
+        """Release up to limit urls from hosts whose delay has passed.
+
+        The best url of each ready host is taken, best first; a host without a
+        delay may give several.
+        """
+        now = time.monotonic()
+        ready = []
+        while self._waiting and self._waiting[0][0] <= now:
+            _, host = heapq.heappop(self._waiting)
+            heapq.heappush(ready, (self._queues[host][0][:3], host))
+
+        items = []
+        while ready and len(items) < limit:
+            _, host = heapq.heappop(ready)
+            queue = self._queues[host]
+            items.append(heapq.heappop(queue)[3])
+            self._pending -= 1
+            if not queue:
+                del self._queues[host]
+                self._scheduled.discard(host)
+            elif self._delays[host] > 0:
+                heapq.heappush(self._waiting, (now + self._delays[host], host))
+            else:
+                heapq.heappush(ready, (queue[0][:3], host))
+        # Hosts left over are still ready on the next call
+        for _, host in ready:
+            heapq.heappush(self._waiting, (now, host))
+        return items
+
+    def next_batch(self, limit: int) -> list[CrawlItem]:
+        """Wait until a host is ready and release up to limit urls"""
+        wait = self.wait_time()
+        if wait is None:
+            return []
+        if wait:
+            time.sleep(wait)
+        return self.next_ready(limit)
@@ -0,0 +1,84 @@
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+if TYPE_CHECKING:
+    from requests import Response
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class RobotsCache:
+    """robots.txt rules per origin, fetched once and kept for ttl seconds.
+
+    Follows RFC 9309: a missing robots.txt (4xx) allows everything, while a
+    server error or an unreachable host disallows the whole site until the
+    entry expires.
+    """
+
+    def __init__(
+        self,
+        request: Callable[[str], "Response"],
+        user_agent: str = "*",
+        ttl: float = 24 * 3600,
+    ):
+        """
+        Args:
+            request (Callable): Returns the raw response for a url, e.g.
+                FetchUrlUseCaseImpl.request
+            user_agent (str): Agent name matched against robots.txt groups
+            ttl (float): Seconds a fetched robots.txt is trusted
+        """
+        self.request = request
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self._rules: dict[str, tuple[float, RobotFileParser]] = {}
+        self._lock = threading.Lock()
+
+    def rules(self, url: str) -> RobotFileParser:
+        origin = _origin(url)
+        with self._lock:
+            cached = self._rules.get(origin)
+        if cached is not None and cached[0] > time.time():
+            return cached[1]
+        parser = self._fetch(origin)
+        with self._lock:
+            self._rules[origin] = (time.time() + self.ttl, parser)
+        return parser
+
+    def _fetch(self, origin: str) -> RobotFileParser:
+        from requests import RequestException
+
+        parser = RobotFileParser(origin + "/robots.txt")
+        try:
+            response = self.request(parser.url)
+        except RequestException:
+            parser.disallow_all = True
+            return parser
+        if response.status_code == 200:
+            parser.parse(response.text.splitlines())
+        elif 400 <= response.status_code < 500:
+            parser.allow_all = True
+        else:
+            parser.disallow_all = True
+        parser.modified()
+        return parser
+
+    def allowed(self, url: str) -> bool:
+        return self.rules(url).can_fetch(self.user_agent, url)
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        """Seconds to wait between requests to the url's host, if robots.txt sets it"""
+        rules = self.rules(url)
+        delay = rules.crawl_delay(self.user_agent)
+        if delay is not None:
+            return float(delay)
+        rate = rules.request_rate(self.user_agent)
+        if rate is not None and rate.requests:
+            return rate.seconds / rate.requests
+        return None
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+from typing import Iterable, Optional
+
+
+def url_key(url: str) -> int:
+    """64-bit digest standing in for a url, keeps millions of done urls small"""
+    return int.from_bytes(
+        hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+class JobCheckpoint:
+    """Append-only log of the urls a job finished and where its sinks stood.
+
+    Every commit is one JSON line naming the urls whose records reached the
+    sinks and each sink's offset right after them, flushed and fsynced before
+    the job moves on; sinks make their data durable in checkpoint() first. A
+    restarted job skips those urls and truncates its sinks back to the
+    offsets, so records written after the last commit are produced again
+    exactly once. A torn last line from a crash is ignored.
+    Every compact_every commits the log is rewritten as a snapshot.
+    """
+
+    def __init__(self, path: str, compact_every: int = 1000):
+        """
+        Args:
+            path (str): Log file, replayed when it already exists
+            compact_every (int): Commits appended before the log is compacted
+        """
+        self.path = path
+        self.compact_every = compact_every
+        self.done: set[int] = set()
+        self.sinks: dict[str, int] = {}
+        self._commits = 0
+        if os.path.exists(path):
+            self._replay()
+        self._log = open(path, "a", encoding="utf-8")
+
+    def _replay(self):
+        valid = 0
+        with open(self.path, "rb") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self._apply(entry)
+                valid += len(line)
+                self._commits += 1
+        # Drop a partly written last line so new commits start on a clean line
+        if valid < os.path.getsize(self.path):
+            os.truncate(self.path, valid)
+
+    def _apply(self, entry: dict):
+        self.done.update(url_key(url) for url in entry.get("urls", ()))
+        self.done.update(entry.get("keys", ()))
+        self.sinks.update(entry.get("sinks", {}))
+
+    def __len__(self) -> int:
+        return len(self.done)
+
+    def is_done(self, url: str) -> bool:
+        return url_key(url) in self.done
+
+    def sink_offset(self, name: str) -> Optional[int]:
+        return self.sinks.get(name)
+
+    def commit(self, urls: Iterable[str], sink_offsets: dict[str, int]):
+        """Durably record urls as finished together with the sink offsets"""
+        entry = {"urls": list(urls), "sinks": sink_offsets}
+        self._log.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._apply(entry)
+        self._commits += 1
+        if self._commits >= self.compact_every:
+            self.compact()
+
+    def compact(self, chunk_size: int = 100_000):
+        """Rewrite the log as the current state and swap it in atomically"""
+        temporary = self.path + ".compact"
+        keys = list(self.done)
+        with open(temporary, "w", encoding="utf-8") as file:
+            for start in range(0, len(keys), chunk_size):
+                file.write(
+                    json.dumps({"keys": keys[start : start + chunk_size]}) + "\n"
+                )
+            file.write(json.dumps({"sinks": self.sinks}) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        self._log.close()
+        os.replace(temporary, self.path)
+        self._log = open(self.path, "a", encoding="utf-8")
+        self._commits = 0
+
+    def close(self):
+        self._log.close()
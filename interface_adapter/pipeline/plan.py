@@ -0,0 +1,352 @@
+import queue
+import re
+import threading
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+from interface_adapter.controller.controller import Controller
+from interface_adapter.crawler.bloom_filter import BloomFilter
+from interface_adapter.crawler.crawler import Crawler
+from interface_adapter.crawler.frontier import CrawlFrontier
+from interface_adapter.crawler.robots import RobotsCache
+from interface_adapter.pipeline.checkpoint import JobCheckpoint
+from interface_adapter.pipeline.spec import PipelineSpec
+from interface_adapter.sinks.sink import Sink, open_sink
+from usecases.impl.url_normalizer import normalize_url
+
+
+class ExecutionPlan:
+    """Fetch, parse and extract stages compiled from one or more pipelines.
+
+    Every url is fetched once however many pipelines read it, and the tags and
+    structures all of those pipelines need from a page are extracted from a
+    single parse of it. Crawling pipelines discover their urls as they run
+    and are executed after the fixed ones, each with its own frontier.
+    """
+
+    def __init__(self, pipelines: list[PipelineSpec]):
+        self.pipelines = pipelines
+        self.crawls = [pipeline for pipeline in pipelines if pipeline.crawl]
+        # url -> pipelines reading it, in pipeline order
+        self.readers: dict[str, list[PipelineSpec]] = {}
+        # url -> (tags, structures) extracted from its one parse
+        self.extractions: dict[str, Tuple[list[str], list[str]]] = {}
+        for pipeline in pipelines:
+            if pipeline.crawl:
+                continue
+            for url in pipeline.urls:
+                readers = self.readers.setdefault(url, [])
+                if pipeline in readers:
+                    continue
+                readers.append(pipeline)
+                tags, structures = self.extractions.setdefault(url, ([], []))
+                for field in pipeline.fields:
+                    expressions = tags if field.kind == "tag" else structures
+                    if field.expression not in expressions:
+                        expressions.append(field.expression)
+
+    @property
+    def urls(self) -> list[str]:
+        return list(self.readers)
+
+    def describe(self) -> dict:
+        """Summarise the plan, e.g. to show how much work was fused"""
+        return {
+            "pipelines": [pipeline.name for pipeline in self.pipelines],
+            "crawls": [pipeline.name for pipeline in self.crawls],
+            "sources": sum(len(pipeline.urls) for pipeline in self.pipelines),
+            "fetches": len(self.readers),
+            "parses": len(self.extractions),
+            "extractions": sum(
+                len(tags) + len(structures)
+                for tags, structures in self.extractions.values()
+            ),
+        }
+
+    def execute(
+        self,
+        controller: Controller,
+        skip: Optional[Callable[[str], bool]] = None,
+        on_failure: Optional[Callable[[str], None]] = None,
+    ) -> Iterator[Tuple[PipelineSpec, dict]]:
+        """Yield (pipeline, record) for every page of every pipeline.
+
+        Pages are fetched concurrently and extracted as they arrive, on worker
+        processes when the controller has an extract-many use case. Urls for
+        which skip returns True are not fetched; crawls still fetch them to
+        find their links but yield no records for them. on_failure is called
+        with every url whose page could not be fetched or parsed, before its
+        records are yielded.
+        """
+        urls = [url for url in self.urls if skip is None or not skip(url)]
+        if not urls:
+            results = ()
+        elif controller.extract_many_use_case is not None:
+            results = controller.fetch_and_extract(urls, per_url=self.extractions)
+        else:
+            results = self._extract_in_process(controller, urls)
+        for url, extracted, error in results:
+            if error and on_failure is not None:
+                on_failure(url)
+            yield from self._records(self.readers[url], url, extracted, error)
+        for pipeline in self.crawls:
+            yield from self._crawl(controller, pipeline, skip, on_failure)
+
+    def _crawl(
+        self,
+        controller: Controller,
+        pipeline: PipelineSpec,
+        skip: Optional[Callable[[str], bool]] = None,
+        on_failure: Optional[Callable[[str], None]] = None,
+    ) -> Iterator[Tuple[PipelineSpec, dict]]:
+        tags = [field.expression for field in pipeline.fields if field.kind == "tag"]
+        structures = [
+            field.expression for field in pipeline.fields if field.kind == "structure"
+        ]
+        crawler = build_crawler(pipeline, controller)
+        try:
+            for url, depth, extracted, error in crawler.crawl(tags, structures):
+                if skip is not None and skip(url):
+                    continue
+                if error and on_failure is not None:
+                    on_failure(url)
+                for _, record in self._records([pipeline], url, extracted, error):
+                    record["depth"] = depth
+                    yield pipeline, record
+        finally:
+            crawler.frontier.seen.close()
+
+    def _extract_in_process(
+        self, controller: Controller, urls: list[str]
+    ) -> Iterator[Tuple[str, dict, str]]:
+        for url, response, error in controller.fetch_many(urls):
+            if error:
+                yield url, {}, error
+                continue
+            tags, structures = self.extractions[url]
+            extracted, error = controller.extract(response.text, tags, structures)
+            yield url, extracted, error
+
+    def _records(
+        self, pipelines: list[PipelineSpec], url: str, extracted: dict, error: str
+    ) -> Iterator[Tuple[PipelineSpec, dict]]:
+        for pipeline in pipelines:
+            record = {"url": url}
+            field_errors = []
+            for field in pipeline.fields:
+                default = (None, error or "Not extracted")
+                value, field_error = extracted.get(field.kind + "s", {}).get(
+                    field.expression, default
+                )
+                if not field_error:
+                    try:
+                        value = field.transform(value)
+                    except (ValueError, TypeError, AttributeError) as e:
+                        field_error = f"Transform failed: {str(e)}"
+                if field_error:
+                    value = None
+                    field_errors.append(f"{field.name}: {field_error}")
+                record[field.name] = value
+            record["error"] = error or "; ".join(field_errors)
+            yield pipeline, record
+
+
+def compile_plan(pipelines: Iterable[PipelineSpec]) -> ExecutionPlan:
+    return ExecutionPlan(list(pipelines))
+
+
+def build_crawler(pipeline: PipelineSpec, controller: Controller) -> Crawler:
+    """Set up a frontier and crawler from a pipeline's crawl options"""
+    options = pipeline.crawl
+    robots = None
+    request = getattr(controller.fetch_url_use_case, "request", None)
+    if options["robots"] and request is not None:
+        robots = RobotsCache(request, options["user_agent"])
+
+    allow = None
+    if options["same_host"]:
+        hosts = set()
+        for url in pipeline.urls:
+            url, error = normalize_url(url)
+            if not error:
+                hosts.add(urlsplit(url).netloc)
+
+        def allow(url: str) -> bool:
+            return urlsplit(url).netloc in hosts
+
+    score = None
+    if options["prefer"]:
+        preferred = [re.compile(pattern) for pattern in options["prefer"]]
+
+        def score(url: str, depth: int) -> float:
+            return sum(1.0 for pattern in preferred if pattern.search(url))
+
+    frontier = CrawlFrontier(
+        BloomFilter(options["capacity"], path=options["seen_path"]),
+        max_depth=options["max_depth"],
+        delay=options["delay"],
+        robots=robots,
+        score=score,
+        allow=allow,
+    )
+    crawler = Crawler(
+        controller, frontier, follow=options["follow"], max_pages=options["max_pages"]
+    )
+    crawler.seed(pipeline.urls)
+    return crawler
+
+
+def _write_batches(batches: queue.Queue, failures: list):
+    while True:
+        item = batches.get()
+        try:
+            if item is None:
+                return
+            sink, records = item
+            try:
+                sink.write(records)
+            except Exception as e:
+                failures.append(f"An error occurred: {str(e)}")
+        finally:
+            batches.task_done()
+
+
+def open_sinks(
+    plan: ExecutionPlan, checkpoint: Optional[JobCheckpoint] = None
+) -> dict[str, Sink]:
+    """Open the sinks declared by the plan's pipelines, at their checkpointed offsets.
+
+    With a checkpoint every sink is opened with resume_at, from 0 on a new
+    job, so one that cannot resume refuses before it truncates its output.
+
+    Raises:
+        ValueError: When a sink is misconfigured
+        OSError: When a sink cannot be opened
+    """
+    sinks = {}
+    for pipeline in plan.pipelines:
+        if not pipeline.sink:
+            continue
+        options = dict(pipeline.sink)
+        if checkpoint is not None:
+            options["resume_at"] = checkpoint.sink_offset(pipeline.name) or 0
+        sinks[pipeline.name] = open_sink(options)
+    return sinks
+
+
+def run_plan(
+    plan: ExecutionPlan,
+    controller: Controller,
+    sinks: Optional[dict[str, Sink]] = None,
+    batch_size: int = 500,
+    on_record=None,
+    checkpoint: Optional[JobCheckpoint] = None,
+    commit_every: int = 1000,
+) -> Tuple[dict, str]:
+    """Execute a plan and load its records into each pipeline's sink.
+
+    Sinks are written on a separate thread in batches of batch_size, so slow
+    output overlaps with fetching and extraction. Pipelines without a sink
+    passed in or declared in their spec only count their records.
+
+    With a checkpoint, urls it holds are skipped, and after every
+    commit_every finished urls the sinks are drained and their offsets
+    committed together with those urls. Sinks passed in must then have been
+    opened at the checkpointed offsets. Urls whose page failed are written
+    but not committed, so a resumed job fetches them again; their earlier
+    error records stay in append-only sinks and are replaced in keyed ones.
+
+    Args:
+        on_record (Callable): Called with (pipeline, record) for every record
+
+    Returns:
+        Tuple[dict, str]: Per pipeline record and failure counts, and an error message
+    """
+    if sinks is None:
+        try:
+            sinks = open_sinks(plan, checkpoint)
+        except (OSError, ValueError) as e:
+            return {}, f"An error occurred: {str(e)}"
+    stats = {pipeline.name: {"records": 0, "failed": 0} for pipeline in plan.pipelines}
+    pending = {name: [] for name in sinks}
+    batches = queue.Queue(maxsize=8)
+    write_failures = []
+    writer = threading.Thread(
+        target=_write_batches, args=(batches, write_failures), daemon=True
+    )
+
+    def drain():
+        for name, batch in pending.items():
+            if batch:
+                batches.put((sinks[name], batch))
+                pending[name] = []
+        batches.join()
+
+    def commit(urls: list[str]):
+        drain()
+        if write_failures:
+            raise RuntimeError(write_failures[0])
+        checkpoint.commit(
+            urls, {name: sink.checkpoint() for name, sink in sinks.items()}
+        )
+
+    if checkpoint is not None:
+        for name, sink in sinks.items():
+            if sink.checkpoint() is None:
+                for opened in sinks.values():
+                    opened.close()
+                return (
+                    stats,
+                    f"Sink of {name} cannot resume, checkpoints need one that can",
+                )
+
+    writer.start()
+    finished: list[str] = []
+    failed: set[str] = set()
+    current = None
+    try:
+        for pipeline, record in plan.execute(
+            controller,
+            skip=checkpoint.is_done if checkpoint is not None else None,
+            on_failure=failed.add if checkpoint is not None else None,
+        ):
+            # Records of one url arrive together, so a new url means the
+            # previous one is complete
+            if checkpoint is not None and record["url"] != current:
+                if current is not None and current not in failed:
+                    finished.append(current)
+                failed.discard(current)
+                current = record["url"]
+                if len(finished) >= commit_every:
+                    commit(finished)
+                    finished = []
+            stats[pipeline.name]["records"] += 1
+            stats[pipeline.name]["failed"] += bool(record["error"])
+            if on_record is not None:
+                on_record(pipeline, record)
+            batch = pending.get(pipeline.name)
+            if batch is None:
+                continue
+            batch.append(record)
+            if len(batch) >= batch_size:
+                batches.put((sinks[pipeline.name], batch))
+                pending[pipeline.name] = []
+        if checkpoint is not None:
+            if current is not None and current not in failed:
+                finished.append(current)
+            commit(finished)
+        else:
+            drain()
+    except RuntimeError as e:
+        write_failures.append(str(e))
+    finally:
+        batches.put(None)
+        writer.join()
+        for sink in sinks.values():
+            try:
+                sink.close()
+            except Exception as e:
+                write_failures.append(f"An error occurred: {str(e)}")
+    if write_failures:
+        return stats, write_failures[0]
+    return stats, ""
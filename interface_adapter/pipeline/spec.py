@@ -0,0 +1,179 @@
+import json
+import os
+from typing import Iterable, Optional
+
+from interface_adapter.pipeline.transforms import compile_transforms
+
+SPEC_EXTENSIONS = (".json", ".yaml", ".yml")
+
+_KINDS = ("tag", "structure")
+
+# Options of a crawl section and their defaults
+CRAWL_DEFAULTS = {
+    "follow": "a[href]",
+    "max_depth": 2,
+    "max_pages": 1000,
+    "delay": 1.0,
+    "same_host": True,
+    "robots": True,
+    "user_agent": "*",
+    "prefer": [],
+    "capacity": 1_000_000,
+    "seen_path": None,
+}
+
+
+class FieldSpec:
+    """One named value extracted from every page of a pipeline.
+
+    ``kind`` is "tag" for the first match of a tag name or "structure" for
+    every match of a CSS selector or XPath-like path.
+    """
+
+    def __init__(self, name: str, kind: str, expression: str, transforms=()):
+        self.name = name
+        self.kind = kind
+        self.expression = expression
+        self.transforms = list(transforms)
+        self.transform = compile_transforms(self.transforms)
+
+
+class PipelineSpec:
+    """A declarative job: sources, the fields to extract and where to write them.
+
+    With a crawl section the sources are seeds and links found on each page
+    are followed, see CRAWL_DEFAULTS for its options.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        urls: list[str],
+        fields: list[FieldSpec],
+        sink: Optional[dict] = None,
+        crawl: Optional[dict] = None,
+    ):
+        self.name = name
+        self.urls = urls
+        self.fields = fields
+        self.sink = sink
+        self.crawl = crawl
+
+    def with_urls(self, urls: list[str]) -> "PipelineSpec":
+        """Return a copy of this pipeline reading other sources"""
+        return PipelineSpec(self.name, list(urls), self.fields, self.sink, self.crawl)
+
+
+def read_url_list(path: str) -> Iterable[str]:
+    """Yield urls from a file with one url per line, ``#`` starts a comment"""
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def _sources(entries, base_dir: str) -> list[str]:
+    if isinstance(entries, (str, dict)):
+        entries = [entries]
+    urls = []
+    for entry in entries or ():
+        if isinstance(entry, str):
+            urls.append(entry)
+        elif isinstance(entry, dict) and "url" in entry:
+            urls.append(entry["url"])
+        elif isinstance(entry, dict) and "file" in entry:
+            urls.extend(read_url_list(os.path.join(base_dir, entry["file"])))
+        else:
+            raise ValueError(f"Invalid source: {entry!r}")
+    return urls
+
+
+def _field(name: str, options: dict) -> FieldSpec:
+    if not isinstance(options, dict):
+        raise ValueError(f"Field {name} must be a mapping")
+    kinds = [kind for kind in _KINDS if kind in options]
+    if len(kinds) != 1:
+        raise ValueError(f"Field {name} needs exactly one of: {', '.join(_KINDS)}")
+    transforms = options.get("transform", ())
+    if isinstance(transforms, str):
+        transforms = [transforms]
+    return FieldSpec(name, kinds[0], str(options[kinds[0]]), transforms)
+
+
+def _crawl(name: str, options) -> Optional[dict]:
+    if options is None or options is False:
+        return None
+    if options is True:
+        options = {}
+    if not isinstance(options, dict):
+        raise ValueError(f"Pipeline {name} crawl must be a mapping")
+    unknown = set(options) - set(CRAWL_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown crawl options: {', '.join(sorted(unknown))}")
+    return {**CRAWL_DEFAULTS, **options}
+
+
+def parse_spec(data: dict, base_dir: str = ".") -> PipelineSpec:
+    """Build a PipelineSpec from a decoded YAML or JSON document.
+
+    Raises:
+        ValueError: When the document does not describe a valid pipeline
+    """
+    if not isinstance(data, dict):
+        raise ValueError("A pipeline spec must be a mapping")
+    name = data.get("name")
+    if not name:
+        raise ValueError("A pipeline spec needs a name")
+    fields = data.get("fields")
+    if not isinstance(fields, dict) or not fields:
+        raise ValueError(f"Pipeline {name} needs a mapping of fields")
+    sink = data.get("sink")
+    if sink is not None and not isinstance(sink, dict):
+        raise ValueError(f"Pipeline {name} sink must be a mapping")
+    if sink and isinstance(sink.get("path"), str) and "://" not in sink["path"]:
+        # Like file sources, relative to the spec rather than the working directory
+        sink = {**sink, "path": os.path.join(base_dir, sink["path"])}
+    return PipelineSpec(
+        name,
+        _sources(data.get("sources"), base_dir),
+        [_field(field, options) for field, options in fields.items()],
+        sink,
+        _crawl(name, data.get("crawl")),
+    )
+
+
+def load_spec(path: str) -> PipelineSpec:
+    """Load a pipeline spec from a .json, .yaml or .yml file.
+
+    Raises:
+        ValueError: When the file cannot be decoded or is not a valid pipeline
+    """
+    with open(path, encoding="utf-8") as file:
+        text = file.read()
+    if path.endswith(".json"):
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in {path}: {str(e)}")
+    else:
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError(f"PyYAML is needed to read {path}")
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML in {path}: {str(e)}")
+    return parse_spec(data, os.path.dirname(os.path.abspath(path)))
+
+
+def discover_specs(directory: str) -> list[str]:
+    """Return the pipeline spec files in a directory, sorted by name"""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith(SPEC_EXTENSIONS)
+    )
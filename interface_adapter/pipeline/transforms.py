@@ -0,0 +1,111 @@
+import html
+import re
+from typing import Any, Callable, Optional
+
+# Extractions arrive as HTML strings, the same form the process pool returns,
+# so transforms work on markup text and never need the parsed tree
+_TAG = re.compile(r"<[^>]*>")
+_SPACE = re.compile(r"\s+")
+
+
+def _text(value: str) -> str:
+    return _SPACE.sub(" ", html.unescape(_TAG.sub(" ", value))).strip()
+
+
+def _attr(name: str) -> Callable[[str], Optional[str]]:
+    pattern = re.compile(
+        r"^\s*<[^\s>]+[^>]*?\s"
+        + re.escape(name)
+        + r"""\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""",
+        re.IGNORECASE,
+    )
+
+    def attr(value: str) -> Optional[str]:
+        match = pattern.match(value)
+        if match is None:
+            return None
+        return html.unescape(
+            next(group for group in match.groups() if group is not None)
+        )
+
+    return attr
+
+
+def _regex(expression: str) -> Callable[[str], Optional[str]]:
+    pattern = re.compile(expression)
+
+    def search(value: str) -> Optional[str]:
+        match = pattern.search(value)
+        if match is None:
+            return None
+        return match.group(1) if pattern.groups else match.group(0)
+
+    return search
+
+
+# name -> transform applied to every extracted value
+_value_transforms: dict[str, Callable[[str], Any]] = {
+    "text": _text,
+    "strip": str.strip,
+    "lower": str.lower,
+    "upper": str.upper,
+    "int": lambda value: int(value.replace(",", "").strip()),
+    "float": lambda value: float(value.replace(",", "").strip()),
+}
+
+# name -> factory taking the argument after the colon, e.g. ``attr:href``
+_value_factories: dict[str, Callable[[str], Callable[[str], Any]]] = {
+    "attr": _attr,
+    "regex": _regex,
+}
+
+# name -> transform applied to the list a structure field produces
+_list_transforms: dict[str, Callable[[list], Any]] = {
+    "first": lambda values: values[0] if values else None,
+    "last": lambda values: values[-1] if values else None,
+    "count": len,
+    "unique": lambda values: list(dict.fromkeys(values)),
+    "compact": lambda values: [value for value in values if value not in (None, "")],
+}
+
+
+def _compile_one(name: str) -> tuple[bool, Callable]:
+    """Return (applies to lists, function) for one transform name"""
+    if name in _value_transforms:
+        return False, _value_transforms[name]
+    if name in _list_transforms:
+        return True, _list_transforms[name]
+    prefix, _, argument = name.partition(":")
+    if prefix == "join":
+        return True, lambda values: argument.join(str(value) for value in values)
+    if prefix in _value_factories and argument:
+        try:
+            return False, _value_factories[prefix](argument)
+        except re.error as e:
+            raise ValueError(f"Invalid transform {name}: {str(e)}")
+    raise ValueError(f"Unknown transform: {name}")
+
+
+def compile_transforms(names: list[str]) -> Callable[[Any], Any]:
+    """Compile transform names into one function applied left to right.
+
+    Value transforms run on a single string, or on every item while the value
+    is a list; list transforms such as ``first`` or ``join:,`` run on the list
+    itself. None passes through value transforms unchanged.
+
+    Raises:
+        ValueError: When a name is unknown or its argument does not compile
+    """
+    steps = [_compile_one(name) for name in names]
+
+    def apply(value):
+        for on_list, step in steps:
+            if on_list:
+                value = step(value) if isinstance(value, list) else value
+            elif isinstance(value, list):
+                value = [None if item is None else step(item) for item in value]
+            elif value is not None:
+                value = step(value)
+        return value
+
+    return apply
@@ -0,0 +1,326 @@
+import json
+import os
+from typing import Optional
+
+from interface_adapter.sinks.sink import Sink, register_sink
+
+FORMATS = ("parquet", "feather", "csv")
+
+# Codec used when none is given; CSV stays plain text unless asked for
+_default_compression = {"parquet": "zstd", "feather": "lz4", "csv": None}
+
+
+def _arrow_type(pa, name: str):
+    """Resolve a type name such as "int64" or "list<string>" """
+    if name.startswith("list<") and name.endswith(">"):
+        return pa.list_(_arrow_type(pa, name[5:-1]))
+    try:
+        return pa.type_for_alias(name)
+    except ValueError:
+        raise ValueError(f"Unknown column type: {name}")
+
+
+class ArrowSink(Sink):
+    """Buffer records into Arrow record batches and stream them to a file.
+
+    Only batch_size records are held at a time, each full buffer becomes one
+    record batch (a row group for Parquet), so memory stays flat however many
+    records a job produces. The schema is taken from the first batch unless
+    given; columns that are still all null there are written as strings and
+    columns mixing types (or nested values in CSV) as JSON text. A string
+    column that later receives other values switches to JSON text for them.
+    A column first seen in a later batch, or an inferred column whose values
+    stop fitting its type, widens the schema; the formats cannot change the
+    schema of a file being written, so the rows written so far are streamed
+    into a new file with the wider schema, one record batch at a time.
+    Only columns declared with schema keep their type and refuse the rest.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        format: str = "parquet",
+        batch_size: int = 10_000,
+        compression: Optional[str] = None,
+        schema: Optional[dict[str, str]] = None,
+        resume_at: Optional[int] = None,
+    ):
+        """
+        Args:
+            path (str): File to write
+            format (str): One of parquet, feather or csv
+            batch_size (int): Records per record batch
+            compression (str): Codec such as zstd, snappy, lz4 or gzip, or "none"
+            schema (dict[str, str]): Column types by name, e.g. {"price": "float64"},
+                "json" writes the column as JSON text
+            resume_at (int): Refused, a columnar file cannot be reopened for appending
+        """
+        try:
+            import pyarrow
+        except ImportError:
+            raise ValueError(f"pyarrow is needed for the {format} sink")
+        if format not in FORMATS:
+            raise ValueError(f"Unknown columnar format: {format}")
+        if resume_at is not None:
+            raise ValueError(f"{format.capitalize()} sinks cannot resume")
+        self._pa = pyarrow
+        self.path = path
+        self.format = format
+        self.batch_size = batch_size
+        self.compression = (
+            _default_compression[format] if compression is None else compression
+        )
+        if self.compression == "none":
+            self.compression = None
+        # Columns written as JSON text because Arrow cannot type their values
+        self._json_columns: set[str] = {
+            name for name, type_name in (schema or {}).items() if type_name == "json"
+        }
+        self._types = {
+            name: (
+                pyarrow.string()
+                if type_name == "json"
+                else _arrow_type(pyarrow, type_name)
+            )
+            for name, type_name in (schema or {}).items()
+        }
+        self.schema = None
+        self._writer = None
+        self._stream = None
+        self._buffer: list[dict] = []
+
+    def write(self, records: list[dict]):
+        self._buffer.extend(records)
+        while len(self._buffer) >= self.batch_size:
+            batch = self._buffer[: self.batch_size]
+            del self._buffer[: self.batch_size]
+            self._write_batch(batch)
+
+    def flush(self):
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            self._write_batch(batch)
+
+    def close(self):
+        self.flush()
+        self._close_writer()
+
+    def _close_writer(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def _write_batch(self, records: list[dict]):
+        pa = self._pa
+        if self.schema is None:
+            self.schema = self._infer_schema(records)
+        else:
+            self._check_columns(records)
+        try:
+            batch = self._to_batch(records)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            misfits = self._misfits(records)
+            declared = [field for field in misfits if field.name in self._types]
+            if declared or not misfits:
+                field = (declared or [None])[0]
+                where = f" in column {field.name} of type {field.type}" if field else ""
+                raise ValueError(
+                    f"Records do not match the {self.path} schema{where},"
+                    f" declare the column types with schema: {str(e)}"
+                )
+            # Inferred columns whose values drifted are kept as JSON text
+            self._json_columns.update(field.name for field in misfits)
+            self._widen({field.name: pa.string() for field in misfits})
+            batch = self._to_batch(records)
+        if self._writer is None:
+            self._writer = self._open_writer()
+        self._writer.write_batch(batch)
+
+    def _to_batch(self, records: list[dict]):
+        if self._json_columns:
+            records = [self._encode(record) for record in records]
+        return self._pa.RecordBatch.from_pylist(records, schema=self.schema)
+
+    def _check_columns(self, records: list[dict]):
+        """Fit a batch written after the schema was fixed.
+
+        String columns take other values as JSON text from now on, and keys
+        the schema has no column for are added to it rather than dropped.
+        """
+        pa = self._pa
+        names = set(self.schema.names)
+        new = list(
+            dict.fromkeys(
+                name for record in records for name in record if name not in names
+            )
+        )
+        if new:
+            self._widen({name: self._infer_type(name, records) for name in new})
+        for field in self.schema:
+            if field.name in self._json_columns or not pa.types.is_string(field.type):
+                continue
+            if any(
+                record.get(field.name) is not None
+                and not isinstance(record[field.name], str)
+                for record in records
+            ):
+                self._json_columns.add(field.name)
+
+    def _misfits(self, records: list[dict]) -> list:
+        """List the fields whose values in records do not fit their type"""
+        pa = self._pa
+        misfits = []
+        for field in self.schema:
+            if field.name in self._json_columns:
+                continue
+            try:
+                pa.array(
+                    [record.get(field.name) for record in records], type=field.type
+                )
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                misfits.append(field)
+        return misfits
+
+    def _widen(self, types: dict):
+        """Retype or add the columns in types and move written rows over to them"""
+        pa = self._pa
+        written = self.schema
+        fields = [
+            pa.field(field.name, types.pop(field.name, field.type)) for field in written
+        ]
+        fields.extend(
+            pa.field(name, column_type) for name, column_type in types.items()
+        )
+        self.schema = pa.schema(fields)
+        if self._writer is None:
+            return
+        self._close_writer()
+        moved = self.path + ".widening"
+        os.replace(self.path, moved)
+        self._writer = self._open_writer()
+        for batch in self._read_batches(moved, written):
+            self._writer.write_batch(self._convert(batch))
+        os.remove(moved)
+
+    def _convert(self, batch):
+        """Fit a record batch written under an earlier schema to the current one"""
+        pa = self._pa
+        columns = []
+        for field in self.schema:
+            if field.name not in batch.schema.names:
+                columns.append(pa.nulls(batch.num_rows, field.type))
+                continue
+            column = batch.column(field.name)
+            if column.type != field.type:
+                # A column that drifted to JSON text, earlier values go with it
+                column = pa.array(
+                    [
+                        None if value is None else json.dumps(value, default=str)
+                        for value in column.to_pylist()
+                    ],
+                    field.type,
+                )
+            columns.append(column)
+        return pa.RecordBatch.from_arrays(columns, schema=self.schema)
+
+    def _read_batches(self, path: str, schema):
+        """Stream the record batches of a file this sink wrote under schema"""
+        pa = self._pa
+        if self.format == "parquet":
+            import pyarrow.parquet
+
+            yield from pyarrow.parquet.ParquetFile(path).iter_batches(self.batch_size)
+            return
+        if self.format == "feather":
+            with pa.memory_map(path) as source:
+                reader = pa.ipc.open_file(source)
+                for i in range(reader.num_record_batches):
+                    yield reader.get_batch(i)
+            return
+        import pyarrow.csv
+
+        # Quoted empty strings stay strings, bare empty fields are null
+        options = pyarrow.csv.ConvertOptions(
+            column_types=schema,
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=False,
+        )
+        with pa.OSFile(path) as source:
+            stream = (
+                pa.CompressedInputStream(source, self.compression)
+                if self.compression
+                else source
+            )
+            yield from pyarrow.csv.open_csv(stream, convert_options=options)
+
+    def _encode(self, record: dict) -> dict:
+        """Write values of JSON columns that are not already strings as JSON"""
+        record = dict(record)
+        for name in self._json_columns.intersection(record):
+            value = record[name]
+            if value is not None and not isinstance(value, str):
+                record[name] = json.dumps(value, ensure_ascii=False)
+        return record
+
+    def _infer_schema(self, records: list[dict]):
+        pa = self._pa
+        names = list(dict.fromkeys(name for record in records for name in record))
+        fields = [pa.field(name, self._infer_type(name, records)) for name in names]
+        for name, column_type in self._types.items():
+            if name not in names:
+                fields.append(pa.field(name, column_type))
+        return pa.schema(fields)
+
+    def _infer_type(self, name: str, records: list[dict]):
+        pa = self._pa
+        column_type = self._types.get(name)
+        if column_type is not None:
+            return column_type
+        values = [record.get(name) for record in records]
+        try:
+            column_type = pa.array(values).type
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed values, e.g. a string and a list, fall back to JSON text
+            column_type = None
+        is_nested = column_type is not None and pa.types.is_nested(column_type)
+        if column_type is None or (self.format == "csv" and is_nested):
+            # CSV has no nested types either
+            self._json_columns.add(name)
+            return pa.string()
+        if pa.types.is_null(column_type):
+            return pa.string()
+        return column_type
+
+    def _open_writer(self):
+        pa = self._pa
+        if self.format == "parquet":
+            import pyarrow.parquet
+
+            return pyarrow.parquet.ParquetWriter(
+                self.path, self.schema, compression=self.compression or "none"
+            )
+        if self.format == "feather":
+            options = pa.ipc.IpcWriteOptions(compression=self.compression)
+            return pa.ipc.new_file(self.path, self.schema, options=options)
+        import pyarrow.csv
+
+        if self.compression:
+            self._stream = pa.CompressedOutputStream(self.path, self.compression)
+        else:
+            self._stream = pa.OSFile(self.path, "wb")
+        return pyarrow.csv.CSVWriter(self._stream, self.schema)
+
+
+def _format_sink(format: str):
+    def open_format(path: str, **options) -> ArrowSink:
+        return ArrowSink(path, format=format, **options)
+
+    return open_format
+
+
+for _format in FORMATS:
+    register_sink(_format, _format_sink(_format))
+register_sink("arrow", _format_sink("feather"))
@@ -0,0 +1,345 @@
+import io
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Sequence
+from urllib.parse import urlsplit
+
+from interface_adapter.sinks.sink import Sink, register_sink
+
+SQLITE = "sqlite"
+POSTGRES = "postgresql"
+
+
+def quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class ConnectionPool:
+    """Fixed set of open connections handed out one caller at a time"""
+
+    def __init__(self, connect: Callable, size: int = 4):
+        self._connect = connect
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.Semaphore(size)
+        self._closed = False
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection, opening it the first time its slot is used"""
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+            except Exception:
+                try:
+                    conn.rollback()
+                except Exception:
+                    # A connection that cannot roll back is not handed out again
+                    conn.close()
+                    conn = None
+                raise
+            finally:
+                if conn is not None and self._closed:
+                    conn.close()
+                elif conn is not None:
+                    self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def _connect_sqlite(path: str) -> Callable:
+    def connect():
+        conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        # WAL lets readers run during loads, NORMAL syncs once per checkpoint
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    return connect
+
+
+def _connect_postgres(url: str) -> Callable:
+    try:
+        import psycopg
+    except ImportError:
+        try:
+            import psycopg2 as psycopg
+        except ImportError:
+            raise ValueError("psycopg or psycopg2 is needed for PostgreSQL sinks")
+    # Drivers take libpq urls, without a "+driver" suffix on the scheme
+    url = POSTGRES + url[url.index("://"):]
+
+    def connect():
+        return psycopg.connect(url)
+
+    return connect
+
+
+# url -> pool, so sinks writing to one database share its connections
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(url: str, size: int = 4) -> ConnectionPool:
+    """Return the shared pool for a ``sqlite:///path`` or ``postgresql://`` url"""
+    with _pools_lock:
+        pool = _pools.get(url)
+        if pool is None:
+            dialect = dialect_of(url)
+            if dialect == SQLITE:
+                connect = _connect_sqlite(urlsplit(url).path[1:] or ":memory:")
+            else:
+                connect = _connect_postgres(url)
+            pool = _pools[url] = ConnectionPool(connect, size)
+        return pool
+
+
+def close_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+def dialect_of(url: str) -> str:
+    scheme = urlsplit(url).scheme.split("+")[0]
+    if scheme == SQLITE:
+        return SQLITE
+    if scheme in (POSTGRES, "postgres"):
+        return POSTGRES
+    raise ValueError(f"Unsupported database url: {url}")
+
+
+def _column_type(dialect: str, values: Sequence) -> str:
+    kinds = {type(value) for value in values if value is not None}
+    if kinds == {bool}:
+        return "BOOLEAN"
+    if kinds and kinds <= {int, bool}:
+        return "BIGINT" if dialect == POSTGRES else "INTEGER"
+    if kinds and kinds <= {int, float}:
+        return "DOUBLE PRECISION" if dialect == POSTGRES else "REAL"
+    return "TEXT"
+
+
+def _value(value):
+    """Store lists and mappings as JSON text"""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+class DatabaseSink(Sink):
+    """Bulk-load records into a SQLite or PostgreSQL table.
+
+    Records are buffered and every batch_size of them is written in one
+    transaction: with executemany on SQLite, and with COPY on PostgreSQL.
+    With a key, rows are upserted with INSERT ... ON CONFLICT (key) DO UPDATE,
+    through a temporary staging table on PostgreSQL so COPY can still be used.
+    The table is created from the first batch when it does not exist, and
+    keys first seen in a later batch are added to it as new columns. Rows
+    of one batch sharing a key are reduced to the last, as the upsert takes
+    every key once. Only keyed sinks can resume a job, replaying rows there
+    is idempotent.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        table: str,
+        key: Optional[Sequence[str]] = None,
+        batch_size: int = 5000,
+        pool_size: int = 4,
+        columns: Optional[Sequence[str]] = None,
+        resume_at: Optional[int] = None,
+    ):
+        """
+        Args:
+            url (str): ``sqlite:///relative.db``, ``sqlite:////absolute.db`` or a
+                PostgreSQL url
+            table (str): Table to load into
+            key (Sequence[str]): Columns identifying a row, enables upserts
+            batch_size (int): Records written per transaction
+            pool_size (int): Connections kept open for this database
+            columns (Sequence[str]): Columns to load, all record keys by default
+            resume_at (int): Rows loaded before a restart, needs a key
+        """
+        self.dialect = dialect_of(url)
+        self.pool = get_pool(url, pool_size)
+        self.table = table
+        self.key = [key] if isinstance(key, str) else list(key or ())
+        self.batch_size = batch_size
+        self.columns = list(columns) if columns else None
+        # Given columns are a selection, otherwise new record keys are added
+        self._grow = not columns
+        if resume_at is not None and not self.key:
+            raise ValueError("Database sinks without a key cannot resume")
+        self.loaded = resume_at or 0
+        self._buffer: list[dict] = []
+        # Columns the table is known to have, None until it was created
+        self._table_columns: Optional[set[str]] = None
+
+    def write(self, records: list[dict]):
+        self._buffer.extend(records)
+        while len(self._buffer) >= self.batch_size:
+            batch = self._buffer[: self.batch_size]
+            del self._buffer[: self.batch_size]
+            self._load(batch)
+
+    def flush(self):
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            self._load(batch)
+
+    def checkpoint(self) -> Optional[int]:
+        """Flush and return the rows loaded, once they are durable"""
+        if not self.key:
+            return None
+        self.flush()
+        return self.loaded
+
+    def _load(self, records: list[dict]):
+        if self.columns is None:
+            self.columns = []
+        if self._grow:
+            known = set(self.columns)
+            self.columns.extend(
+                dict.fromkeys(k for record in records for k in record if k not in known)
+            )
+        missing = [column for column in self.key if column not in self.columns]
+        if missing:
+            raise ValueError(f"Key columns missing from records: {', '.join(missing)}")
+        rows = [
+            tuple(_value(record.get(column)) for column in self.columns)
+            for record in records
+        ]
+        if self.key:
+            # The last row of a key wins, as it would row by row
+            positions = [self.columns.index(column) for column in self.key]
+            rows = list(
+                {tuple(row[i] for i in positions): row for row in rows}.values()
+            )
+        with self.pool.connection() as conn:
+            if self.key and self.dialect == SQLITE:
+                # NORMAL leaves the last commits in an unsynced WAL, a crash
+                # could then lose rows that a checkpoint already counts
+                conn.execute("PRAGMA synchronous=FULL")
+            self._prepare_table(conn, records)
+            if self.dialect == POSTGRES:
+                self._copy(conn, rows)
+            else:
+                conn.executemany(self._insert_sql(self.table), rows)
+            conn.commit()
+        self.loaded += len(records)
+
+    def _prepare_table(self, conn, records: list[dict]):
+        """Create the table on first use and add the columns it lacks"""
+        cursor = conn.cursor()
+        if self._table_columns is None:
+            definitions = [
+                f"{quote(column)} {self._column_type(column, records)}"
+                for column in self.columns
+            ]
+            if self.key:
+                definitions.append(f"PRIMARY KEY ({', '.join(map(quote, self.key))})")
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {quote(self.table)}"
+                f" ({', '.join(definitions)})"
+            )
+            self._table_columns = self._read_columns(cursor)
+        for column in self.columns:
+            if column not in self._table_columns:
+                cursor.execute(
+                    f"ALTER TABLE {quote(self.table)} ADD COLUMN {quote(column)}"
+                    f" {self._column_type(column, records)}"
+                )
+                self._table_columns.add(column)
+
+    def _column_type(self, column: str, records: list[dict]) -> str:
+        return _column_type(self.dialect, [record.get(column) for record in records])
+
+    def _read_columns(self, cursor) -> set[str]:
+        if self.dialect == SQLITE:
+            cursor.execute(f"PRAGMA table_info({quote(self.table)})")
+            return {row[1] for row in cursor.fetchall()}
+        cursor.execute(
+            "SELECT column_name FROM information_schema.columns"
+            " WHERE table_schema = current_schema() AND table_name = %s",
+            (self.table,),
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+    def _insert_sql(self, table: str, source: Optional[str] = None) -> str:
+        columns = ", ".join(map(quote, self.columns))
+        if source is None:
+            marker = "?" if self.dialect == SQLITE else "%s"
+            values = f"VALUES ({', '.join(marker for _ in self.columns)})"
+        else:
+            values = f"SELECT {columns} FROM {quote(source)}"
+        sql = f"INSERT INTO {quote(table)} ({columns}) {values}"
+        if self.key:
+            updates = [
+                f"{quote(column)} = excluded.{quote(column)}"
+                for column in self.columns
+                if column not in self.key
+            ]
+            conflict = ", ".join(map(quote, self.key))
+            action = f"DO UPDATE SET {', '.join(updates)}" if updates else "DO NOTHING"
+            sql += f" ON CONFLICT ({conflict}) {action}"
+        return sql
+
+    def _copy(self, conn, rows: list[tuple]):
+        cursor = conn.cursor()
+        target = self.table
+        if self.key:
+            target = f"_staging_{self.table}"
+            # Made per load so it follows columns added to the table
+            cursor.execute(
+                f"CREATE TEMP TABLE {quote(target)}"
+                f" (LIKE {quote(self.table)} INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+        copy_sql = (
+            f"COPY {quote(target)} ({', '.join(map(quote, self.columns))}) FROM STDIN"
+        )
+        if hasattr(cursor, "copy"):
+            # psycopg 3
+            with cursor.copy(copy_sql) as copy:
+                for row in rows:
+                    copy.write_row(row)
+        else:
+            cursor.copy_expert(copy_sql + " WITH (FORMAT csv)", _csv_buffer(rows))
+        if self.key:
+            cursor.execute(self._insert_sql(self.table, source=target))
+
+
+def _csv_field(value) -> str:
+    # An unquoted empty field is NULL in COPY's CSV format, so every other
+    # value except numbers is quoted to keep empty strings apart from NULL
+    if value is None:
+        return ""
+    if isinstance(value, (bool, int, float)):
+        return str(value)
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _csv_buffer(rows: Iterator[tuple]) -> io.StringIO:
+    return io.StringIO(
+        "".join(",".join(map(_csv_field, row)) + "\n" for row in rows)
+    )
+
+
+register_sink("database", DatabaseSink)
@@ -0,0 +1,79 @@
+import gzip
+import json
+import os
+from typing import Optional
+
+from interface_adapter.sinks.sink import Sink, register_sink
+
+
+class JsonlSink(Sink):
+    """Write records as one JSON object per line, optionally gzip-compressed.
+
+    Uncompressed files can resume a job: checkpoint() fsyncs the file and
+    returns its size, and resume_at truncates the file back to that offset
+    and appends from there.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        append: bool = False,
+        compression: Optional[str] = None,
+        batch_size: int = 1000,
+        resume_at: Optional[int] = None,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer: list[str] = []
+        if compression is None and path.endswith(".gz"):
+            compression = "gzip"
+        self.compression = None if compression == "none" else compression
+        if resume_at is not None:
+            if self.compression:
+                raise ValueError("Compressed JSONL sinks cannot resume")
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            if size < resume_at:
+                # Truncating would pad the file with NULs to the offset
+                raise ValueError(
+                    f"{path} holds {size} bytes but its checkpoint {resume_at},"
+                    " the output was lost or changed since"
+                )
+            if os.path.exists(path):
+                os.truncate(path, resume_at)
+            append = True
+        mode = "at" if append else "wt"
+        if self.compression == "gzip":
+            self._file = gzip.open(path, mode, encoding="utf-8")
+        elif self.compression is None:
+            self._file = open(path, mode, encoding="utf-8")
+        else:
+            raise ValueError(f"Unsupported JSONL compression: {compression}")
+
+    def write(self, records: list[dict]):
+        self._buffer.extend(
+            json.dumps(record, ensure_ascii=False) + "\n" for record in records
+        )
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer = []
+        self._file.flush()
+
+    def checkpoint(self) -> Optional[int]:
+        if self.compression:
+            return None
+        self.flush()
+        # The offset is only committed once the records under it are durable
+        os.fsync(self._file.fileno())
+        return os.fstat(self._file.fileno()).st_size
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+register_sink("jsonl", JsonlSink)
@@ -0,0 +1,120 @@
+import os
+from abc import ABC, abstractmethod
+from importlib import import_module
+from typing import Callable, Optional
+
+
+class Sink(ABC):
+    """Destination for extracted records, written in batches"""
+
+    @abstractmethod
+    def write(self, records: list[dict]):
+        """This function will write a batch of records
+        Args:
+            records (list[dict]): Records mapping field names to values
+        """
+        pass
+
+    def flush(self):
+        pass
+
+    def checkpoint(self) -> Optional[int]:
+        """Flush and return an offset the sink can be reopened at with resume_at.
+
+        None means the sink cannot resume a job exactly once.
+        """
+        return None
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# type name -> factory called with the remaining sink options
+_sinks: dict[str, Callable[..., Sink]] = {}
+
+# Built-in sinks are imported on first use so their dependencies stay optional
+_builtin_modules = {
+    "jsonl": "interface_adapter.sinks.jsonl_sink",
+    "parquet": "interface_adapter.sinks.arrow_sink",
+    "feather": "interface_adapter.sinks.arrow_sink",
+    "arrow": "interface_adapter.sinks.arrow_sink",
+    "csv": "interface_adapter.sinks.arrow_sink",
+    "database": "interface_adapter.sinks.database_sink",
+}
+
+# file extension -> sink type, for picking a sink from an output path
+_extensions = {
+    ".jsonl": "jsonl",
+    ".json": "jsonl",
+    ".parquet": "parquet",
+    ".feather": "feather",
+    ".arrow": "arrow",
+    ".csv": "csv",
+}
+
+
+def register_sink(name: str, factory: Callable[..., Sink]):
+    """Register a sink type usable from pipeline specs.
+
+    Args:
+        name (str): Value of the ``type`` key that selects the sink
+        factory (Callable): Called with the other keys of the sink options
+    """
+    _sinks[name] = factory
+
+
+def open_sink(options: dict) -> Sink:
+    """Build a sink from options such as ``{"type": "jsonl", "path": "out.jsonl"}``.
+
+    Raises:
+        ValueError: When the sink type is unknown or the options do not fit it
+    """
+    options = dict(options)
+    name = options.pop("type", None) or _extensions.get(
+        _extension(options.get("path", "")), "jsonl"
+    )
+    if name not in _sinks and name in _builtin_modules:
+        import_module(_builtin_modules[name])
+    if name not in _sinks:
+        raise ValueError(f"Unknown sink type: {name}")
+    try:
+        return _sinks[name](**options)
+    except TypeError as e:
+        raise ValueError(f"Invalid options for {name} sink: {str(e)}")
+
+
+def _extension(path: str) -> str:
+    stem = path[:-3] if path.endswith(".gz") else path
+    return os.path.splitext(stem)[1].lower()
+
+
+def sink_for_path(path: str, **options) -> Sink:
+    """Open the sink matching the extension of path, e.g. ``out.parquet``.
+
+    A trailing ``.gz`` selects gzip compression for JSONL and CSV, and a
+    database url such as ``sqlite:///out.db`` opens a database sink. A
+    schema option only reaches the columnar sinks.
+
+    Raises:
+        ValueError: When the extension is not one a sink writes
+    """
+    if "://" in path:
+        options.pop("compression", None)
+        options.pop("schema", None)
+        return open_sink({"type": "database", "url": path, **options})
+    options.pop("table", None)
+    options.pop("key", None)
+    extension = _extension(path)
+    if extension not in _extensions:
+        raise ValueError(f"No sink writes {extension or 'files without extension'}")
+    if _extensions[extension] == "jsonl":
+        options.pop("schema", None)
+    if path.endswith(".gz"):
+        options.setdefault("compression", "gzip")
+    return open_sink({"type": _extensions[extension], "path": path, **options})
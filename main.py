@@ -10,21 +10,46 @@ from PyQt6.QtWidgets import (
     QMainWindow,
     QSizePolicy,
     QLabel,
+    QCheckBox,
 )
-from PyQt6.QtCore import pyqtSignal, Qt
+from PyQt6.QtCore import pyqtSignal, Qt, QTimer
+import json
+import os
 import sys
-import threading
 
 from widgets.inputs.input_control import SingleInputControl as InputControl
 from widgets.buttons.button import Button
-from widgets.tables.table_text import TableTextWidget
+from widgets.tables.table_text_tab import TableTextTabWidget
+from widgets.tables.metrics_panel import MetricsPanel
 from widgets.dropdown.dropdown import Dropdown
 from usecases.impl.fetch_url_use_case_impl import FetchUrlUseCaseImpl as fuUseCase
+from usecases.impl.resilient_fetch_url_use_case_impl import (
+    ResilientFetchUrlUseCaseImpl as rfuUseCase,
+)
+from usecases.impl.async_fetch_url_use_case_impl import (
+    AsyncFetchUrlUseCaseImpl as afuUseCase,
+)
 from usecases.impl.convert_into_beautifulsoup_use_case_impl import (
     ConvertIntoBeautifulSoupUseCaseImpl as cibsuUseCase,
 )
 from usecases.impl.get_one_tag_use_case_impl import GetOneTagUseCaseImpl as gotuUseCase
+from usecases.impl.get_all_by_html_structure_use_case_impl import (
+    GetAllByHtmlStructureUseCaseImpl as gabhsUseCase,
+)
 from interface_adapter.controller.controller import Controller
+from interface_adapter.controller.controller_executor import ControllerExecutor
+from widgets.workers.qt_controller_executor import QtControllerExecutor
+from interface_adapter.controller.document_cache import DocumentCache
+from interface_adapter.controller.metrics import Metrics
+from interface_adapter.controller.job_profiler import JobProfiler
+from interface_adapter.pipeline.spec import discover_specs, load_spec
+
+# Pipeline specs listed in the dropdown
+PIPELINES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pipelines")
+# Record keys that are not extracted fields, errors are shown when set
+RECORD_KEYS = frozenset(("url", "depth", "error"))
+# Profiles of jobs without an output file of their own
+PROFILES_DIR = os.path.join(os.path.expanduser("~"), ".scraper", "profiles")
 
 
 class ResponsiveDrawer(QFrame):
@@ -95,10 +120,23 @@ class ResponsiveDrawer(QFrame):
 class SplitterBasedGallery(QMainWindow):
     """Alternative implementation using QSplitter for smooth resizing"""
 
-    def __init__(self, parent=None, controller: Controller = None):
+    def __init__(
+        self,
+        parent=None,
+        controller: Controller = None,
+        executor: ControllerExecutor = None,
+    ):
         super().__init__(parent)
 
         self.controller = controller
+        self.pipeline_paths = discover_specs(PIPELINES_DIR)
+        self.selected_pipeline = None
+        self._pipeline_job = None
+        self.profiler = JobProfiler(PROFILES_DIR)
+        self.profiler.enabled = False
+        self.executor = QtControllerExecutor(
+            executor or ControllerExecutor(controller), parent=self
+        )
 
         self.setupUI()
         self.connectSignals()
@@ -127,7 +165,8 @@ class SplitterBasedGallery(QMainWindow):
                 border-right: 1px solid #dee2e6;
             }
         """)
-        self.setupDrawerPanel()
+        # Filled in when it is first opened
+        self.drawer_built = False
         self.drawer_panel.hide()
 
         # Main content panel
@@ -160,6 +199,15 @@ class SplitterBasedGallery(QMainWindow):
         self.toggle_btn.setFixedSize(100, 30)
         toggle_layout.addWidget(self.toggle_btn)
         toggle_layout.addStretch()
+        self.metrics_btn = QPushButton("Show Metrics")
+        self.metrics_btn.setFixedSize(110, 30)
+        self.metrics_btn.setEnabled(self.controller.metrics is not None)
+        toggle_layout.addWidget(self.metrics_btn)
+        self.profile_check = QCheckBox("Profile jobs")
+        self.profile_check.setToolTip(
+            f"Write cProfile and tracemalloc reports to {PROFILES_DIR}"
+        )
+        toggle_layout.addWidget(self.profile_check)
 
         main_layout.insertLayout(0, toggle_layout)
 
@@ -181,12 +229,18 @@ class SplitterBasedGallery(QMainWindow):
         """Setup main content panel"""
         content_layout = QGridLayout(self.content_panel)
 
-        self.table_text = TableTextWidget(controller=self.controller)
+        self.table_text = TableTextTabWidget(controller=self.controller)
 
         # Create components
         self.dropdown = Dropdown(
-            items=["Option 1", "Option 2", "Option 3"], placeholder="Choose..."
+            items=["Fetch page"]
+            + [
+                os.path.splitext(os.path.basename(path))[0]
+                for path in self.pipeline_paths
+            ],
+            placeholder="Choose...",
         )
+        self.dropdown.currentIndexChanged.connect(self.dropdown_changed)
 
         self.singleInputControl = InputControl(
             label_text="Enter Url here:",
@@ -217,22 +271,98 @@ class SplitterBasedGallery(QMainWindow):
         content_layout.addWidget(
             self.table_text, 3, 0, alignment=Qt.AlignmentFlag.AlignTop
         )
+        # Built when first shown
+        self.metrics_panel = None
         content_layout.setRowStretch(5, 1)
 
     def dropdown_changed(self):
-        """this dropdown will handle widget change"""
-        # TODO
-        pass
+        """Select a plain fetch or one of the pipelines for the submit button"""
+        # Index 0 is the placeholder and index 1 the plain fetch
+        index = self.dropdown.currentIndex() - 2
+        if 0 <= index < len(self.pipeline_paths):
+            self.selected_pipeline = self.pipeline_paths[index]
+        else:
+            self.selected_pipeline = None
 
     def on_submit_clicked(self):
         url = self.singleInputControl.get_text()
 
-        thread = threading.Thread(target=self.controller.fetch_url, args=(url,))
-        thread.start()
+        # A newer click supersedes a job that is still queued or running
+        if self.selected_pipeline:
+            self._pipeline_job = self.executor.submit(
+                self.run_pipeline, self.selected_pipeline, url, key="pipeline"
+            )
+            return
+        self.executor.submit(
+            self.profiler.run, "fetch", self.fetch_page, url, key="fetch"
+        )
+
+    def fetch_page(self, url: str):
+        """Fetch url and decode its body, runs on a worker thread"""
+        response, error = self.controller.fetch_url(url)
+        if error:
+            return "", error
+        return response.text, ""
+
+    def run_pipeline(self, path: str, url: str = ""):
+        """Run a pipeline spec, on the entered url instead of its sources if given.
+
+        Runs on a worker thread and returns the run summary as text with the
+        records as (url, field, value) rows for the results table.
+        """
+        # The plan pulls in the crawler and sinks, only needed once a pipeline runs
+        from interface_adapter.pipeline.plan import compile_plan, run_plan
+
+        try:
+            pipeline = load_spec(path)
+        except (OSError, ValueError) as e:
+            return None, f"An error occurred: {str(e)}"
+        if url:
+            pipeline = pipeline.with_urls([url])
+        plan = compile_plan([pipeline])
+        sink_path = (pipeline.sink or {}).get("path")
+        directory = os.path.dirname(os.path.abspath(sink_path)) if sink_path else None
+        rows = []
+
+        def on_record(_pipeline, record):
+            page = record["url"]
+            rows.extend(
+                (page, name, value)
+                for name, value in record.items()
+                if name not in RECORD_KEYS or (name == "error" and value)
+            )
+
+        with self.profiler.profile(pipeline.name, directory):
+            stats, error = run_plan(plan, self.controller, on_record=on_record)
+        summary = json.dumps({"plan": plan.describe(), "results": stats}, indent=2)
+        return (summary, rows), error
+
+    def on_fetch_finished(self, job_id, result, error):
+        """Show the fetched page or pipeline output, runs on the GUI thread"""
+        if self.profiler.last_report:
+            self.statusBar().showMessage(
+                f"Profile written to {self.profiler.last_report}.*"
+            )
+            self.profiler.last_report = None
+        if job_id != self._pipeline_job:
+            self.table_text.show_text(result or "", error)
+            return
+        summary, rows = result or ("", [])
+        self.table_text.tableText.show_result(summary, error)
+        self.table_text.show_results(rows)
 
     def connectSignals(self):
         """Connect signals"""
         self.toggle_btn.clicked.connect(self.toggleDrawerPanel)
+        self.metrics_btn.clicked.connect(self.toggleMetricsPanel)
+        self.profile_check.toggled.connect(self.toggleProfiling)
+        self.executor.finished.connect(
+            self.on_fetch_finished, Qt.ConnectionType.QueuedConnection
+        )
+
+    def closeEvent(self, event):
+        self.executor.shutdown()
+        super().closeEvent(event)
 
     def toggleDrawerPanel(self):
         """Toggle drawer panel visibility"""
@@ -240,28 +370,67 @@ class SplitterBasedGallery(QMainWindow):
             self.drawer_panel.hide()
             self.toggle_btn.setText("Show Menu")
         else:
+            if not self.drawer_built:
+                self.setupDrawerPanel()
+                self.drawer_built = True
             self.drawer_panel.show()
             self.toggle_btn.setText("Hide Menu")
 
+    def toggleProfiling(self, checked: bool):
+        """Profile the jobs submitted from now on"""
+        self.profiler.enabled = checked
+
+    def toggleMetricsPanel(self):
+        """Toggle the live metrics table"""
+        if self.metrics_panel is None:
+            self.metrics_panel = MetricsPanel(self.controller.metrics)
+            self.metrics_panel.hide()
+            self.content_panel.layout().addWidget(self.metrics_panel, 4, 0)
+        if self.metrics_panel.isVisible():
+            self.metrics_panel.hide()
+            self.metrics_btn.setText("Show Metrics")
+        else:
+            self.metrics_panel.show()
+            self.metrics_btn.setText("Hide Metrics")
+
     def action_add_new_table_text(self):
         """Add new table text"""
         # TODO
         pass
 
 
-if __name__ == "__main__":
-    fetch_url_use_case = fuUseCase()
+def preload():
+    """Import the HTTP and parsing stacks, run on a worker after the first frame"""
+    import bs4  # noqa: F401
+    import requests  # noqa: F401
+    import soupsieve  # noqa: F401
+
+
+def build_controller() -> Controller:
+    fetch_url_use_case = afuUseCase(delegate=rfuUseCase(delegate=fuUseCase()))
     convert_into_beautifulsoup_use_case = cibsuUseCase()
     get_one_tag_use_case = gotuUseCase()
+    get_all_by_html_structure_use_case = gabhsUseCase()
 
-    controller = Controller(
+    return Controller(
         fetch_url_use_case=fetch_url_use_case,
         convert_into_beautifulsoup_use_case=convert_into_beautifulsoup_use_case,
         get_one_tag_use_case=get_one_tag_use_case,
+        get_all_by_html_structure_use_case=get_all_by_html_structure_use_case,
+        document_cache=DocumentCache(),
+        metrics=Metrics(),
     )
-    app = QApplication(sys.argv)
-    gallery = SplitterBasedGallery(controller=controller)
+
+
+def main(argv=None) -> int:
+    """Show the window first, heavy modules are loaded once it is up"""
+    app = QApplication.instance() or QApplication(argv or sys.argv)
+    gallery = SplitterBasedGallery(controller=build_controller())
     gallery.resize(1000, 700)
     gallery.show()
+    QTimer.singleShot(0, lambda: gallery.executor.executor.submit(preload))
+    return app.exec()
 
-    sys.exit(app.exec())
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import itertools
+import threading
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+
+class ColumnarResultStore:
+    """Append-only table of extracted values kept as one list per column.
+
+    Rows are never materialised as objects; views read single cells and keep
+    their own row orderings, so a sort or filter costs one list of indices.
+    """
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = list(columns)
+        self._data: list[list[Any]] = [[] for _ in self.columns]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data[0]) if self._data else 0
+
+    def append_rows(self, rows: Iterable[Sequence[Any]]) -> int:
+        """Append rows given in column order and return how many were added"""
+        with self._lock:
+            before = len(self)
+            for row in rows:
+                for column, value in zip(self._data, row):
+                    column.append(value)
+            return len(self) - before
+
+    def append_records(self, records: Iterable[dict]) -> int:
+        """Append dict records, missing columns become None"""
+        return self.append_rows(
+            [record.get(name) for name in self.columns] for record in records
+        )
+
+    def value(self, row: int, column: int) -> Any:
+        return self._data[column][row]
+
+    def column(self, column: int) -> list[Any]:
+        return self._data[column]
+
+    def sorted_rows(
+        self, column: int, rows: Optional[Sequence[int]] = None, reverse=False
+    ) -> list[int]:
+        """Return row indices ordered by a column, numbers before text"""
+        keys = self.sort_keys(column)
+        rows = range(len(keys)) if rows is None else rows
+        return sorted(rows, key=keys.__getitem__, reverse=reverse)
+
+    def sort_keys(self, column: int, start: int = 0) -> list:
+        """Return the keys sorted_rows orders by, for the rows from start on"""
+        return list(map(_sort_key, itertools.islice(self._data[column], start, None)))
+
+    def matching_rows(
+        self,
+        predicate: Callable[[Any], bool],
+        columns: Optional[Sequence[int]] = None,
+        rows: Optional[Sequence[int]] = None,
+    ) -> list[int]:
+        """Return the rows where predicate holds for a value in any of columns"""
+        selected = [self._data[c] for c in (columns or range(len(self.columns)))]
+        rows = range(len(self)) if rows is None else rows
+        return [row for row in rows if any(predicate(v[row]) for v in selected)]
+
+    def clear(self):
+        with self._lock:
+            for column in self._data:
+                column.clear()
+
+
+def _sort_key(value: Any):
+    # Numbers sort before text so mixed columns never compare int with str
+    if isinstance(value, (int, float)):
+        return (0, value, "")
+    if isinstance(value, str):
+        return (1, 0, value)
+    return (1, 0, "" if value is None else str(value))
@@ -0,0 +1,111 @@
+import mmap
+import re
+from array import array
+from bisect import bisect_right
+from typing import Optional, Union
+
+_NEWLINE = re.compile(rb"\n")
+
+
+class MappedTextFile:
+    """Read-only view of a large text file through a memory map.
+
+    Line start offsets are indexed once, in steps so a caller can show the
+    first lines while the rest is still being indexed. Lines are decoded only
+    when asked for and searches run over the map without copying the file.
+    """
+
+    def __init__(self, path: str, encoding: str = "utf-8"):
+        self.path = path
+        self.encoding = encoding
+        self._file = open(path, "rb")
+        size = self._file.seek(0, 2)
+        self._map = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        )
+        self.size = size
+        self._starts = array("Q", [0])
+        self._indexed = 0
+
+    @property
+    def indexed(self) -> bool:
+        return self._indexed >= self.size
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines indexed so far"""
+        count = len(self._starts)
+        # A trailing newline does not start another line
+        if self.indexed and self.size and self._starts[-1] == self.size:
+            count -= 1
+        return count
+
+    def index_step(self, max_bytes: int = 16 << 20) -> bool:
+        """Index the next max_bytes of the file, returns True once complete"""
+        if self.indexed:
+            return True
+        end = min(self._indexed + max_bytes, self.size)
+        self._starts.extend(
+            match.end() for match in _NEWLINE.finditer(self._map, self._indexed, end)
+        )
+        self._indexed = end
+        return self.indexed
+
+    def index_all(self):
+        while not self.index_step():
+            pass
+
+    def covers(self, offset: int) -> bool:
+        """Whether the line holding a byte offset is known yet"""
+        return offset < self._indexed or self.indexed
+
+    def line(self, number: int, max_chars: Optional[int] = None) -> str:
+        start = self._starts[number]
+        if number + 1 < len(self._starts):
+            end = self._starts[number + 1]
+        else:
+            end = self.size if self.indexed else self._indexed
+        if max_chars is not None:
+            end = min(end, start + max_chars * 4)
+        text = self._map[start:end].decode(self.encoding, "replace").rstrip("\r\n")
+        return text if max_chars is None else text[:max_chars]
+
+    def lines(
+        self, first: int, count: int, max_chars: Optional[int] = None
+    ) -> list[str]:
+        last = min(first + count, self.line_count)
+        return [self.line(number, max_chars) for number in range(first, last)]
+
+    def line_start(self, number: int) -> int:
+        return self._starts[number]
+
+    def line_of(self, offset: int) -> int:
+        """Return the number of the line containing a byte offset"""
+        return bisect_right(self._starts, offset) - 1
+
+    def search(
+        self,
+        text: Union[str, bytes],
+        start: int = 0,
+        case_sensitive: bool = True,
+        end: Optional[int] = None,
+    ) -> int:
+        """Return the byte offset of the next match at or after start, or -1.
+
+        With end only matches starting before it are found, so a long search
+        can be split into slices.
+        """
+        needle = text.encode(self.encoding) if isinstance(text, str) else text
+        if not needle or not self.size:
+            return -1
+        limit = self.size if end is None else min(end + len(needle) - 1, self.size)
+        if case_sensitive:
+            return self._map.find(needle, start, limit)
+        pattern = re.compile(re.escape(needle), re.IGNORECASE)
+        match = pattern.search(self._map, start, limit)
+        return match.start() if match else -1
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
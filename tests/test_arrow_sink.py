@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+pyarrow = pytest.importorskip("pyarrow")
+import pyarrow.csv  # noqa: E402
+import pyarrow.parquet  # noqa: E402
+
+from interface_adapter.sinks.arrow_sink import ArrowSink  # noqa: E402
+
+
+def read(path):
+    return pyarrow.parquet.read_table(path).to_pylist()
+
+
+def test_string_column_takes_later_lists_as_json(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    with ArrowSink(path, batch_size=1) as sink:
+        sink.write([{"url": "a", "result": "<p>x</p>"}])
+        sink.write([{"url": "b", "result": ["<li>1</li>", "<li>2</li>"]}])
+    rows = read(path)
+    assert rows[0]["result"] == "<p>x</p>"
+    assert json.loads(rows[1]["result"]) == ["<li>1</li>", "<li>2</li>"]
+
+
+def read_format(path, format, compression=None):
+    if format == "parquet":
+        return read(path)
+    if format == "feather":
+        return pyarrow.ipc.open_file(path).read_all().to_pylist()
+    with pyarrow.OSFile(path) as source:
+        stream = (
+            pyarrow.CompressedInputStream(source, compression)
+            if compression
+            else source
+        )
+        options = pyarrow.csv.ConvertOptions(
+            strings_can_be_null=True, quoted_strings_can_be_null=False
+        )
+        return pyarrow.csv.read_csv(stream, convert_options=options).to_pylist()
+
+
+@pytest.mark.parametrize(
+    "format, compression",
+    [("parquet", None), ("feather", None), ("csv", None), ("csv", "gzip")],
+)
+def test_column_first_seen_in_later_batch_is_added(tmp_path, format, compression):
+    path = str(tmp_path / f"out.{format}")
+    with ArrowSink(path, format=format, batch_size=1, compression=compression) as sink:
+        sink.write([{"url": "a", "title": ""}, {"url": "b", "title": None}])
+        sink.write([{"url": "c", "extra": "z"}, {"url": "d", "title": "t"}])
+    assert read_format(path, format, compression) == [
+        {"url": "a", "title": "", "extra": None},
+        {"url": "b", "title": None, "extra": None},
+        {"url": "c", "title": None, "extra": "z"},
+        {"url": "d", "title": "t", "extra": None},
+    ]
+    assert list(tmp_path.iterdir()) == [tmp_path / f"out.{format}"]
+
+
+def test_declared_columns_and_json_type(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    schema = {"url": "string", "extra": "string", "result": "json"}
+    with ArrowSink(path, batch_size=1, schema=schema) as sink:
+        sink.write([{"url": "a", "result": "text"}])
+        sink.write([{"url": "b", "extra": "z", "result": {"k": 1}}])
+    rows = read(path)
+    assert rows[1]["extra"] == "z"
+    assert json.loads(rows[1]["result"]) == {"k": 1}
+
+
+def test_drifting_column_turns_into_json_text(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    with ArrowSink(path, batch_size=1) as sink:
+        sink.write([{"count": 1}])
+        sink.write([{"count": "many"}])
+        sink.write([{"count": [2, 3]}])
+    assert [row["count"] for row in read(path)] == ["1", "many", "[2, 3]"]
+
+
+def test_mismatch_names_the_declared_column(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    sink = ArrowSink(path, batch_size=1, schema={"count": "int64"})
+    sink.write([{"count": 1}])
+    with pytest.raises(ValueError, match="column count"):
+        sink.write([{"count": "many"}])
+    sink.close()
@@ -0,0 +1,19 @@
+from benchmarks.fixture_server import FixtureServer
+from usecases.impl.cached_fetch_url_use_case_impl import CachedFetchUrlUseCaseImpl
+
+PAGES = {f"p{index}.html": bytes([65 + index % 26]) * 1000 for index in range(40)}
+
+
+def test_eviction_is_batched_and_keeps_the_limit(tmp_path, monkeypatch):
+    cache = CachedFetchUrlUseCaseImpl(str(tmp_path), max_bytes=10_000)
+    evictions = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: evictions.append(1) or evict())
+    with FixtureServer(PAGES) as server:
+        for name in PAGES:
+            response, error = cache.execute(server.url(name))
+            assert error == ""
+            assert response.content == PAGES[name]
+    assert 1 < len(evictions) < len(PAGES) // 2
+    objects = [path for path in (tmp_path / "objects").rglob("*") if path.is_file()]
+    assert sum(path.stat().st_size for path in objects) <= 10_000
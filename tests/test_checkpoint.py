@@ -0,0 +1,174 @@
+import json
+
+import pytest
+
+from benchmarks.fixture_server import FixtureServer
+from interface_adapter.controller.controller import Controller
+from interface_adapter.pipeline.checkpoint import JobCheckpoint
+from interface_adapter.pipeline.plan import compile_plan, run_plan
+from interface_adapter.pipeline.spec import parse_spec
+from interface_adapter.sinks.jsonl_sink import JsonlSink
+from usecases.impl.convert_into_beautifulsoup_use_case_impl import (
+    ConvertIntoBeautifulSoupUseCaseImpl,
+)
+from usecases.impl.fetch_url_use_case_impl import FetchUrlUseCaseImpl
+from usecases.impl.get_all_by_html_structure_use_case_impl import (
+    GetAllByHtmlStructureUseCaseImpl,
+)
+from usecases.impl.get_one_tag_use_case_impl import GetOneTagUseCaseImpl
+
+PAGES = {
+    f"p{index}.html": f"<html><head><title>page {index}</title></head></html>".encode()
+    for index in range(6)
+}
+
+
+@pytest.fixture(scope="module")
+def server():
+    with FixtureServer(dict(PAGES)) as server:
+        yield server
+
+
+@pytest.fixture
+def controller():
+    return Controller(
+        fetch_url_use_case=FetchUrlUseCaseImpl(),
+        convert_into_beautifulsoup_use_case=ConvertIntoBeautifulSoupUseCaseImpl(
+            "html.parser"
+        ),
+        get_one_tag_use_case=GetOneTagUseCaseImpl(),
+        get_all_by_html_structure_use_case=GetAllByHtmlStructureUseCaseImpl(),
+    )
+
+
+def make_plan(urls, output):
+    spec = parse_spec(
+        {
+            "name": "titles",
+            "sources": urls,
+            "fields": {"title": {"tag": "title", "transform": "text"}},
+            "sink": {"type": "jsonl", "path": str(output)},
+        }
+    )
+    return compile_plan([spec])
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_failed_urls_are_not_committed(server, controller, tmp_path):
+    output, log = tmp_path / "out.jsonl", str(tmp_path / "job.log")
+    urls = [server.url("p0.html"), server.url("missing.html"), server.url("p1.html")]
+    checkpoint = JobCheckpoint(log)
+    stats, error = run_plan(
+        make_plan(urls, output), controller, checkpoint=checkpoint, commit_every=1
+    )
+    checkpoint.close()
+    assert error == ""
+    assert stats["titles"] == {"records": 3, "failed": 1}
+
+    checkpoint = JobCheckpoint(log)
+    assert checkpoint.is_done(urls[0]) and checkpoint.is_done(urls[2])
+    assert not checkpoint.is_done(urls[1])
+    server.pages["missing.html"] = b"<title>back</title>"
+    try:
+        stats, error = run_plan(
+            make_plan(urls, output), controller, checkpoint=checkpoint
+        )
+    finally:
+        checkpoint.close()
+        del server.pages["missing.html"]
+    assert stats["titles"] == {"records": 1, "failed": 0}
+    records = read_records(output)
+    assert [record["title"] for record in records if not record["error"]] == [
+        "page 0",
+        "page 1",
+        "back",
+    ]
+
+
+def test_output_shorter_than_its_checkpoint_is_refused(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_text('{"url": "a"}\n')
+    with pytest.raises(ValueError, match="checkpoint"):
+        JsonlSink(str(path), resume_at=100)
+    assert path.read_text() == '{"url": "a"}\n'
+
+
+def test_sink_that_cannot_resume_keeps_its_output(server, controller, tmp_path):
+    output = tmp_path / "out.jsonl.gz"
+    output.write_bytes(b"earlier run")
+    checkpoint = JobCheckpoint(str(tmp_path / "job.log"))
+    try:
+        stats, error = run_plan(
+            make_plan([server.url("p0.html")], output),
+            controller,
+            checkpoint=checkpoint,
+        )
+    finally:
+        checkpoint.close()
+    assert "cannot resume" in error
+    assert output.read_bytes() == b"earlier run"
+
+
+def test_torn_last_line_is_dropped_on_replay(tmp_path):
+    log = tmp_path / "job.log"
+    checkpoint = JobCheckpoint(str(log))
+    checkpoint.commit(["a"], {"out": 10})
+    checkpoint.commit(["b"], {"out": 20})
+    checkpoint.close()
+    committed = log.read_bytes()
+    with open(log, "ab") as file:
+        file.write(b'{"urls": ["c"], "sinks": {"ou')
+
+    checkpoint = JobCheckpoint(str(log))
+    assert log.read_bytes() == committed
+    assert checkpoint.is_done("a") and checkpoint.is_done("b")
+    assert not checkpoint.is_done("c")
+    assert checkpoint.sink_offset("out") == 20
+    checkpoint.commit(["c"], {"out": 30})
+    checkpoint.close()
+
+    checkpoint = JobCheckpoint(str(log))
+    checkpoint.close()
+    assert len(checkpoint) == 3
+    assert checkpoint.sink_offset("out") == 30
+
+
+def test_resume_rewrites_records_after_the_last_commit_once(
+    server, controller, tmp_path
+):
+    output, log = tmp_path / "out.jsonl", str(tmp_path / "job.log")
+    urls = [server.url(f"p{number}.html") for number in range(4)]
+    checkpoint = JobCheckpoint(log)
+    try:
+        run_plan(
+            make_plan(urls[:2], output),
+            controller,
+            checkpoint=checkpoint,
+            commit_every=1,
+        )
+    finally:
+        checkpoint.close()
+    # A crash after records reached the sink but before their commit
+    with open(output, "a", encoding="utf-8") as file:
+        file.write('{"url": "' + urls[2] + '", "title": "page 2", "error": ""}\n')
+        file.write('{"url": "' + urls[3] + '", "ti')
+
+    checkpoint = JobCheckpoint(log)
+    try:
+        stats, error = run_plan(
+            make_plan(urls, output), controller, checkpoint=checkpoint
+        )
+    finally:
+        checkpoint.close()
+    assert error == ""
+    assert stats["titles"] == {"records": 2, "failed": 0}
+    assert [record["title"] for record in read_records(output)] == [
+        "page 0",
+        "page 1",
+        "page 2",
+        "page 3",
+    ]
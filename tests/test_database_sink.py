@@ -0,0 +1,181 @@
+import sqlite3
+from contextlib import contextmanager
+
+import pytest
+
+from interface_adapter.sinks import database_sink
+from interface_adapter.sinks.database_sink import DatabaseSink, close_pools
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "out.db"
+    yield f"sqlite:///{path}", path
+    close_pools()
+
+
+def rows(path, sql):
+    with sqlite3.connect(path) as conn:
+        return conn.execute(sql).fetchall()
+
+
+def test_columns_first_seen_later_are_added(database):
+    url, path = database
+    with DatabaseSink(url, "results", batch_size=1) as sink:
+        sink.write([{"url": "a", "tag": "title", "result": "x"}])
+        sink.write([{"url": "b", "structure": "ul > li", "result": ["1", "2"]}])
+    assert rows(
+        path, "SELECT url, tag, structure, result FROM results ORDER BY url"
+    ) == [
+        ("a", "title", None, "x"),
+        ("b", None, "ul > li", '["1", "2"]'),
+    ]
+
+
+def test_existing_table_gains_missing_columns(database):
+    url, path = database
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE "results" ("url" TEXT)')
+    with DatabaseSink(url, "results") as sink:
+        sink.write([{"url": "a", "error": ""}])
+    assert rows(path, "SELECT url, error FROM results") == [("a", "")]
+
+
+def test_duplicate_keys_in_one_batch_keep_the_last(database):
+    url, path = database
+    with DatabaseSink(url, "results", key=["url"], batch_size=10) as sink:
+        sink.write([{"url": "a", "result": 1}, {"url": "b", "result": 2}])
+        sink.write([{"url": "a", "result": 3}])
+        assert sink.checkpoint() == 3
+    assert rows(path, "SELECT url, result FROM results ORDER BY url") == [
+        ("a", 3),
+        ("b", 2),
+    ]
+
+
+class FakeCursor:
+    """Records the statements a sink sends to PostgreSQL"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.conn.record(sql)
+        if "information_schema" in sql:
+            self._rows = [(column,) for column in self.conn.columns]
+
+    def fetchall(self):
+        return self._rows
+
+
+class CopyCursor(FakeCursor):
+    """psycopg 3 cursor, COPY takes rows"""
+
+    @contextmanager
+    def copy(self, sql):
+        self.conn.record(sql)
+        yield self
+
+    def write_row(self, row):
+        self.conn.copied.append(row)
+
+
+class CopyExpertCursor(FakeCursor):
+    """psycopg2 cursor, COPY takes a CSV file"""
+
+    def copy_expert(self, sql, file):
+        self.conn.record(sql)
+        self.conn.copied.append(file.read())
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self.cursor_type = cursor
+        self.statements, self.copied = [], []
+        self.columns = ["url", "result"]
+        self.commits = self.rollbacks = 0
+        self.fail_on = None
+
+    def record(self, sql):
+        if self.fail_on and sql.startswith(self.fail_on):
+            self.fail_on = None
+            raise RuntimeError("server closed the connection")
+        self.statements.append(sql)
+
+    def cursor(self):
+        return self.cursor_type(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+
+class FakePostgres:
+    """Stands in for a PostgreSQL server, keeping every connection opened"""
+
+    def __init__(self):
+        self.cursor = CopyCursor
+        self.opened = []
+
+    def connect(self):
+        self.opened.append(FakeConnection(self.cursor))
+        return self.opened[-1]
+
+
+@pytest.fixture
+def postgres(monkeypatch):
+    server = FakePostgres()
+    monkeypatch.setattr(database_sink, "_connect_postgres", lambda url: server.connect)
+    yield server
+    close_pools()
+
+
+def test_postgres_upserts_through_a_staging_copy(postgres):
+    with DatabaseSink("postgresql://db/test", "results", key="url") as sink:
+        sink.write([{"url": "a", "result": 1}, {"url": "b", "result": 2}])
+        sink.write([{"url": "a", "result": 3}])
+    (conn,) = postgres.opened
+    assert conn.statements == [
+        'CREATE TABLE IF NOT EXISTS "results"'
+        ' ("url" TEXT, "result" BIGINT, PRIMARY KEY ("url"))',
+        "SELECT column_name FROM information_schema.columns"
+        " WHERE table_schema = current_schema() AND table_name = %s",
+        'CREATE TEMP TABLE "_staging_results"'
+        ' (LIKE "results" INCLUDING DEFAULTS) ON COMMIT DROP',
+        'COPY "_staging_results" ("url", "result") FROM STDIN',
+        'INSERT INTO "results" ("url", "result")'
+        ' SELECT "url", "result" FROM "_staging_results"'
+        ' ON CONFLICT ("url") DO UPDATE SET "result" = excluded."result"',
+    ]
+    assert conn.copied == [("a", 3), ("b", 2)]
+    assert conn.commits == 1
+
+
+def test_postgres_csv_copy_keeps_empty_strings_apart_from_null(postgres):
+    postgres.cursor = CopyExpertCursor
+    with DatabaseSink("postgresql://db/test", "results") as sink:
+        sink.write([{"url": 'say "hi"', "result": ""}, {"url": "b", "result": None}])
+    (conn,) = postgres.opened
+    assert conn.statements[-1] == (
+        'COPY "results" ("url", "result") FROM STDIN WITH (FORMAT csv)'
+    )
+    assert conn.copied == ['"say ""hi""",""\n"b",\n']
+
+
+def test_failed_load_returns_its_connection_to_the_pool(postgres):
+    sink = DatabaseSink("postgresql://db/test", "results", batch_size=1)
+    sink.write([{"url": "a", "result": 1}])
+    postgres.opened[0].fail_on = "COPY"
+    with pytest.raises(RuntimeError):
+        sink.write([{"url": "b", "result": 2}])
+    sink.write([{"url": "c", "result": 3}])
+    sink.close()
+    (conn,) = postgres.opened
+    assert conn.rollbacks == 1
+    assert conn.copied == [("a", 1), ("c", 3)]
@@ -0,0 +1,18 @@
+from interface_adapter.controller.document_cache import DocumentCache
+from usecases.impl.convert_into_beautifulsoup_use_case_impl import (
+    ConvertIntoBeautifulSoupUseCaseImpl,
+)
+
+PAGE = "<html><head><title>T</title></head><body>" + "<p>x</p>" * 500 + "</body></html>"
+
+
+def test_partial_parse_weighs_what_it_keeps():
+    convert = ConvertIntoBeautifulSoupUseCaseImpl("html.parser")
+    cache = DocumentCache()
+    cache.get_or_parse(
+        "title", lambda: convert.execute(PAGE, parse_only=["title"], stop_at_first=True)
+    )
+    partial = cache.total_nodes
+    cache.get_or_parse("full", lambda: convert.execute(PAGE))
+    assert partial < 10
+    assert cache.total_nodes - partial > 1000
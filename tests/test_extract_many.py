@@ -0,0 +1,51 @@
+from usecases.impl import process_pool_extract_many_use_case_impl as extract_many
+from usecases.impl.process_pool_extract_many_use_case_impl import (
+    ProcessPoolExtractManyUseCaseImpl,
+    _extract_chunk,
+    extract_document,
+)
+
+PAGE = b"<html><head><title>T</title></head><body><ul><li>a<li>b</ul></body></html>"
+
+
+def test_documents_carry_their_own_expressions():
+    results = _extract_chunk(
+        [("tags", PAGE, ["title"], []), ("structures", PAGE, [], ["ul > li"])],
+        ["li"],
+        [],
+    )
+    by_key = {key: (result, error) for key, result, error in results}
+    assert by_key["tags"][0]["tags"] == {"title": ("<title>T</title>", "")}
+    assert by_key["tags"][0]["structures"] == {}
+    assert by_key["structures"][0]["tags"] == {}
+    assert by_key["structures"][0]["structures"] == {
+        "ul > li": (["<li>a</li>", "<li>b</li>"], "")
+    }
+
+
+def test_pairs_use_the_shared_expressions():
+    pool = ProcessPoolExtractManyUseCaseImpl(max_workers=1, parser="html.parser")
+    try:
+        results = list(pool.execute([("page", PAGE)], ["title"]))
+    finally:
+        pool.shutdown()
+    assert results[0][1]["tags"] == {"title": ("<title>T</title>", "")}
+
+
+def test_tags_and_structures_share_one_parse(monkeypatch):
+    extract_document(PAGE, ["title"], [])
+    convert = extract_many._worker["convert"]
+    calls = []
+    execute = convert.execute
+    monkeypatch.setattr(
+        convert,
+        "execute",
+        lambda *args, **kwargs: calls.append(kwargs) or execute(*args, **kwargs),
+    )
+    result, error = extract_document(PAGE, ["title", "li"], ["ul > li"])
+    assert error == "" and calls == [{}]
+    assert result["tags"] == {
+        "title": ("<title>T</title>", ""),
+        "li": ("<li>a</li>", ""),
+    }
+    assert result["structures"] == {"ul > li": (["<li>a</li>", "<li>b</li>"], "")}
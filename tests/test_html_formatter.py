@@ -0,0 +1,30 @@
+from widgets.tables.html_formatter import pretty_format_html
+
+UNCLOSED = "<ul><li>a<li>b</ul><p>x<p>y<table><tr><td>1<td>2<tr><td>3</table>"
+
+
+def test_optional_end_tags_do_not_nest():
+    lines = pretty_format_html("<div>" + UNCLOSED + "</div>").splitlines()
+    assert lines[:5] == ["<div>", "  <ul>", "    <li>", "      a", "    <li>"]
+    assert "  <p>" in lines and "    y" in lines
+    # The table closes the open p, its rows and cells close each other
+    assert lines[lines.index("  <table>") :] == [
+        "  <table>",
+        "    <tr>",
+        "      <td>",
+        "        1",
+        "      <td>",
+        "        2",
+        "    <tr>",
+        "      <td>",
+        "        3",
+        "  </table>",
+        "</div>",
+    ]
+
+
+def test_output_stays_linear_in_size():
+    small = pretty_format_html(UNCLOSED * 100)
+    large = pretty_format_html(UNCLOSED * 1000)
+    assert len(large) < 11 * len(small)
+    assert max(len(line) for line in large.splitlines()) < 20
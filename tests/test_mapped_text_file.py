@@ -0,0 +1,30 @@
+from models.mapped_text_file import MappedTextFile
+
+
+def test_sliced_search_finds_matches_across_slice_ends(tmp_path):
+    path = tmp_path / "big.txt"
+    path.write_bytes(b"x" * 10 + b"Needle" + b"\n" * 5)
+    mapped = MappedTextFile(str(path))
+    try:
+        # The match starts in the first slice and ends in the next one
+        assert mapped.search("Needle", 0, True, 12) == 10
+        assert mapped.search("needle", 0, False, 12) == 10
+        assert mapped.search("Needle", 0, True, 10) == -1
+        assert mapped.search("Needle", 11, True) == -1
+    finally:
+        mapped.close()
+
+
+def test_lines_are_known_once_indexed_past_them(tmp_path):
+    path = tmp_path / "lines.txt"
+    path.write_bytes(b"".join(b"line %d\n" % number for number in range(100)))
+    mapped = MappedTextFile(str(path))
+    try:
+        offset = mapped.search("line 90", 0)
+        assert not mapped.covers(offset)
+        while not mapped.covers(offset):
+            mapped.index_step(64)
+        assert mapped.line_of(offset) == 90
+        assert mapped.line(90) == "line 90"
+    finally:
+        mapped.close()
@@ -0,0 +1,100 @@
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+from requests import RequestException
+
+from usecases.impl import resilient_fetch_url_use_case_impl as resilient
+from usecases.impl.resilient_fetch_url_use_case_impl import (
+    CircuitBreaker,
+    ResilientFetchUrlUseCaseImpl,
+    RetryBudget,
+    retry_after,
+)
+
+URL = "http://example.test/page"
+# Kept before the sleeps fixture swaps out time.sleep
+wait = time.sleep
+
+
+class StubResponse:
+    def __init__(self, status_code: int, headers: dict = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class StubFetch:
+    """Delegate answering with the given statuses, repeating the last one"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def request(self, url, headers=None):
+        response = self.responses[min(self.calls, len(self.responses) - 1)]
+        self.calls += 1
+        if isinstance(response, int):
+            return StubResponse(response)
+        return response
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(resilient.time, "sleep", slept.append)
+    return slept
+
+
+def test_transient_failures_are_retried(sleeps):
+    delegate = StubFetch(503, 503, 200)
+    fetch = ResilientFetchUrlUseCaseImpl(delegate, backoff=0.5)
+    assert fetch.request(URL).status_code == 200
+    assert delegate.calls == 3
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0
+
+
+def test_circuit_opens_and_probes_after_cooldown(sleeps):
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=0.05)
+    delegate = StubFetch(503, 503, 200)
+    fetch = ResilientFetchUrlUseCaseImpl(delegate, max_retries=0, breaker=breaker)
+    assert fetch.request(URL).status_code == 503
+    assert fetch.request(URL).status_code == 503
+    assert breaker.open_hosts() == ["example.test"]
+    with pytest.raises(RequestException, match="Circuit open"):
+        fetch.request(URL)
+    assert delegate.calls == 2
+    wait(0.06)
+    assert fetch.request(URL).status_code == 200
+    assert delegate.calls == 3
+    assert breaker.open_hosts() == []
+
+
+def test_retries_stop_when_the_budget_is_spent(sleeps):
+    budget = RetryBudget(ratio=0, min_per_second=0, max_tokens=1)
+    delegate = StubFetch(503)
+    fetch = ResilientFetchUrlUseCaseImpl(delegate, max_retries=5, budget=budget)
+    assert fetch.request(URL).status_code == 503
+    assert delegate.calls == 2
+    assert fetch.request(URL).status_code == 503
+    assert delegate.calls == 3
+
+
+def test_retry_after_date_is_waited_for(sleeps):
+    when = datetime.now(timezone.utc) + timedelta(seconds=10)
+    limited = StubResponse(429, {"Retry-After": format_datetime(when, usegmt=True)})
+    delegate = StubFetch(limited, 200)
+    fetch = ResilientFetchUrlUseCaseImpl(delegate)
+    assert fetch.request(URL).status_code == 200
+    assert len(sleeps) == 1 and 8 < sleeps[0] <= 10
+
+
+def test_retry_after_forms():
+    when = datetime.now(timezone.utc) + timedelta(seconds=10)
+    # A "-0000" zone parses to a naive datetime, which still means UTC
+    naive = when.strftime("%a, %d %b %Y %H:%M:%S -0000")
+    assert 8 < retry_after({"Retry-After": naive}) <= 10
+    assert retry_after({"Retry-After": "7"}) == 7.0
+    assert retry_after({"Retry-After": "soon"}) is None
+    assert retry_after({}) is None
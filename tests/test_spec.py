@@ -0,0 +1,29 @@
+import os
+
+from interface_adapter.pipeline.spec import load_spec
+
+
+def test_relative_paths_resolve_against_the_spec(tmp_path):
+    (tmp_path / "urls.txt").write_text("http://a.test/\n# skipped\nhttp://b.test/\n")
+    spec = tmp_path / "titles.json"
+    spec.write_text(
+        '{"name": "titles", "sources": [{"file": "urls.txt"}],'
+        ' "fields": {"title": {"tag": "title"}},'
+        ' "sink": {"path": "out/titles.jsonl"}}'
+    )
+
+    pipeline = load_spec(str(spec))
+
+    assert pipeline.urls == ["http://a.test/", "http://b.test/"]
+    assert pipeline.sink["path"] == os.path.join(str(tmp_path), "out/titles.jsonl")
+
+
+def test_database_sink_urls_are_kept(tmp_path):
+    spec = tmp_path / "titles.json"
+    spec.write_text(
+        '{"name": "titles", "sources": ["http://a.test/"],'
+        ' "fields": {"title": {"tag": "title"}},'
+        ' "sink": {"path": "sqlite:///titles.db"}}'
+    )
+
+    assert load_spec(str(spec)).sink["path"] == "sqlite:///titles.db"
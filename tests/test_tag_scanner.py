@@ -0,0 +1,111 @@
+from usecases.impl.convert_into_beautifulsoup_use_case_impl import (
+    ConvertIntoBeautifulSoupUseCaseImpl,
+)
+from usecases.impl.tag_scanner import FirstTagScanner
+
+LISTS = "<ul><li>one<li>two</ul><p>first<p>second<div>rest</div>"
+
+
+def scan(html, tags):
+    scanner = FirstTagScanner(tags)
+    stopped = scanner.feed(html)
+    return stopped, scanner.close()
+
+
+def test_explicit_end_tags_and_nesting():
+    stopped, fragments = scan("<div><div>in</div>out</div><div>no</div>", ["div"])
+    assert stopped
+    assert fragments == {"div": "<div><div>in</div>out</div>"}
+
+
+def test_li_closed_by_next_li():
+    stopped, fragments = scan(LISTS, ["li"])
+    assert stopped
+    assert fragments == {"li": "<li>one"}
+
+
+def test_li_closed_by_list_end_tag():
+    stopped, fragments = scan("<ul><li>only</ul><p>after</p>", ["li"])
+    assert stopped
+    assert fragments == {"li": "<li>only"}
+
+
+def test_p_closed_by_block_start_tag():
+    assert scan("<p>first<div>block</div>", ["p"]) == (True, {"p": "<p>first"})
+    assert scan(LISTS, ["p"]) == (True, {"p": "<p>first"})
+
+
+def test_nested_list_does_not_close_outer_li():
+    html = "<ul><li>a<ul><li>b</ul><li>c</ul>"
+    assert scan(html, ["li"]) == (True, {"li": "<li>a<ul><li>b</ul>"})
+
+
+def test_table_cells_and_rows():
+    html = "<table><tr><td>a<td>b<tr><td>c</table>"
+    assert scan(html, ["td"]) == (True, {"td": "<td>a"})
+    assert scan(html, ["tr"]) == (True, {"tr": "<tr><td>a<td>b"})
+
+
+def test_option_and_dd():
+    html = "<select><option>a<option>b</select><dl><dt>t<dd>x<dd>y</dl>"
+    assert scan(html, ["option", "dd"]) == (
+        True,
+        {"option": "<option>a", "dd": "<dd>x"},
+    )
+
+
+def test_inner_capture_closed_by_ancestor_end():
+    html = "<div><span>text</div><span>later</span>"
+    assert scan(html, ["span"]) == (True, {"span": "<span>text"})
+
+
+def test_void_and_unclosed_at_end():
+    stopped, fragments = scan("<p>text<br>more", ["br", "p"])
+    assert not stopped
+    assert fragments == {"br": "<br>", "p": "<p>text<br>more"}
+
+
+def test_first_li_through_convert_use_case():
+    soup, error = ConvertIntoBeautifulSoupUseCaseImpl("html.parser").execute(
+        LISTS, parse_only=["li"], stop_at_first=True
+    )
+    assert error == ""
+    assert [li.get_text() for li in soup.find_all("li")] == ["one"]
+
+
+def test_fragments_are_ordered_by_start():
+    html = "<span>S <b>B <span>inner</span></b> tail</span>"
+    stopped, fragments = scan(html, ["b", "span"])
+    assert stopped
+    assert list(fragments) == ["span", "b"]
+
+
+def test_nested_first_tags_through_convert_use_case():
+    convert = ConvertIntoBeautifulSoupUseCaseImpl("html.parser")
+    soup, error = convert.execute(
+        "<span>S <b>B <span>inner</span></b> tail</span>",
+        parse_only=["span", "b"],
+        stop_at_first=True,
+    )
+    assert error == ""
+    assert soup.find("span").get_text() == "S B inner tail"
+    assert str(soup.find("b")) == "<b>B <span>inner</span></b>"
+
+    soup, error = convert.execute(
+        "<html><head><title>T</title></head><body>x</body></html>",
+        parse_only=["html", "title"],
+        stop_at_first=True,
+    )
+    assert error == ""
+    assert str(soup.find("title")) == "<title>T</title>"
+    assert len(soup.find("html").find_all("title")) == 1
+
+
+def test_nested_first_tags_streamed():
+    chunks = iter(["<span>S <b>B <sp", "an>inner</span></b> tail</span><b>late</b>"])
+    soup, error = ConvertIntoBeautifulSoupUseCaseImpl("html.parser").execute_stream(
+        chunks, ["span", "b"]
+    )
+    assert error == ""
+    assert soup.find("span").get_text() == "S B inner tail"
+    assert [str(b) for b in soup.find_all("b")] == ["<b>B <span>inner</span></b>"]
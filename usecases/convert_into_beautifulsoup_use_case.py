@@ -1,8 +1,35 @@
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING, Iterable, Optional
 from abc import ABC, abstractmethod
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
 
 class ConvertIntoBeautifulSoupUseCase(ABC):
     @abstractmethod
-    def execute(self, html: str) -> BeautifulSoup:
+    def execute(
+        self,
+        html: str,
+        parse_only: Optional[list[str]] = None,
+        stop_at_first: bool = False,
+    ) -> "BeautifulSoup":
+        """Parse html into a soup
+        Args:
+            html (str): The HTML content
+            parse_only (list[str]): Only build the subtrees of these tag names
+            stop_at_first (bool): Stop reading the document once the first
+                element of every parse_only tag has been seen
+        Returns:
+            BeautifulSoup: The parsed document
+        """
         pass
+
+    def execute_stream(
+        self, chunks: Iterable[str], parse_only: list[str]
+    ) -> "BeautifulSoup":
+        """Parse the first element of every parse_only tag from streamed chunks.
+
+        Implementations should stop consuming chunks once every tag has been
+        seen; the default reads everything and parses it in one go.
+        """
+        return self.execute("".join(chunks), parse_only=parse_only, stop_at_first=True)
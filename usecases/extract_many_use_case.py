@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, Sequence
+
+
+class ExtractManyUseCase(ABC):
+    @abstractmethod
+    def execute(
+        self,
+        documents: Iterable[tuple],
+        tags: Sequence[str] = (),
+        structures: Sequence[str] = (),
+    ) -> Iterator[tuple[str, dict, str]]:
+        """This function will extract tags and structures from many documents
+        Args:
+            documents (Iterable[tuple]): (key, raw HTML) pairs, or (key, raw HTML,
+                tags, structures) to extract other expressions from that document
+            tags (Sequence[str]): Tag names whose first match is extracted
+            structures (Sequence[str]): Structure expressions whose matches are
+                extracted
+        Returns:
+            Iterator[tuple[str, dict, str]]: The key, a dict with a "tags" mapping
+                of tag to (result, error) and a "structures" mapping of expression
+                to (results, error), and an error message for the document
+        """
+        pass
@@ -1,9 +1,41 @@
-from typing import Tuple
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Tuple
 from abc import ABC, abstractmethod
-from requests import Response
+
+if TYPE_CHECKING:
+    from requests import Response
+
+
+class ResponseTooLargeError(IOError):
+    """Raised while streaming once a body grows past the allowed size"""
 
 
 class FetchUrlUseCase(ABC):
     @abstractmethod
-    def execute(self, url: str) -> Tuple[Response, str]:
+    def execute(self, url: str) -> Tuple["Response", str]:
         pass
+
+    def fetch_many(self, urls: Iterable[str]) -> Iterator[Tuple[str, "Response", str]]:
+        """Fetch every url, yielding (url, response, error) as each one completes.
+
+        Implementations that can fetch concurrently should override this; the
+        default fetches one url after another.
+        """
+        for url in urls:
+            response, error = self.execute(url)
+            yield url, response, error
+
+    def stream(
+        self, url: str, chunk_size: int = 1 << 16, max_bytes: Optional[int] = None
+    ) -> Tuple[Iterator[str], str]:
+        """Fetch the url as an iterator of decoded text chunks.
+
+        The iterator raises ResponseTooLargeError once more than max_bytes have
+        been received; closing it early releases the connection. The default
+        buffers the whole body and yields it as a single chunk.
+        """
+        response, error = self.execute(url)
+        if error:
+            return None, error
+        if max_bytes and len(response.content) > max_bytes:
+            return None, f"Response too large: more than {max_bytes} bytes"
+        return iter([response.text]), ""
@@ -1,7 +1,18 @@
-from bs4 import BeautifulSoup as bs
+from typing import TYPE_CHECKING
+from abc import ABC, abstractmethod
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup as bs
 
-class GetAllByHtmlStructureUseCase:
-    def execute(self, html: str, structure: str, soup: bs) -> tuple[list, str]:
-        # TODO
+
+class GetAllByHtmlStructureUseCase(ABC):
+    @abstractmethod
+    def execute(self, soup: "bs", structure: str) -> tuple[list, str]:
+        """This function will return every element matching a structure expression
+        Args:
+            soup (bs): The BeautifulSoup object
+            structure (str): A CSS selector, or an XPath-like path starting with /
+        Returns:
+            tuple[list, str]: A tuple containing the matched tags and an error message
+        """
         pass
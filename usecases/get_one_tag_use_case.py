@@ -1,10 +1,13 @@
+from typing import TYPE_CHECKING
 from abc import ABC, abstractmethod
-from bs4 import BeautifulSoup as bs
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup as bs
 
 
 class GetOneTagUseCase(ABC):
     @abstractmethod
-    def execute(self, tag_name: str, html: str, soup: bs) -> tuple[str, str]:
+    def execute(self, tag_name: str, html: str, soup: "bs") -> tuple[str, str]:
         """This function will return a tuple containing the tag and an error message
         Args:
             tag_name (str): The name of the tag
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, AsyncIterator, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+from usecases.fetch_url_use_case import FetchUrlUseCase
+from usecases.impl.fetch_url_use_case_impl import FetchUrlUseCaseImpl
+
+if TYPE_CHECKING:
+    from requests import Response
+
+
+class AsyncFetchUrlUseCaseImpl(FetchUrlUseCase):
+    """Fetch many urls concurrently on an asyncio event loop.
+
+    Blocking requests are handed to a thread pool sized to the global cap, so
+    every fetch still goes through the pooled keep-alive session of the
+    delegate. A semaphore per host keeps a single site from being flooded.
+    """
+
+    def __init__(
+        self,
+        delegate: Optional[FetchUrlUseCase] = None,
+        max_concurrency: int = 32,
+        max_per_host: int = 4,
+    ):
+        self.delegate = delegate or FetchUrlUseCaseImpl()
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
+
+    def execute(self, url: str) -> Tuple["Response", str]:
+        return self.delegate.execute(url)
+
+    def request(self, url: str, headers: Optional[dict] = None) -> "Response":
+        return self.delegate.request(url, headers=headers)
+
+    def stream(
+        self, url: str, chunk_size: int = 1 << 16, max_bytes: Optional[int] = None
+    ) -> Tuple[Iterator[str], str]:
+        return self.delegate.stream(url, chunk_size=chunk_size, max_bytes=max_bytes)
+
+    def fetch_many(self, urls: Iterable[str]) -> Iterator[Tuple[str, "Response", str]]:
+        """Synchronous wrapper around fetch_many_async for non-async callers"""
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        results = self.fetch_many_async(urls)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(results.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(results.aclose())
+            loop.close()
+
+    async def fetch_many_async(
+        self, urls: Iterable[str]
+    ) -> AsyncIterator[Tuple[str, "Response", str]]:
+        """Yield (url, response, error) for every url in completion order"""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        limit = asyncio.Semaphore(self.max_concurrency)
+        host_limits: dict[str, asyncio.Semaphore] = {}
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="fetch"
+        )
+
+        async def fetch(url: str) -> Tuple[str, "Response", str]:
+            host = urlsplit(url).netloc.lower()
+            host_limit = host_limits.setdefault(
+                host, asyncio.Semaphore(self.max_per_host)
+            )
+            async with host_limit, limit:
+                response, error = await loop.run_in_executor(
+                    executor, self.delegate.execute, url
+                )
+            return url, response, error
+
+        tasks = [asyncio.ensure_future(fetch(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
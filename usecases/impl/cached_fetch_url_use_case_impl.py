@@ -0,0 +1,313 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Tuple
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from usecases.fetch_url_use_case import FetchUrlUseCase
+from usecases.impl.fetch_url_use_case_impl import FetchUrlUseCaseImpl, fetch_result
+
+# Bodies are stored decoded, so transport headers no longer describe them
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    encoding TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    expires REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_hash ON entries (hash);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+CREATE INDEX IF NOT EXISTS entries_stored_at ON entries (stored_at);
+"""
+
+# Eviction frees the store down to this share of max_bytes, so the next one
+# is only needed after that much new data
+_EVICT_TO = 0.9
+
+# Stores between two evictions when the size limit is not reached, which
+# drops entries past max_age
+_EVICT_EVERY = 1000
+
+
+def parse_cache_control(value: str) -> dict[str, str]:
+    directives = {}
+    for part in value.split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"')
+    return directives
+
+
+def freshness_lifetime(headers) -> Optional[float]:
+    """Return how long a response may be served without revalidation.
+
+    Returns:
+        Optional[float]: Seconds of freshness, or None when it must not be stored
+    """
+    directives = parse_cache_control(headers.get("Cache-Control", ""))
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    if directives.get("max-age", "").isdigit():
+        return float(directives["max-age"])
+    if "Expires" in headers:
+        try:
+            expires = parsedate_to_datetime(headers["Expires"]).timestamp()
+            return max(0.0, expires - time.time())
+        except (TypeError, ValueError):
+            return 0.0
+    return 0.0
+
+
+class CachedFetchUrlUseCaseImpl(FetchUrlUseCase):
+    """On-disk HTTP cache layered over another fetch use case.
+
+    Bodies are stored once per content hash under ``objects/`` and an SQLite
+    index maps urls to them with their validators. Fresh entries are served
+    without touching the network, stale ones are revalidated with
+    If-None-Match / If-Modified-Since, and the store is trimmed by age and by
+    total size in least-recently-used order. Trimming scans the index, so it
+    runs when a running estimate of the stored bytes crosses max_bytes or
+    every _EVICT_EVERY stores, not on each one.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        delegate: Optional[FetchUrlUseCaseImpl] = None,
+        max_bytes: int = 1 << 30,
+        max_age: float = 30 * 24 * 3600,
+    ):
+        """
+        Args:
+            cache_dir (str): Directory holding the index and the bodies
+            delegate (FetchUrlUseCaseImpl): Use case whose request() hits the network
+            max_bytes (int): Total body size kept before evicting
+            max_age (float): Seconds after which an entry is dropped regardless of use
+        """
+        self.delegate = delegate or FetchUrlUseCaseImpl()
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(cache_dir, "index.sqlite"), check_same_thread=False
+        )
+        self._db.executescript(_SCHEMA)
+        # Bytes stored, counted exactly by evict() and estimated in between
+        self._bytes = self._stored_bytes()
+        self._stores = 0
+
+    def execute(self, url: str) -> Tuple[Response, str]:
+        return fetch_result(self.request, url)
+
+    def request(self, url: str, headers: Optional[dict] = None) -> Response:
+        """Serve the url from the cache, revalidating or fetching when needed"""
+        entry = self._lookup(url)
+        now = time.time()
+        if entry is not None and entry["expires"] > now:
+            cached = self._load(url, entry)
+            if cached is not None:
+                return cached
+            entry = None
+
+        conditional = dict(headers or {})
+        if entry is not None:
+            if entry["etag"]:
+                conditional["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                conditional["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.delegate.request(url, headers=conditional or None)
+        if response.status_code == 304 and entry is not None:
+            lifetime = freshness_lifetime(response.headers) or 0.0
+            self._refresh(url, now, now + lifetime)
+            cached = self._load(url, entry)
+            if cached is not None:
+                return cached
+            return self.delegate.request(url, headers=headers)
+        if response.status_code == 200:
+            self._store(url, response)
+        return response
+
+    def body_path(self, url: str) -> Optional[str]:
+        """Return the file holding the cached body of a url, if there is one.
+
+        Lets large bodies be memory-mapped instead of read into memory.
+        """
+        entry = self._lookup(url)
+        if entry is None:
+            return None
+        path = self._path(entry["hash"])
+        return path if os.path.exists(path) else None
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, "objects", digest[:2], digest)
+
+    def _lookup(self, url: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT hash, headers, encoding, etag, last_modified, expires"
+                " FROM entries WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("hash", "headers", "encoding", "etag", "last_modified", "expires")
+        return dict(zip(keys, row))
+
+    def _load(self, url: str, entry: dict) -> Optional[Response]:
+        try:
+            with open(self._path(entry["hash"]), "rb") as file:
+                body = file.read()
+        except FileNotFoundError:
+            with self._lock, self._db:
+                self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            return None
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url)
+            )
+
+        response = Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = url
+        response.headers = CaseInsensitiveDict(json.loads(entry["headers"]))
+        response.encoding = entry["encoding"]
+        response._content = body
+        response.from_cache = True
+        return response
+
+    def _refresh(self, url: str, stored_at: float, expires: float):
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE entries SET stored_at = ?, expires = ?, last_access = ?"
+                " WHERE url = ?",
+                (stored_at, expires, stored_at, url),
+            )
+
+    def _store(self, url: str, response: Response):
+        lifetime = freshness_lifetime(response.headers)
+        if lifetime is None:
+            return
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):
+            self._write_object(path, body)
+
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in _DROPPED_HEADERS
+        }
+        now = time.time()
+        with self._lock, self._db:
+            if not os.path.exists(path):
+                # An eviction removed the body between writing and indexing it
+                self._write_object(path, body)
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    digest,
+                    len(body),
+                    json.dumps(headers),
+                    response.encoding,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    now,
+                    now + lifetime,
+                    now,
+                ),
+            )
+            # Replaced and shared bodies make this an overestimate
+            self._bytes += len(body)
+            self._stores += 1
+            due = self._bytes > self.max_bytes or self._stores >= _EVICT_EVERY
+        if due:
+            self.evict()
+
+    def _write_object(self, path: str, body: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(body)
+        os.replace(temporary, path)
+
+    def _stored_bytes(self) -> int:
+        return self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM"
+            " (SELECT DISTINCT hash, size FROM entries)"
+        ).fetchone()[0]
+
+    def evict(self):
+        """Drop entries older than max_age, then least recently used ones until
+        the distinct bodies fit in _EVICT_TO of max_bytes"""
+        with self._lock, self._db:
+            orphans = self._delete(
+                "SELECT url, hash FROM entries WHERE stored_at < ?",
+                (time.time() - self.max_age,),
+            )
+            total = self._stored_bytes()
+            if total > self.max_bytes:
+                target = self.max_bytes * _EVICT_TO
+                rows = self._db.execute(
+                    "SELECT url, hash, size FROM entries ORDER BY last_access"
+                ).fetchall()
+                victims = []
+                # Shared bodies are counted per url, which can evict slightly early
+                for url, digest, size in rows:
+                    if total <= target:
+                        break
+                    victims.append((url, digest))
+                    total -= size
+                orphans |= self._delete_rows(victims)
+            self._bytes = max(total, 0)
+            self._stores = 0
+        with self._lock:
+            for digest in orphans:
+                # A store may have indexed the same body again since
+                if self._db.execute(
+                    "SELECT 1 FROM entries WHERE hash = ? LIMIT 1", (digest,)
+                ).fetchone():
+                    continue
+                try:
+                    os.remove(self._path(digest))
+                except FileNotFoundError:
+                    pass
+
+    def _delete(self, query: str, parameters: tuple) -> set[str]:
+        return self._delete_rows(self._db.execute(query, parameters).fetchall())
+
+    def _delete_rows(self, rows: list) -> set[str]:
+        """Delete index rows and return the hashes no longer referenced"""
+        if not rows:
+            return set()
+        self._db.executemany(
+            "DELETE FROM entries WHERE url = ?", [(url,) for url, _ in rows]
+        )
+        orphans = set()
+        for digest in {digest for _, digest in rows}:
+            if not self._db.execute(
+                "SELECT 1 FROM entries WHERE hash = ? LIMIT 1", (digest,)
+            ).fetchone():
+                orphans.add(digest)
+        return orphans
@@ -1,11 +1,84 @@
+from typing import TYPE_CHECKING, Iterable, Optional
+
 from usecases.convert_into_beautifulsoup_use_case import ConvertIntoBeautifulSoupUseCase
+from usecases.impl.parser_backends import AUTO, get_builder, select_backend
+from usecases.impl.tag_scanner import FirstTagScanner
 
-from bs4 import BeautifulSoup
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
 
 
 class ConvertIntoBeautifulSoupUseCaseImpl(ConvertIntoBeautifulSoupUseCase):
-    def execute(self, html: str) -> tuple[BeautifulSoup, str]:
+    def __init__(self, parser: Optional[str] = AUTO):
+        """
+        Args:
+            parser (str): Registered parser backend, auto picks the fastest installed
+        """
+        self.parser = select_backend(parser)
+        self._build = get_builder(self.parser)
+
+    def execute(
+        self,
+        html: str,
+        parse_only: Optional[list[str]] = None,
+        stop_at_first: bool = False,
+    ) -> tuple["BeautifulSoup", str]:
+        from bs4 import SoupStrainer
+
+        try:
+            if not parse_only:
+                return self._build(html), ""
+            if stop_at_first:
+                return self._parse_first(self._scan_first(html, parse_only)), ""
+            return self._build(html, parse_only=SoupStrainer(parse_only)), ""
+        except Exception as e:
+            return None, f"An error occurred: {str(e)}"
+
+    def execute_stream(
+        self, chunks: Iterable[str], parse_only: list[str]
+    ) -> tuple["BeautifulSoup", str]:
+        scanner = FirstTagScanner(parse_only)
         try:
-            return BeautifulSoup(html, "html.parser"), ""
+            for chunk in chunks:
+                if scanner.feed(chunk):
+                    break
+            return self._parse_first(scanner), ""
         except Exception as e:
             return None, f"An error occurred: {str(e)}"
+        finally:
+            # Stops the download when the wanted tags were found early
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+
+    def _scan_first(self, html, tag_names: list[str]) -> FirstTagScanner:
+        """Cut the source of the first element of each tag out of the document"""
+        if isinstance(html, bytes):
+            from bs4 import UnicodeDammit
+
+            html = UnicodeDammit(html).unicode_markup
+        scanner = FirstTagScanner(tag_names)
+        scanner.feed(html)
+        return scanner
+
+    def _parse_first(self, scanner: FirstTagScanner) -> "BeautifulSoup":
+        """Parse the fragments a scanner captured and gather them in one soup.
+
+        Fragments may nest, the first span can hold the first b, so parsing
+        them joined would let one fragment's elements end up in another. Only
+        the outermost are parsed, each on its own, and they are gathered in
+        document order so find() meets every tag's first element.
+        """
+        from bs4 import SoupStrainer
+
+        soup = None
+        for tag, fragment in scanner.close().items():
+            if tag in scanner.enclosed:
+                continue
+            part = self._build(fragment, parse_only=SoupStrainer(tag))
+            if soup is None:
+                soup = part
+                continue
+            for element in list(part.contents):
+                soup.append(element.extract())
+        return soup if soup is not None else self._build("")
@@ -1,28 +1,116 @@
-from requests import get, Response, RequestException
-from typing import Tuple
-from usecases.fetch_url_use_case import FetchUrlUseCase
+import codecs
+from typing import TYPE_CHECKING, Callable, Iterator, Optional, Tuple, Union
+from usecases.fetch_url_use_case import FetchUrlUseCase, ResponseTooLargeError
+from usecases.impl.http_session import DEFAULT_TIMEOUT, get_shared_session
+from usecases.impl.url_normalizer import validate_url
+
+if TYPE_CHECKING:
+    from requests import Response, Session
+
+
+def fetch_result(
+    request: Callable[[str], "Response"], url: str
+) -> Tuple["Response", str]:
+    """Run a raw request and map it to the (response, error) use case result"""
+    from requests import RequestException
+
+    error = validate_url(url)
+    if error:
+        return "", error
+    try:
+        response = request(url)
+        if response.status_code == 200:
+            return response, ""
+        else:
+            return "", f"Failed to fetch URL: HTTP {response.status_code}"
+    except RequestException as e:
+        return "", f"An error occurred: {str(e)}"
 
 
 class FetchUrlUseCaseImpl(FetchUrlUseCase):
-    def __init__(self):
-        pass
+    def __init__(
+        self,
+        session: Optional["Session"] = None,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+    ):
+        """
+        Args:
+            session (Session): Pooled session to fetch with, defaults to the shared one
+            timeout (float | tuple[float, float]): Connect and read timeouts in seconds
+        """
+        self._session = session
+        self.timeout = timeout
+
+    @property
+    def session(self) -> "Session":
+        """The pooled session, the shared one is only built on the first request"""
+        if self._session is None:
+            self._session = get_shared_session()
+        return self._session
+
+    def request(self, url: str, headers: Optional[dict] = None) -> "Response":
+        """Send a GET through the pooled session and return the raw response.
+
+        Raises:
+            RequestException: When the request cannot be completed
+        """
+        return self.session.get(url, headers=headers, timeout=self.timeout)
 
-    def execute(self, url: str) -> Tuple[Response, str]:
+    def execute(self, url: str) -> Tuple["Response", str]:
         """
         Fetches the content of the provided URL.
 
         Returns:
             Tuple[str, str]: A tuple containing the fetched content and an error message.
         """
-        # TODO: validate the standard of a url
-        print("use case is called")
-        if not url:
-            return "", "URL cannot be empty or None"
+        return fetch_result(self.request, url)
+
+    def stream(
+        self, url: str, chunk_size: int = 1 << 16, max_bytes: Optional[int] = None
+    ) -> Tuple[Iterator[str], str]:
+        """
+        Fetches the URL without buffering the body. The size limit is enforced
+        while reading, so a caller that stops early can still use a prefix of
+        a body larger than max_bytes.
+
+        Returns:
+            Tuple[Iterator[str], str]: Decoded text chunks and an error message.
+        """
+        from requests import RequestException
+
+        error = validate_url(url)
+        if error:
+            return None, error
         try:
-            response = get(url)
-            if response.status_code == 200:
-                return response, ""
-            else:
-                return "", f"Failed to fetch URL: HTTP {response.status_code}"
+            response = self.session.get(url, stream=True, timeout=self.timeout)
         except RequestException as e:
-            return "", f"An error occurred: {str(e)}"
+            return None, f"An error occurred: {str(e)}"
+        if response.status_code != 200:
+            response.close()
+            return None, f"Failed to fetch URL: HTTP {response.status_code}"
+        return self._iter_text(response, chunk_size, max_bytes), ""
+
+    def _iter_text(
+        self, response: "Response", chunk_size: int, max_bytes: Optional[int]
+    ) -> Iterator[str]:
+        try:
+            decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")
+        decoder = decoder(errors="replace")
+        received = 0
+        try:
+            for chunk in response.iter_content(chunk_size):
+                received += len(chunk)
+                if max_bytes and received > max_bytes:
+                    raise ResponseTooLargeError(
+                        f"Response too large: more than {max_bytes} bytes"
+                    )
+                text = decoder.decode(chunk)
+                if text:
+                    yield text
+            text = decoder.decode(b"", final=True)
+            if text:
+                yield text
+        finally:
+            response.close()
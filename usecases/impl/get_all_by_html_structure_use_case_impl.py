@@ -0,0 +1,100 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from usecases.get_all_by_html_structure import GetAllByHtmlStructureUseCase
+
+if TYPE_CHECKING:
+    import soupsieve
+    from bs4 import BeautifulSoup as bs
+
+
+_XPATH_STEP = re.compile(r"(//?)([^/\[]+)((?:\[[^\]]*\])*)")
+_XPATH_PREDICATE = re.compile(r"\[([^\]]*)\]")
+_XPATH_ATTRIBUTE = re.compile(r"""@([\w:-]+)(?:\s*=\s*(['"])(.*?)\2)?$""")
+_XPATH_CONTAINS = re.compile(r"""contains\(\s*@([\w:-]+)\s*,\s*(['"])(.*?)\2\s*\)$""")
+
+
+def xpath_to_css(path: str) -> str:
+    """Translate an XPath-like path into an equivalent CSS selector.
+
+    Supports child (/) and descendant (//) steps, * and tag names, and the
+    predicates [n], [@attr], [@attr='v'] and [contains(@attr, 'v')].
+
+    Raises:
+        ValueError: When the path uses syntax outside that subset
+    """
+    selector = []
+    position = 0
+    for match in _XPATH_STEP.finditer(path):
+        if match.start() != position:
+            break
+        position = match.end()
+        axis, name, predicates = match.groups()
+        step = name.strip()
+        for predicate in _XPATH_PREDICATE.findall(predicates):
+            step += _predicate_to_css(predicate.strip(), path)
+        if not selector:
+            # A leading single slash anchors the path at the document root
+            selector.append(step + ":root" if axis == "/" else step)
+        else:
+            selector.append((" > " if axis == "/" else " ") + step)
+    if position != len(path) or not selector:
+        raise ValueError(f"Unsupported structure expression: {path}")
+    return "".join(selector)
+
+
+def _predicate_to_css(predicate: str, path: str) -> str:
+    if predicate.isdigit():
+        return f":nth-of-type({predicate})"
+    match = _XPATH_ATTRIBUTE.match(predicate)
+    if match:
+        name, _, value = match.groups()
+        return f"[{name}]" if value is None else f'[{name}="{value}"]'
+    match = _XPATH_CONTAINS.match(predicate)
+    if match:
+        name, _, value = match.groups()
+        return f'[{name}*="{value}"]'
+    raise ValueError(f"Unsupported predicate [{predicate}] in {path}")
+
+
+class GetAllByHtmlStructureUseCaseImpl(GetAllByHtmlStructureUseCase):
+    """Compile structure expressions once and reuse them across documents.
+
+    Compiled selectors live in an LRU keyed by the expression; matching walks
+    the tree once and returns every element in document order.
+    """
+
+    def __init__(self, cache_size: int = 256):
+        self.cache_size = cache_size
+        self._compiled: OrderedDict[str, "soupsieve.SoupSieve"] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def compile(self, structure: str) -> "soupsieve.SoupSieve":
+        with self._lock:
+            compiled = self._compiled.get(structure)
+            if compiled is not None:
+                self._compiled.move_to_end(structure)
+                return compiled
+
+        expression = structure.strip()
+        if expression.startswith("/"):
+            expression = xpath_to_css(expression)
+        import soupsieve
+
+        compiled = soupsieve.compile(expression)
+
+        with self._lock:
+            self._compiled[structure] = compiled
+            if len(self._compiled) > self.cache_size:
+                self._compiled.popitem(last=False)
+        return compiled
+
+    def execute(self, soup: "bs", structure: str) -> tuple[list, str]:
+        if not structure or not structure.strip():
+            return [], "Structure expression cannot be empty"
+        try:
+            return self.compile(structure).select(soup), ""
+        except Exception as e:
+            return [], f"An error occurred: {str(e)}"
@@ -1,9 +1,12 @@
-from bs4 import BeautifulSoup as bs
+from typing import TYPE_CHECKING
 from usecases.get_one_tag_use_case import GetOneTagUseCase
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup as bs
+
 
 class GetOneTagUseCaseImpl(GetOneTagUseCase):
-    def execute(self, soup: bs, tag: str) -> tuple[bs, str]:
+    def execute(self, soup: "bs", tag: str) -> tuple["bs", str]:
         try:
             return soup.find(tag), ""
         except Exception as e:
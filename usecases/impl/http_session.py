@@ -0,0 +1,62 @@
+import threading
+from importlib.util import find_spec
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from requests import Session
+
+DEFAULT_POOL_CONNECTIONS = 16
+DEFAULT_POOL_MAXSIZE = 8
+DEFAULT_TIMEOUT = (3.05, 30.0)
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+def accept_encoding() -> str:
+    """Return the Accept-Encoding header value urllib3 can transparently decode"""
+    encodings = ["gzip", "deflate"]
+    if find_spec("brotli") or find_spec("brotlicffi"):
+        encodings.append("br")
+    return ", ".join(encodings)
+
+
+def build_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_block: bool = True,
+) -> "Session":
+    """Build a keep-alive session backed by a bounded connection pool.
+
+    Args:
+        pool_connections (int): Number of per-host pools kept alive
+        pool_maxsize (int): Maximum open connections per host
+        pool_block (bool): Wait for a free connection instead of opening extra ones
+    Returns:
+        Session: A session that reuses TCP/TLS connections between requests
+    """
+    # requests is imported on first use, it is a large part of startup time
+    from requests import Session
+    from requests.adapters import HTTPAdapter
+
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session = Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Accept-Encoding"] = accept_encoding()
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+def get_shared_session() -> "Session":
+    """Return the process-wide session, creating it on first use"""
+    global _shared_session
+    if _shared_session is None:
+        with _shared_session_lock:
+            if _shared_session is None:
+                _shared_session = build_session()
+    return _shared_session
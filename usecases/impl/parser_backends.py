@@ -0,0 +1,76 @@
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+AUTO = "auto"
+
+# name -> (priority, required modules, builder); higher priority parses faster
+_backends: dict[str, tuple[int, tuple[str, ...], Callable[..., "BeautifulSoup"]]] = {}
+
+
+def _tree_builder(features: str) -> Callable[..., "BeautifulSoup"]:
+    def build(html, **kwargs) -> "BeautifulSoup":
+        # bs4 is imported by the first parse, not at startup
+        from bs4 import BeautifulSoup
+
+        return BeautifulSoup(html, features, **kwargs)
+
+    return build
+
+
+def register_backend(
+    name: str,
+    builder: Callable[..., "BeautifulSoup"],
+    requires: tuple[str, ...] = (),
+    priority: int = 0,
+):
+    """Register a parser backend.
+
+    Args:
+        name (str): Name used to select the backend
+        builder (Callable): Called as builder(html, **kwargs) and returns a soup
+        requires (tuple[str, ...]): Modules that must be importable to use it
+        priority (int): Rank used by auto-selection, the fastest gets the highest
+    """
+    _backends[name] = (priority, requires, builder)
+
+
+def is_available(name: str) -> bool:
+    if name not in _backends:
+        return False
+    return all(find_spec(module) for module in _backends[name][1])
+
+
+def available_backends() -> list[str]:
+    """Return the installed backends, fastest first"""
+    names = [name for name in _backends if is_available(name)]
+    return sorted(names, key=lambda name: _backends[name][0], reverse=True)
+
+
+def select_backend(name: Optional[str] = None) -> str:
+    """Resolve a backend name, picking the fastest installed one for auto.
+
+    Raises:
+        ValueError: When the backend is unknown or not installed
+    """
+    if not name or name == AUTO:
+        return available_backends()[0]
+    if name not in _backends:
+        raise ValueError(f"Unknown parser backend: {name}")
+    if not is_available(name):
+        missing = [m for m in _backends[name][1] if not find_spec(m)]
+        raise ValueError(f"Parser backend {name} needs {', '.join(missing)}")
+    return name
+
+
+def get_builder(name: str) -> Callable[..., "BeautifulSoup"]:
+    return _backends[select_backend(name)][2]
+
+
+register_backend("lxml", _tree_builder("lxml"), requires=("lxml",), priority=30)
+register_backend("html.parser", _tree_builder("html.parser"), priority=20)
+register_backend(
+    "html5lib", _tree_builder("html5lib"), requires=("html5lib",), priority=10
+)
@@ -0,0 +1,130 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Sequence
+
+from usecases.extract_many_use_case import ExtractManyUseCase
+from usecases.impl.parser_backends import AUTO
+
+# Use cases built once per worker process by _init_worker
+_worker = {}
+
+
+def _init_worker(parser: str):
+    from usecases.impl.convert_into_beautifulsoup_use_case_impl import (
+        ConvertIntoBeautifulSoupUseCaseImpl,
+    )
+    from usecases.impl.get_all_by_html_structure_use_case_impl import (
+        GetAllByHtmlStructureUseCaseImpl,
+    )
+    from usecases.impl.get_one_tag_use_case_impl import GetOneTagUseCaseImpl
+
+    _worker["convert"] = ConvertIntoBeautifulSoupUseCaseImpl(parser)
+    _worker["get_one_tag"] = GetOneTagUseCaseImpl()
+    _worker["get_all"] = GetAllByHtmlStructureUseCaseImpl()
+
+
+def extract_document(
+    html, tags: Sequence[str], structures: Sequence[str], parser: str = AUTO
+) -> tuple[dict, str]:
+    """Parse one document and return its extractions as plain strings.
+
+    Structures need the whole tree, which then serves the tag lookups too;
+    with tags alone only the first fragment of each tag is parsed. The
+    results also carry the "seconds" spent on the document.
+    """
+    if not _worker:
+        _init_worker(parser)
+    start = time.perf_counter()
+    results = {"tags": {}, "structures": {}, "seconds": 0.0}
+    if structures:
+        soup, error = _worker["convert"].execute(html)
+    elif tags:
+        soup, error = _worker["convert"].execute(
+            html, parse_only=list(tags), stop_at_first=True
+        )
+    else:
+        soup, error = None, ""
+    if error:
+        results["seconds"] = time.perf_counter() - start
+        return results, error
+    for tag in tags:
+        found, error = _worker["get_one_tag"].execute(soup, tag)
+        if not error and found is None:
+            error = f"Tag <{tag}> not found"
+        results["tags"][tag] = (str(found) if not error else "", error)
+    for structure in structures:
+        found, error = _worker["get_all"].execute(soup, structure)
+        results["structures"][structure] = ([str(tag) for tag in found], error)
+    results["seconds"] = time.perf_counter() - start
+    return results, ""
+
+
+def _extract_chunk(
+    chunk: list[tuple], tags: Sequence[str], structures: Sequence[str]
+) -> list[tuple[str, dict, str]]:
+    results = []
+    for key, html, *expressions in chunk:
+        document_tags, document_structures = expressions or (tags, structures)
+        results.append(
+            (key, *extract_document(html, document_tags, document_structures))
+        )
+    return results
+
+
+class ProcessPoolExtractManyUseCaseImpl(ExtractManyUseCase):
+    """Parse and extract across CPU cores.
+
+    Documents are sent to worker processes as raw bytes in chunks of
+    ``chunk_size`` and only strings come back, so no soup ever crosses a
+    process boundary. At most two chunks per worker are in flight, which
+    keeps memory flat when the input is a lazy stream of fetched pages.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 8,
+        parser: str = AUTO,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.parser = parser
+        self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                self.max_workers, initializer=_init_worker, initargs=(self.parser,)
+            )
+        return self._pool
+
+    def execute(
+        self,
+        documents: Iterable[tuple],
+        tags: Sequence[str] = (),
+        structures: Sequence[str] = (),
+    ) -> Iterator[tuple[str, dict, str]]:
+        pool = self._executor()
+        documents = iter(documents)
+        tags, structures = list(tags), list(structures)
+        in_flight: set[Future] = set()
+        exhausted = False
+        while in_flight or not exhausted:
+            while not exhausted and len(in_flight) < self.max_workers * 2:
+                chunk = list(islice(documents, self.chunk_size))
+                if not chunk:
+                    exhausted = True
+                    break
+                in_flight.add(pool.submit(_extract_chunk, chunk, tags, structures))
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,252 @@
+import random
+import threading
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+from usecases.fetch_url_use_case import FetchUrlUseCase
+from usecases.impl.fetch_url_use_case_impl import FetchUrlUseCaseImpl, fetch_result
+
+if TYPE_CHECKING:
+    from requests import Response
+
+# Statuses worth asking again: rate limited or a transient server failure
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+def retry_after(headers) -> Optional[float]:
+    """Return the seconds a Retry-After header asks to wait, None without one"""
+    value = (headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        # A "-0000" zone parses naive, HTTP dates are always in UTC
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, date.timestamp() - time.time())
+
+
+class RetryBudget:
+    """Token bucket bounding retries to a fraction of all requests.
+
+    Every request deposits ratio tokens and every retry takes one, so during
+    an outage retries add at most ratio extra load instead of multiplying it.
+    min_per_second tokens trickle in regardless, so a quiet run can still
+    retry its few failures.
+    """
+
+    def __init__(
+        self, ratio: float = 0.2, min_per_second: float = 1.0, max_tokens: float = 50.0
+    ):
+        """
+        Args:
+            ratio (float): Retries allowed per request sent
+            min_per_second (float): Retries allowed per second whatever the traffic
+            max_tokens (float): Most retries that can be saved up for a burst
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.max_tokens, self._tokens + (now - self._refilled) * self.min_per_second
+        )
+        self._refilled = now
+
+    def deposit(self):
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take a token for one retry, False when the budget is spent"""
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class CircuitBreaker:
+    """Per-host breaker that stops sending requests to a failing host.
+
+    After failure_threshold failures in a row the host's circuit opens and
+    requests to it fail at once. Once cooldown seconds have passed a single
+    probe is let through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        """
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            cooldown (float): Seconds an open circuit waits before probing
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        # host -> [consecutive failures, time opened or None, probe in flight]
+        self._hosts: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, host: str) -> float:
+        """Return 0 when a request may go to host, else the seconds until it may"""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or state[1] is None:
+                return 0.0
+            remaining = state[1] + self.cooldown - time.monotonic()
+            if remaining > 0:
+                return remaining
+            if state[2]:
+                return self.cooldown
+            state[2] = True
+            return 0.0
+
+    def record(self, host: str, ok: bool):
+        with self._lock:
+            if ok:
+                self._hosts.pop(host, None)
+                return
+            state = self._hosts.setdefault(host, [0, None, False])
+            state[0] += 1
+            if state[2] or state[0] >= self.failure_threshold:
+                state[1] = time.monotonic()
+                state[2] = False
+
+    def open_hosts(self) -> list[str]:
+        with self._lock:
+            return sorted(
+                host for host, state in self._hosts.items() if state[1] is not None
+            )
+
+
+class ResilientFetchUrlUseCaseImpl(FetchUrlUseCase):
+    """Retry transient failures of another fetch use case.
+
+    429, 5xx, connection errors and timeouts are retried with exponential
+    backoff and full jitter, or after the delay a Retry-After header asks for.
+    Retries draw on a budget shared by every thread, and a per-host circuit
+    breaker fails requests at once while a host keeps failing, so an outage
+    costs a few probes instead of every url's full retry schedule.
+    """
+
+    def __init__(
+        self,
+        delegate: Optional[FetchUrlUseCaseImpl] = None,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        max_retry_after: float = 120.0,
+        budget: Optional[RetryBudget] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        """
+        Args:
+            delegate (FetchUrlUseCaseImpl): Use case whose request() hits the network
+            max_retries (int): Retries per url after the first attempt
+            backoff (float): Seconds of the first backoff, doubled on every retry
+            max_backoff (float): Longest backoff between two attempts
+            max_retry_after (float): Longer Retry-After delays are not waited for
+            budget (RetryBudget): Bound on retries across all urls
+            breaker (CircuitBreaker): Per-host breaker, shared to share host health
+        """
+        self.delegate = delegate or FetchUrlUseCaseImpl()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.budget = budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker()
+
+    def execute(self, url: str) -> Tuple["Response", str]:
+        return fetch_result(self.request, url)
+
+    def request(self, url: str, headers: Optional[dict] = None) -> "Response":
+        """Send the request, retrying transient failures within the budget.
+
+        Raises:
+            RequestException: When the request still fails or the host's circuit is open
+        """
+        from requests import ConnectionError, RequestException, Timeout
+        from requests.exceptions import ChunkedEncodingError
+
+        host = urlsplit(url).netloc.lower()
+        self.budget.deposit()
+        attempt = 0
+        last = None
+        while True:
+            wait = self.breaker.allow(host)
+            if wait:
+                # The circuit opened during our own retries, report what the host said
+                if isinstance(last, Exception):
+                    raise last
+                if last is not None:
+                    return last
+                raise RequestException(
+                    f"Circuit open for {host}, next probe in {wait:.1f} s"
+                )
+            try:
+                response = self.delegate.request(url, headers=headers)
+            except (ConnectionError, Timeout, ChunkedEncodingError) as e:
+                self.breaker.record(host, False)
+                if not self._may_retry(attempt):
+                    raise
+                delay = self._backoff(attempt)
+                last = e
+            except RequestException:
+                # Invalid urls, redirect loops and the like say nothing about the host
+                self.breaker.record(host, True)
+                raise
+            else:
+                self.breaker.record(host, response.status_code < 500)
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                delay = retry_after(response.headers)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                elif delay > self.max_retry_after:
+                    return response
+                if not self._may_retry(attempt):
+                    return response
+                last = response
+            attempt += 1
+            time.sleep(delay)
+
+    def stream(
+        self, url: str, chunk_size: int = 1 << 16, max_bytes: Optional[int] = None
+    ) -> Tuple[Iterator[str], str]:
+        """Stream through the delegate without retries.
+
+        A body read in part cannot be replayed, so a failed stream is only
+        recorded with the circuit breaker.
+        """
+        host = urlsplit(url).netloc.lower()
+        wait = self.breaker.allow(host)
+        if wait:
+            message = f"Circuit open for {host}, next probe in {wait:.1f} s"
+            return None, f"An error occurred: {message}"
+        chunks, error = self.delegate.stream(
+            url, chunk_size=chunk_size, max_bytes=max_bytes
+        )
+        # The delegate reports network errors and bad statuses with these prefixes
+        failed = error.startswith(("An error occurred", "Failed to fetch URL: HTTP 5"))
+        self.breaker.record(host, not failed)
+        return chunks, error
+
+    def _may_retry(self, attempt: int) -> bool:
+        return attempt < self.max_retries and self.budget.withdraw()
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
@@ -0,0 +1,204 @@
+from html.parser import HTMLParser
+from typing import Iterable
+
+VOID_ELEMENTS = frozenset(
+    "area base br col embed hr img input link meta param source track wbr".split()
+)
+
+# Elements an implied end tag never closes across, HTML's "button scope"
+_SCOPE = frozenset(
+    "applet button caption html marquee object table td template th".split()
+)
+
+# Start tags that close an open <p>
+_CLOSES_P = frozenset(
+    (
+        "address article aside blockquote dd details dialog div dl dt fieldset"
+        " figcaption figure footer form h1 h2 h3 h4 h5 h6 header hgroup hr li"
+        " main menu nav ol p pre section table ul"
+    ).split()
+)
+
+# Start tag -> (open elements it closes, elements the search stops at), the
+# optional end tag rules of the HTML spec for the elements that have them
+_IMPLIED_ENDS = {
+    "li": (frozenset(("li",)), _SCOPE | {"ol", "ul"}),
+    "dd": (frozenset(("dd", "dt")), _SCOPE | {"dl"}),
+    "dt": (frozenset(("dd", "dt")), _SCOPE | {"dl"}),
+    "td": (frozenset(("td", "th")), frozenset(("table", "tr"))),
+    "th": (frozenset(("td", "th")), frozenset(("table", "tr"))),
+    "tr": (frozenset(("tr",)), frozenset(("table", "tbody", "tfoot", "thead"))),
+    "tbody": (frozenset(("tbody", "tfoot", "thead")), frozenset(("table",))),
+    "thead": (frozenset(("tbody", "tfoot", "thead")), frozenset(("table",))),
+    "tfoot": (frozenset(("tbody", "tfoot", "thead")), frozenset(("table",))),
+    "option": (frozenset(("option",)), frozenset(("datalist", "optgroup", "select"))),
+    "optgroup": (frozenset(("optgroup", "option")), frozenset(("datalist", "select"))),
+}
+
+_P = frozenset(("p",))
+
+
+def implied_end(open_elements: list[str], tag: str) -> int:
+    """Return how many of the open elements stay open when tag starts.
+
+    The rest end implicitly, as HTML closes an open li at the next li or a p
+    at the next block. open_elements lists names from the outermost on.
+    """
+    keep = len(open_elements)
+    if tag in _CLOSES_P:
+        keep = _closed_at(open_elements, keep, _P, _SCOPE)
+    implied = _IMPLIED_ENDS.get(tag)
+    if implied is not None:
+        keep = _closed_at(open_elements, keep, *implied)
+    return keep
+
+
+def _closed_at(open_elements, end, names, boundaries) -> int:
+    for index in range(end - 1, -1, -1):
+        tag = open_elements[index]
+        if tag in names:
+            return index
+        if tag in boundaries:
+            break
+    return end
+
+
+class _StopScan(Exception):
+    pass
+
+
+class FirstTagScanner(HTMLParser):
+    """Streaming tokenizer that captures the source of the first element of
+    each wanted tag and stops tokenizing once all of them have been seen.
+
+    Feed it a whole document or chunks as they arrive; ``feed`` returns True
+    as soon as nothing more is needed, so the caller can stop reading.
+    """
+
+    def __init__(self, tag_names: Iterable[str]):
+        super().__init__(convert_charrefs=False)
+        self.wanted = {name.lower() for name in tag_names}
+        self.fragments: dict[str, str] = {}
+        # Captured tag names in the order their elements start
+        self._started: list[str] = []
+        # Captured tags whose element lies inside another captured element
+        self.enclosed: set[str] = set()
+        # Names of the open elements, with the ends HTML leaves implicit applied
+        self._open: list[str] = []
+        # tag name -> [index in _open, captured source parts]
+        self._captures: dict[str, list] = {}
+
+    @property
+    def done(self) -> bool:
+        return len(self.fragments) == len(self.wanted)
+
+    def feed(self, data: str) -> bool:
+        if not self.done:
+            try:
+                super().feed(data)
+            except _StopScan:
+                pass
+        return self.done
+
+    def close(self) -> dict[str, str]:
+        """Finish scanning and return the captured fragments by tag name.
+
+        Fragments are ordered by where their elements start, so one that
+        encloses another comes before it.
+        """
+        if not self.done:
+            try:
+                super().close()
+            except _StopScan:
+                pass
+        # Elements left open at the end of the input are kept as they are
+        for tag, (_, parts) in self._captures.items():
+            self.fragments[tag] = "".join(parts)
+        self._captures.clear()
+        return {tag: self.fragments[tag] for tag in self._started}
+
+    def _append(self, text: str):
+        for capture in self._captures.values():
+            capture[1].append(text)
+
+    def _start(self, tag: str):
+        self._started.append(tag)
+        if self._captures:
+            self.enclosed.add(tag)
+
+    def _finish(self, tag: str, text: str):
+        self.fragments[tag] = text
+        if self.done:
+            raise _StopScan
+
+    def _pop_to(self, index: int):
+        """Close the open elements from index up, finishing their captures"""
+        while len(self._open) > index:
+            tag = self._open.pop()
+            capture = self._captures.get(tag)
+            if capture is not None and capture[0] == len(self._open):
+                del self._captures[tag]
+                self._finish(tag, "".join(capture[1]))
+
+    def handle_starttag(self, tag, attrs):
+        text = self.get_starttag_text()
+        self._pop_to(implied_end(self._open, tag))
+        self._append(text)
+        if tag in VOID_ELEMENTS:
+            if tag in self.wanted and tag not in self.fragments:
+                self._start(tag)
+                self._finish(tag, text)
+            return
+        if (
+            tag in self.wanted
+            and tag not in self.fragments
+            and tag not in self._captures
+        ):
+            self._start(tag)
+            self._captures[tag] = [len(self._open), [text]]
+        self._open.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        text = self.get_starttag_text()
+        self._append(text)
+        if (
+            tag in self.wanted
+            and tag not in self.fragments
+            and tag not in self._captures
+        ):
+            self._start(tag)
+            self._finish(tag, text)
+
+    def handle_endtag(self, tag):
+        for index in range(len(self._open) - 1, -1, -1):
+            if self._open[index] == tag:
+                break
+        else:
+            # A stray end tag closes nothing
+            self._append(f"</{tag}>")
+            return
+        # Elements still open inside it end implicitly, before its end tag
+        self._pop_to(index + 1)
+        self._append(f"</{tag}>")
+        self._pop_to(index)
+
+    def handle_data(self, data):
+        self._append(data)
+
+    def handle_entityref(self, name):
+        self._append(f"&{name};")
+
+    def handle_charref(self, name):
+        self._append(f"&#{name};")
+
+    def handle_comment(self, data):
+        self._append(f"<!--{data}-->")
+
+    def handle_decl(self, decl):
+        self._append(f"<!{decl}>")
+
+    def handle_pi(self, data):
+        self._append(f"<?{data}>")
+
+    def unknown_decl(self, data):
+        self._append(f"<![{data}]>")
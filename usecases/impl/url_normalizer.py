@@ -0,0 +1,81 @@
+import posixpath
+import re
+from typing import Optional, Tuple
+from urllib.parse import quote, urljoin, urlsplit, urlunsplit
+
+SCHEMES = ("http", "https")
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+# %XX escapes of unreserved characters, which mean the same decoded
+_UNRESERVED = re.compile(r"%(2[DdEe]|3[0-9]|[46][1-9A-Fa-f]|[57][0-9Aa]|5[Ff]|7[Ee])")
+_ESCAPE = re.compile(r"%[0-9a-fA-F]{2}")
+# Characters left as they are when quoting a path or query
+_PATH_SAFE = "/%:@!$&'()*+,;=~-._"
+_QUERY_SAFE = _PATH_SAFE + "?"
+
+
+def validate_url(url: str) -> str:
+    """Return an error message for a url that cannot be fetched, or an empty string"""
+    if not url:
+        return "URL cannot be empty or None"
+    try:
+        parts = urlsplit(url.strip())
+        parts.port
+    except ValueError as e:
+        return f"Invalid URL: {str(e)}"
+    if parts.scheme.lower() not in SCHEMES:
+        return f"Invalid URL: unsupported scheme in {url}"
+    if not parts.hostname:
+        return f"Invalid URL: no host in {url}"
+    return ""
+
+
+def _normalize_escapes(text: str) -> str:
+    text = _UNRESERVED.sub(lambda match: chr(int(match.group(1), 16)), text)
+    return _ESCAPE.sub(lambda match: match.group(0).upper(), text)
+
+
+def normalize_url(
+    url: str, base: Optional[str] = None, sort_query: bool = True
+) -> Tuple[str, str]:
+    """Return the canonical form of a url, resolved against base when relative.
+
+    Scheme and host are lowercased, default ports, fragments and dot segments
+    are removed, percent escapes are normalised and query parameters sorted,
+    so equivalent spellings of a page dedupe to one string.
+
+    Returns:
+        Tuple[str, str]: The canonical url and an error message
+    """
+    if base:
+        url = urljoin(base, url.strip())
+    error = validate_url(url)
+    if error:
+        return "", error
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    try:
+        host = parts.hostname.rstrip(".").encode("idna").decode("ascii")
+    except UnicodeError as e:
+        return "", f"Invalid URL: {str(e)}"
+    if ":" in host:
+        host = f"[{host}]"
+    port = parts.port
+    netloc = host if port in (None, _DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+    if parts.username:
+        userinfo = parts.username + (f":{parts.password}" if parts.password else "")
+        netloc = f"{userinfo}@{netloc}"
+
+    path = _normalize_escapes(quote(parts.path, safe=_PATH_SAFE)) or "/"
+    if "." in path:
+        trailing = path.endswith(("/", "/.", "/.."))
+        path = posixpath.normpath(path)
+        # normpath keeps a leading "//" and drops the trailing slash
+        path = "/" + path.lstrip("/")
+        if trailing and path != "/":
+            path += "/"
+
+    query = _normalize_escapes(quote(parts.query, safe=_QUERY_SAFE))
+    if query and sort_query:
+        query = "&".join(sorted(pair for pair in query.split("&") if pair))
+    return urlunsplit((scheme, netloc, path, query, "")), ""
@@ -0,0 +1,147 @@
+import re
+
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QRegularExpression, pyqtSignal
+from PyQt6.QtGui import QTextBlockUserData, QTextCursor, QTextDocument
+
+# Match { or } not preceded/followed by another
+SINGLE_BRACE = re.compile(r"(?<!\{)\{(?!\{)|(?<!\})\}(?!\})")
+_NON_SPACE = QRegularExpression(r"\S")
+
+
+class _BraceData(QTextBlockUserData):
+    """Number of single braces in the block it is attached to"""
+
+    def __init__(self, singles: int):
+        super().__init__()
+        self.singles = singles
+
+
+class BraceTracker(QObject):
+    """Track which blocks of a document contain single curly brackets.
+
+    Braces never pair across a line break, so a count is attached to every
+    block that has single braces and only blocks touched by an edit are
+    rescanned. Qt deletes the attached data together with its block, so the
+    flagged set only needs pruning after edits that remove line breaks.
+
+    Whether the document holds any non-whitespace text is tracked the same
+    way: edited blocks set it, and only edits that remove text search for
+    the first remaining character.
+    """
+
+    changed = pyqtSignal(bool)
+
+    def __init__(self, document: QTextDocument, parent=None):
+        super().__init__(parent)
+        self.document = None
+        self._flagged: set[_BraceData] = set()
+        self._block_count = 0
+        self._has_text = False
+        self.set_document(document)
+
+    @property
+    def flagged_blocks(self) -> int:
+        return len(self._flagged)
+
+    @property
+    def has_text(self) -> bool:
+        return self._has_text
+
+    @property
+    def has_single_braces(self) -> bool:
+        return bool(self._flagged)
+
+    def set_document(self, document: QTextDocument):
+        """Track another document, scanning it once"""
+        if self.document is not None and not sip.isdeleted(self.document):
+            self.document.contentsChange.disconnect(self._on_contents_change)
+        self.document = document
+        document.contentsChange.connect(self._on_contents_change)
+        self.rescan()
+
+    def rescan(self):
+        """Recount every block; the text is scanned in one regex pass and only
+        blocks with single braces are visited"""
+        had_single_braces = self.has_single_braces
+        for data in self._alive():
+            data.singles = 0
+        self._flagged = set()
+        text = self.document.toPlainText()
+        self._has_text = bool(text.strip())
+        line, scanned = 0, 0
+        for match in SINGLE_BRACE.finditer(text):
+            line += text.count("\n", scanned, match.start())
+            scanned = match.start()
+            block = self.document.findBlockByNumber(line)
+            data = block.userData()
+            if data is None or not data.singles:
+                self._update_block(block)
+        self._block_count = self.document.blockCount()
+        self._notify(had_single_braces)
+
+    def fix(self, cursor: QTextCursor):
+        """Double every single brace with in-place insertions as one undo step"""
+        blocks = []
+        block = self.document.begin()
+        while block.isValid():
+            data = block.userData()
+            if data is not None and data.singles:
+                blocks.append(block)
+            block = block.next()
+        if not blocks:
+            return
+
+        cursor.beginEditBlock()
+        # Edit from the end so earlier positions stay valid
+        for block in reversed(blocks):
+            matches = list(SINGLE_BRACE.finditer(block.text()))
+            for match in reversed(matches):
+                cursor.setPosition(block.position() + match.start())
+                cursor.insertText(match.group())
+        cursor.endEditBlock()
+
+    def _alive(self) -> list[_BraceData]:
+        return [data for data in self._flagged if not sip.isdeleted(data)]
+
+    def _update_block(self, block):
+        singles = len(SINGLE_BRACE.findall(block.text()))
+        data = block.userData()
+        if data is None:
+            if not singles:
+                return
+            data = _BraceData(singles)
+            block.setUserData(data)
+        data.singles = singles
+        if singles:
+            self._flagged.add(data)
+        else:
+            self._flagged.discard(data)
+
+    def _on_contents_change(self, position: int, removed: int, added: int):
+        had_single_braces = self.has_single_braces
+        touched = 0
+        filled = False
+        block = self.document.findBlock(position)
+        end = position + added
+        while block.isValid() and block.position() <= end:
+            self._update_block(block)
+            filled = filled or bool(block.text().strip())
+            touched += 1
+            block = block.next()
+        if filled:
+            self._has_text = True
+        elif removed and self._has_text:
+            self._has_text = not self.document.find(_NON_SPACE).isNull()
+
+        block_count = self.document.blockCount()
+        blocks_before = self._block_count + touched - block_count
+        self._block_count = block_count
+        if blocks_before > 1:
+            # The edit removed line breaks, drop data of deleted blocks
+            self._flagged = set(self._alive())
+        self._notify(had_single_braces)
+
+    def _notify(self, had_single_braces: bool):
+        if had_single_braces != self.has_single_braces:
+            self.changed.emit(self.has_single_braces)
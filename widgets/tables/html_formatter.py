@@ -0,0 +1,54 @@
+import re
+
+from usecases.impl.tag_scanner import VOID_ELEMENTS, implied_end
+
+_TOKEN = re.compile(
+    r"<!--.*?-->"
+    r"|<![^>]*>"
+    r"|<\?.*?\?>"
+    # Raw text elements are kept whole, their content is not markup
+    r"|<(script|style|textarea|pre)\b.*?</\1\s*>"
+    r"|<[^>]+>"
+    r"|[^<]+"
+    r"|<",
+    re.DOTALL | re.IGNORECASE,
+)
+_TAG_NAME = re.compile(r"</?\s*([\w:-]+)")
+
+
+def pretty_format_html(html: str, indent: str = "  ") -> str:
+    """Put every tag and text run on its own line, indented by nesting depth.
+
+    Works on the raw token stream without building a tree, so it handles
+    multi-megabyte pages quickly. Open elements are tracked with the end tags
+    HTML leaves implicit, so unclosed li, p or td do not nest ever deeper.
+    Comments, doctypes and the bodies of raw text elements such as script and
+    style are kept as they are.
+    """
+    lines = []
+    open_elements: list[str] = []
+    for match in _TOKEN.finditer(html):
+        token = match.group()
+        if not token.startswith("<") or token == "<":
+            text = " ".join(token.split())
+            if text:
+                lines.append(indent * len(open_elements) + text)
+            continue
+        name_match = _TAG_NAME.match(token)
+        if name_match is None or match.group(1) is not None:
+            lines.append(indent * len(open_elements) + token.strip())
+            continue
+        name = name_match.group(1).lower()
+        if token.startswith("</"):
+            # Elements left open inside it end with it, a stray end tag ends nothing
+            for index in range(len(open_elements) - 1, -1, -1):
+                if open_elements[index] == name:
+                    del open_elements[index:]
+                    break
+            lines.append(indent * len(open_elements) + token.strip())
+            continue
+        del open_elements[implied_end(open_elements, name) :]
+        lines.append(indent * len(open_elements) + token.strip())
+        if not token.endswith("/>") and name not in VOID_ELEMENTS:
+            open_elements.append(name)
+    return "\n".join(lines)
@@ -0,0 +1,62 @@
+import re
+
+from PyQt6.QtGui import QColor, QFont, QSyntaxHighlighter, QTextCharFormat
+
+# Block states: blocks outside the visible window are left unformatted
+NOT_HIGHLIGHTED = -1
+HIGHLIGHTED = 1
+
+
+def _format(color: str, bold: bool = False, italic: bool = False) -> QTextCharFormat:
+    text_format = QTextCharFormat()
+    text_format.setForeground(QColor(color))
+    if bold:
+        text_format.setFontWeight(QFont.Weight.Bold)
+    text_format.setFontItalic(italic)
+    return text_format
+
+
+class HtmlHighlighter(QSyntaxHighlighter):
+    """HTML syntax highlighter that only formats the visible window.
+
+    Qt already limits highlightBlock to blocks touched by an edit; blocks
+    outside the window set by ``set_visible_range`` are skipped, and are
+    formatted when they scroll into view.
+    """
+
+    RULES = [
+        (re.compile(r"</?[\w:-]+|/?>"), _format("#1565c0", bold=True)),
+        (re.compile(r"\s([\w:-]+)(?==)"), _format("#6a1b9a")),
+        (re.compile(r"\"[^\"]*\"|'[^']*'"), _format("#2e7d32")),
+        (re.compile(r"&#?\w+;"), _format("#ef6c00")),
+        (re.compile(r"<!--.*?-->|<!\w[^>]*>"), _format("#9e9e9e", italic=True)),
+    ]
+
+    # Only the head of very long lines, such as minified pages, is formatted
+    MAX_BLOCK_LENGTH = 10_000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._first = 0
+        self._last = -1
+
+    def set_visible_range(self, first: int, last: int):
+        """Highlight blocks first..last that have not been highlighted yet"""
+        self._first, self._last = first, last
+        block = self.document().findBlockByNumber(first)
+        while block.isValid() and block.blockNumber() <= last:
+            if block.userState() != HIGHLIGHTED:
+                self.rehighlightBlock(block)
+            block = block.next()
+
+    def highlightBlock(self, text):
+        number = self.currentBlock().blockNumber()
+        if not self._first <= number <= self._last:
+            self.setCurrentBlockState(NOT_HIGHLIGHTED)
+            return
+        text = text[: self.MAX_BLOCK_LENGTH]
+        for pattern, text_format in self.RULES:
+            for match in pattern.finditer(text):
+                start, end = match.span(match.lastindex or 0)
+                self.setFormat(start, end - start, text_format)
+        self.setCurrentBlockState(HIGHLIGHTED)
@@ -0,0 +1,249 @@
+from typing import Optional
+
+from PyQt6.QtCore import QTimer, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QFontDatabase, QPainter
+from PyQt6.QtWidgets import (
+    QAbstractScrollArea,
+    QCheckBox,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+from models.mapped_text_file import MappedTextFile
+
+# Characters drawn per line, the rest of a very long line is cut off
+MAX_LINE_CHARS = 4000
+# Bytes indexed per timer tick while a file is being opened
+INDEX_STEP_BYTES = 8 << 20
+# Bytes searched per timer tick, case-insensitive search runs at ~100 MB/s
+SEARCH_STEP_BYTES = 2 << 20
+
+
+class LargeTextView(QAbstractScrollArea):
+    """Read-only view painting only the visible lines of a MappedTextFile"""
+
+    # Emitted after every indexing step, while the line count grows
+    indexed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.mapped: Optional[MappedTextFile] = None
+        self.match_line = -1
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+
+        # Line offsets are indexed a slice at a time so the first screen shows
+        # immediately and the scroll range grows as indexing proceeds
+        self.index_timer = QTimer(self)
+        self.index_timer.setInterval(0)
+        self.index_timer.timeout.connect(self._index_step)
+
+    def set_file(self, mapped: Optional[MappedTextFile]):
+        self.mapped = mapped
+        self.match_line = -1
+        self.verticalScrollBar().setValue(0)
+        self.horizontalScrollBar().setValue(0)
+        self._update_ranges()
+        if mapped is not None and not mapped.indexed:
+            self.index_timer.start()
+        self.viewport().update()
+
+    def _index_step(self):
+        if self.mapped is None or self.mapped.index_step(INDEX_STEP_BYTES):
+            self.index_timer.stop()
+        self._update_ranges()
+        self.viewport().update()
+        self.indexed.emit()
+
+    def line_height(self) -> int:
+        return self.fontMetrics().lineSpacing()
+
+    def visible_line_count(self) -> int:
+        return max(1, self.viewport().height() // self.line_height())
+
+    def _update_ranges(self):
+        line_count = self.mapped.line_count if self.mapped is not None else 0
+        page = self.visible_line_count()
+        vertical = self.verticalScrollBar()
+        vertical.setRange(0, max(0, line_count - page))
+        vertical.setPageStep(page)
+        horizontal = self.horizontalScrollBar()
+        horizontal.setPageStep(self.viewport().width())
+        horizontal.setSingleStep(self.fontMetrics().averageCharWidth() * 4)
+
+    def go_to_line(self, line: int, column: int = 0):
+        """Scroll so a line is on screen and mark it as the current match"""
+        self.match_line = line
+        vertical = self.verticalScrollBar()
+        if not vertical.value() <= line < vertical.value() + self.visible_line_count():
+            vertical.setValue(max(0, line - self.visible_line_count() // 3))
+        x = column * self.fontMetrics().averageCharWidth()
+        horizontal = self.horizontalScrollBar()
+        if not horizontal.value() <= x < horizontal.value() + self.viewport().width():
+            horizontal.setValue(max(0, x - self.viewport().width() // 3))
+        self.viewport().update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_ranges()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        painter.fillRect(event.rect(), self.palette().base())
+        if self.mapped is None:
+            return
+        metrics = self.fontMetrics()
+        height = self.line_height()
+        first = self.verticalScrollBar().value()
+        left = -self.horizontalScrollBar().value()
+        lines = self.mapped.lines(first, self.visible_line_count() + 1, MAX_LINE_CHARS)
+
+        widest = 0
+        painter.setPen(self.palette().text().color())
+        for row, text in enumerate(lines):
+            top = row * height
+            if first + row == self.match_line:
+                painter.fillRect(
+                    0, top, self.viewport().width(), height, QColor("#fff59d")
+                )
+            painter.drawText(left, top + metrics.ascent(), text)
+            widest = max(widest, len(text))
+
+        # Widen the horizontal range to the longest line seen so far
+        horizontal = self.horizontalScrollBar()
+        needed = widest * metrics.averageCharWidth() - self.viewport().width()
+        if needed > horizontal.maximum():
+            horizontal.setMaximum(needed)
+
+
+class LargeTextViewer(QWidget):
+    """Read-only viewer with search for files too large for a text edit.
+
+    The file is memory-mapped, so opening a dump of hundreds of MB costs one
+    pass over its line offsets and searching never copies it into Python
+    strings. Indexing and searching both run a slice per timer tick, so the
+    window stays responsive on files of several GB.
+    """
+
+    closed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.mapped: Optional[MappedTextFile] = None
+        self.match_offset = -1
+        # A match found past the indexed part, shown once indexing reaches it
+        self.pending_offset = -1
+        # (text, case sensitive, next offset, wrapped) of the running search
+        self._search = None
+        self.search_timer = QTimer(self)
+        self.search_timer.setInterval(0)
+        self.search_timer.timeout.connect(self._search_step)
+        self.setupUI()
+
+    def setupUI(self):
+        self.searchEdit = QLineEdit()
+        self.searchEdit.setPlaceholderText("Search...")
+        self.searchEdit.returnPressed.connect(self.find_next)
+
+        self.chk_case = QCheckBox("Match case")
+
+        self.btn_find = QPushButton("Find Next")
+        self.btn_find.clicked.connect(self.find_next)
+
+        self.btn_close = QPushButton("Close")
+        self.btn_close.setToolTip("Close the file and return to the editor")
+        self.btn_close.clicked.connect(self.close_file)
+
+        self.statusLabel = QLabel()
+
+        search_layout = QHBoxLayout()
+        search_layout.addWidget(self.searchEdit)
+        search_layout.addWidget(self.chk_case)
+        search_layout.addWidget(self.btn_find)
+        search_layout.addWidget(self.btn_close)
+
+        self.view = LargeTextView(self)
+        self.view.indexed.connect(self._show_pending_match)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(search_layout)
+        layout.addWidget(self.view)
+        layout.addWidget(self.statusLabel)
+
+    def open(self, path: str, encoding: str = "utf-8"):
+        self._release()
+        self.mapped = MappedTextFile(path, encoding)
+        self.match_offset = -1
+        self.pending_offset = -1
+        self.view.set_file(self.mapped)
+        self.statusLabel.setText(f"{path} ({self.mapped.size / (1 << 20):.1f} MB)")
+
+    def find_next(self):
+        """Jump to the next match after the current one, wrapping at the end"""
+        text = self.searchEdit.text()
+        if self.mapped is None or not text:
+            return
+        # With no match yet there is nothing before the start to wrap to
+        self._search = [
+            text,
+            self.chk_case.isChecked(),
+            self.match_offset + 1,
+            self.match_offset < 0,
+        ]
+        self.statusLabel.setText(f"Searching for '{text}'...")
+        self.search_timer.start()
+
+    def _search_step(self):
+        text, case_sensitive, start, wrapped = self._search
+        end = min(start + SEARCH_STEP_BYTES, self.mapped.size)
+        offset = self.mapped.search(text, start, case_sensitive, end)
+        if offset < 0:
+            if end < self.mapped.size:
+                self._search[2] = end
+            elif not wrapped:
+                self._search[2:] = [0, True]
+            else:
+                self.search_timer.stop()
+                self.statusLabel.setText(f"'{text}' not found")
+            return
+        self.search_timer.stop()
+        self.match_offset = offset
+        if not self.mapped.covers(offset):
+            # The line is only known once the index timer gets there
+            self.pending_offset = offset
+            self.statusLabel.setText("Indexing up to the match...")
+            return
+        self._go_to_offset(offset)
+
+    def _show_pending_match(self):
+        if self.pending_offset >= 0 and self.mapped.covers(self.pending_offset):
+            self._go_to_offset(self.pending_offset)
+
+    def _go_to_offset(self, offset: int):
+        self.pending_offset = -1
+        line = self.mapped.line_of(offset)
+        # Byte distance approximates the column for mostly-ASCII markup
+        self.view.go_to_line(line, offset - self.mapped.line_start(line))
+        count = f"{self.mapped.line_count}{'' if self.mapped.indexed else '+'}"
+        self.statusLabel.setText(f"Line {line + 1} of {count}")
+
+    def close_file(self):
+        self._release()
+        self.closed.emit()
+
+    def _release(self):
+        self.pending_offset = -1
+        self.search_timer.stop()
+        self.view.index_timer.stop()
+        self.view.set_file(None)
+        if self.mapped is not None:
+            self.mapped.close()
+            self.mapped = None
@@ -0,0 +1,115 @@
+import math
+
+from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtWidgets import (
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from interface_adapter.controller.metrics import Metrics
+
+# (header, snapshot key, scale) of every column, latencies shown in ms
+COLUMNS = (
+    ("Stage", "stage", None),
+    ("Host", "host", None),
+    ("Calls", "calls", 1),
+    ("p50 ms", "p50", 1000),
+    ("p99 ms", "p99", 1000),
+    ("Max ms", "max", 1000),
+    ("Total s", "seconds", 1),
+    ("Bytes", "bytes", 1),
+    ("Matches", "matches", 1),
+    ("Errors", "errors", 1),
+    ("Cache hits", "cache_hits", 1),
+)
+
+# Refresh period of the live table
+REFRESH_MS = 1000
+
+
+class MetricsPanel(QWidget):
+    """Live table of the per-stage and per-host metrics of a controller"""
+
+    def __init__(self, metrics: Metrics, parent=None):
+        super().__init__(parent)
+        self.metrics = metrics
+        self.setupUI()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def setupUI(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        bar = QHBoxLayout()
+        self.summary = QLabel()
+        self.reset_button = QPushButton("Reset")
+        self.reset_button.clicked.connect(self.reset)
+        bar.addWidget(self.summary)
+        bar.addStretch()
+        bar.addWidget(self.reset_button)
+        layout.addLayout(bar)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels([header for header, _, _ in COLUMNS])
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.ResizeToContents
+        )
+        layout.addWidget(self.table)
+
+    def showEvent(self, event):
+        # Only poll while the panel can be seen
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def reset(self):
+        self.metrics.reset()
+        self.refresh()
+
+    def refresh(self):
+        rows = self.metrics.snapshot()
+        self.table.setRowCount(len(rows))
+        for row_index, row in enumerate(rows):
+            for column, (_, key, scale) in enumerate(COLUMNS):
+                item = QTableWidgetItem(_format(row.get(key), scale))
+                if scale is not None:
+                    item.setTextAlignment(
+                        Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+                    )
+                self.table.setItem(row_index, column, item)
+        errors = sum(row.get("errors", 0) for row in rows)
+        fetched = sum(row.get("bytes", 0) for row in rows if row["stage"] == "fetch")
+        self.summary.setText(
+            f"{len(rows)} series, {fetched / (1 << 20):.1f} MB fetched,"
+            f" {errors:g} errors"
+        )
+
+
+def _format(value, scale) -> str:
+    if value is None:
+        return ""
+    if scale is None:
+        return str(value)
+    value *= scale
+    if isinstance(value, float) and math.isnan(value):
+        return ""
+    if scale == 1000:
+        return f"{value:.1f}"
+    if value != int(value):
+        return f"{value:.3f}"
+    return f"{int(value):,}"
@@ -0,0 +1,165 @@
+import heapq
+from typing import Optional
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from models.columnar_result_store import ColumnarResultStore
+
+
+class ResultTableModel(QAbstractTableModel):
+    """Lazy table model over a ColumnarResultStore.
+
+    Rows are exposed a page at a time through canFetchMore/fetchMore and
+    cells are read from the store only when the view paints them. Sorting and
+    filtering keep a single list of row indices instead of copying rows, and
+    rows appended later are filtered and merged into it on their own.
+    """
+
+    MAX_DISPLAY_CHARS = 200
+
+    def __init__(self, store: ColumnarResultStore, page_size: int = 1000, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.page_size = page_size
+        self._rows: Optional[list[int]] = None  # None keeps insertion order
+        self._keys: list = []  # sort key of every store row, while sorted
+        self._seen = 0  # store rows placed in _rows
+        self._loaded = 0
+        self._sort: Optional[tuple[int, bool]] = None
+        self._filter = ""
+
+    def _available(self) -> int:
+        return len(self.store) if self._rows is None else len(self._rows)
+
+    def _store_row(self, row: int) -> int:
+        return row if self._rows is None else self._rows[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            value = self.store.value(self._store_row(index.row()), index.column())
+            if value is None:
+                return ""
+            text = str(value)
+            if (
+                role == Qt.ItemDataRole.DisplayRole
+                and len(text) > self.MAX_DISPLAY_CHARS
+            ):
+                return text[: self.MAX_DISPLAY_CHARS] + "…"
+            return text[:4000]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.store.columns[section]
+        return str(section + 1)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < self._available()
+
+    def fetchMore(self, parent=QModelIndex()):
+        count = min(self.page_size, self._available() - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if column < 0:
+            self._sort = None
+        else:
+            self._sort = (column, order == Qt.SortOrder.DescendingOrder)
+        self._apply()
+
+    def set_filter(self, text: str):
+        """Show only rows with a cell containing text, case-insensitively"""
+        self._filter = text.lower()
+        self._apply()
+
+    def refresh(self):
+        """Pick up rows appended to the store since the last refresh"""
+        size = len(self.store)
+        added = range(self._seen, size)
+        self._seen = size
+        if self._rows is not None and added:
+            self._place(added)
+        if self._loaded < self.page_size and self.canFetchMore():
+            self.fetchMore()
+
+    def reset(self):
+        """Rebuild the rows after the store was cleared or replaced"""
+        self._apply()
+
+    def _matches(self, value) -> bool:
+        return value is not None and self._filter in str(value).lower()
+
+    def _place(self, added: range):
+        """Filter and sort only the added rows, then merge them into _rows"""
+        if self._filter:
+            added = self.store.matching_rows(self._matches, rows=added)
+        if not added:
+            return
+        if self._sort is None:
+            # Matches past the loaded rows, the view fetches them as it scrolls
+            self._rows.extend(added)
+            return
+        column, reverse = self._sort
+        self._keys.extend(self.store.sort_keys(column, start=len(self._keys)))
+        key = self._keys.__getitem__
+        new = set(added)
+        self._rows = list(
+            heapq.merge(
+                self._rows,
+                sorted(added, key=key, reverse=reverse),
+                key=key,
+                reverse=reverse,
+            )
+        )
+        # Announce the new rows landing among the loaded ones, in order so
+        # each run's position is already final when it is announced
+        runs = []
+        old = 0
+        for position, row in enumerate(self._rows):
+            if old == self._loaded:
+                break
+            if row not in new:
+                old += 1
+            elif runs and runs[-1][1] == position:
+                runs[-1][1] += 1
+            else:
+                runs.append([position, position + 1])
+        for first, end in runs:
+            self.beginInsertRows(QModelIndex(), first, end - 1)
+            self._loaded += end - first
+            self.endInsertRows()
+
+    def _apply(self):
+        self.beginResetModel()
+        size = len(self.store)
+        rows = None
+        if self._filter:
+            rows = self.store.matching_rows(self._matches, rows=range(size))
+        if self._sort is not None:
+            column, reverse = self._sort
+            self._keys = self.store.sort_keys(column)
+            rows = sorted(
+                range(size) if rows is None else rows,
+                key=self._keys.__getitem__,
+                reverse=reverse,
+            )
+        else:
+            self._keys = []
+        self._rows = rows
+        self._seen = size
+        self._loaded = min(self.page_size, self._available())
+        self.endResetModel()
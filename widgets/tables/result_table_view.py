@@ -0,0 +1,71 @@
+from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QLineEdit,
+    QTableView,
+    QHeaderView,
+    QAbstractItemView,
+)
+
+from models.columnar_result_store import ColumnarResultStore
+from widgets.tables.result_table_model import ResultTableModel
+
+
+class ResultTableView(QWidget):
+    """Reusable results table with a filter box over a ResultTableModel"""
+
+    def __init__(self, store: ColumnarResultStore, parent=None, page_size=1000):
+        super().__init__(parent)
+        self.model = ResultTableModel(store, page_size=page_size, parent=self)
+        self.setupUI()
+
+    def setupUI(self):
+        self.filterEdit = QLineEdit()
+        self.filterEdit.setPlaceholderText("Filter results...")
+        self.filterEdit.setClearButtonEnabled(True)
+
+        # Debounce filtering so typing does not rescan the store per keystroke
+        self.filterTimer = QTimer(self)
+        self.filterTimer.setSingleShot(True)
+        self.filterTimer.setInterval(250)
+        self.filterTimer.timeout.connect(self.apply_filter)
+        self.filterEdit.textChanged.connect(self.filterTimer.start)
+
+        self.tableView = QTableView()
+        self.tableView.setModel(self.model)
+        # Start unsorted, enabling sorting would otherwise sort by column 0
+        self.tableView.horizontalHeader().setSortIndicator(
+            -1, Qt.SortOrder.AscendingOrder
+        )
+        self.tableView.setSortingEnabled(True)
+        self.tableView.setWordWrap(False)
+        self.tableView.setSelectionBehavior(
+            QAbstractItemView.SelectionBehavior.SelectRows
+        )
+        self.tableView.setVerticalScrollMode(
+            QAbstractItemView.ScrollMode.ScrollPerPixel
+        )
+        # Fixed row heights let the view skip measuring every row
+        vertical_header = self.tableView.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(22)
+        horizontal_header = self.tableView.horizontalHeader()
+        horizontal_header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        horizontal_header.setStretchLastSection(True)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.filterEdit)
+        layout.addWidget(self.tableView)
+
+    def apply_filter(self):
+        self.model.set_filter(self.filterEdit.text())
+
+    def refresh(self):
+        """Call after appending rows to the store"""
+        self.model.refresh()
+
+    def reset(self):
+        """Call after clearing or replacing the rows of the store"""
+        self.model.reset()
@@ -1,6 +1,18 @@
+import os
 import re
-from PyQt6.QtGui import QFont
+import tempfile
+from PyQt6.QtCore import (
+    QObject,
+    QPoint,
+    QRunnable,
+    QThread,
+    QThreadPool,
+    QTimer,
+    pyqtSignal,
+)
+from PyQt6.QtGui import QFont, QTextDocument
 from PyQt6.QtWidgets import (
+    QApplication,
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
@@ -8,9 +20,17 @@ from PyQt6.QtWidgets import (
     QSizePolicy,
     QPushButton,
     QCheckBox,
+    QFileDialog,
 )
 
 from interface_adapter.controller.controller import Controller
+from widgets.tables.brace_tracker import BraceTracker
+from widgets.tables.html_formatter import pretty_format_html
+from widgets.tables.html_highlighter import HtmlHighlighter
+from widgets.tables.large_text_viewer import LargeTextViewer
+
+# Text past this size is opened in the memory-mapped viewer instead of the editor
+LARGE_TEXT_BYTES = 8 << 20
 
 
 class TableTextWidget(QWidget):
@@ -19,6 +39,7 @@ class TableTextWidget(QWidget):
     def __init__(self, parent=None, controller: Controller = None):
         super().__init__(parent)
         self.controller = controller
+        self._spill_path = None
         self.setupUI()
 
     def setupUI(self):
@@ -39,6 +60,14 @@ class TableTextWidget(QWidget):
         self.btn_fix_braces.setToolTip("Double all single curly brackets { } to {{ }}")
         self.btn_fix_braces.clicked.connect(self.double_curly_brackets)
 
+        self.btn_pretty = QPushButton("Pretty HTML")
+        self.btn_pretty.setToolTip("Format the HTML structure and highlight it")
+        self.btn_pretty.clicked.connect(self.pretty_html)
+
+        self.btn_open = QPushButton("Open File")
+        self.btn_open.setToolTip("Open a file, large files open in a read-only viewer")
+        self.btn_open.clicked.connect(self.choose_file)
+
         # Auto-double checkbox
         self.chk_auto_double = QCheckBox("Auto-double { } as you type")
         self.chk_auto_double.setChecked(True)  # Enabled by default
@@ -58,7 +87,16 @@ class TableTextWidget(QWidget):
         self.textEdit.setFont(QFont("Arial", 8))
         self.textEdit.setLineWrapMode(QTextEdit.LineWrapMode.WidgetWidth)  # Word wrap
         self.textEdit.setAcceptRichText(False)  # Plain text only
-        self.textEdit.textChanged.connect(self.update_button_states)
+
+        # Single braces are tracked per edited block, button states are
+        # refreshed once typing pauses instead of on every keystroke
+        self.brace_tracker = BraceTracker(self.textEdit.document(), self)
+        self.state_timer = QTimer(self)
+        self.state_timer.setSingleShot(True)
+        self.state_timer.setInterval(150)
+        self.state_timer.timeout.connect(self.update_button_states)
+        self.textEdit.textChanged.connect(self.state_timer.start)
+        self.textEdit.documentReplaced.connect(self.brace_tracker.set_document)
         self.textEdit.set_auto_double_checkbox(self.chk_auto_double)
         self.textEdit.setTabStopDistance(40)  # Set tab width to 40 pixels
 
@@ -94,6 +132,8 @@ class TableTextWidget(QWidget):
         button_layout.addWidget(self.btn_clear)
         button_layout.addWidget(self.btn_copy)
         button_layout.addWidget(self.btn_fix_braces)
+        button_layout.addWidget(self.btn_pretty)
+        button_layout.addWidget(self.btn_open)
         button_layout.addWidget(self.chk_auto_double)  # Add checkbox
         button_layout.addStretch()  # Push to left
 
@@ -106,6 +146,10 @@ class TableTextWidget(QWidget):
         # Add the text edit directly (Option 1)
         main_layout.addWidget(self.textEdit)
 
+        # Read-only viewer for documents too large for the editor, built
+        # the first time one is opened
+        self.largeViewer = None
+
         # OR use group box (Option 2 - uncomment and comment line above)
         # main_layout.addWidget(self.text_group)
 
@@ -117,6 +161,70 @@ class TableTextWidget(QWidget):
         # Initial button state
         self.update_button_states()
 
+    def show_result(self, text: str, error: str = ""):
+        """Replace the editor content with a job result or its error.
+
+        Results too large for the editor are written to a temporary file and
+        shown in the read-only viewer.
+        """
+        text = error or text
+        self.close_large_viewer()
+        if len(text) > LARGE_TEXT_BYTES:
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", suffix=".html", delete=False
+            ) as file:
+                file.write(text)
+            self._spill_path = file.name
+            self.open_large_file(file.name)
+            return
+        self.textEdit.setPlainText(text)
+
+    def choose_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open File")
+        if path:
+            self.open_file(path)
+
+    def open_file(self, path: str):
+        """Open a file in the editor, or in the viewer when it is large"""
+        self.close_large_viewer()
+        if os.path.getsize(path) > LARGE_TEXT_BYTES:
+            self.open_large_file(path)
+            return
+        with open(path, encoding="utf-8", errors="replace") as file:
+            text = file.read()
+        self.textEdit.setPlainText(text)
+
+    def open_large_file(self, path: str):
+        """Show a file in the memory-mapped viewer in place of the editor"""
+        if self.largeViewer is None:
+            self.largeViewer = LargeTextViewer(self)
+            self.largeViewer.closed.connect(self.close_large_viewer)
+            layout = self.layout()
+            layout.insertWidget(layout.indexOf(self.textEdit) + 1, self.largeViewer)
+        self.largeViewer.open(path)
+        self.textEdit.hide()
+        self.largeViewer.show()
+        self.update_button_states()
+
+    def close_large_viewer(self):
+        if self.largeViewer is None:
+            return
+        if self.largeViewer.mapped is not None:
+            self.largeViewer.close_file()
+            return
+        self.largeViewer.hide()
+        self.textEdit.show()
+        self._remove_spill()
+        self.update_button_states()
+
+    def _remove_spill(self):
+        if self._spill_path is not None:
+            try:
+                os.remove(self._spill_path)
+            except OSError:
+                pass
+            self._spill_path = None
+
     def clear_text(self):
         self.textEdit.clear()
         self.textEdit.setFocus()
@@ -129,38 +237,83 @@ class TableTextWidget(QWidget):
 
     def update_button_states(self):
         """Enable/disable buttons based on text content"""
-        has_text = bool(self.textEdit.toPlainText().strip())
+        viewing = self.largeViewer is not None and self.largeViewer.mapped is not None
+        has_text = not viewing and self.brace_tracker.has_text
         self.btn_clear.setEnabled(has_text)
         self.btn_copy.setEnabled(has_text)
         # Enable fix button if single braces exist
-        text = self.textEdit.toPlainText()
-        # Match { or } not preceded/followed by another
-        has_single_braces = bool(re.search(r"(?<!\{)\{(?!\{)|(?<!\})\}(?!\})", text))
+        has_single_braces = self.brace_tracker.has_single_braces
         self.btn_fix_braces.setEnabled(has_text and has_single_braces)
+        self.btn_pretty.setEnabled(has_text and not self.textEdit.is_formatting)
+
+    def pretty_html(self):
+        self.btn_pretty.setEnabled(False)
+        self.textEdit.pretty_html_struct()
 
     def double_curly_brackets(self):
-        """Manual: Double all single curly brackets in full text"""
-        text = self.textEdit.toPlainText()
-        # print(f"Manual fix - Original text: {text}")
+        """Manual: Double all single curly brackets in place"""
+        self.brace_tracker.fix(self.textEdit.textCursor())
+        self.update_button_states()
+        self.textEdit.setFocus()
 
-        # Double single { to {{ and } to }}, avoiding existing doubles
-        cleaned_text = re.sub(
-            r"(?<!\{)\{(?!\{)", "{{", re.sub(r"(?<!\})\}(?!\})", "}}", text)
-        )
 
-        # print(f"Manual fix - Doubled text: {cleaned_text}")
+class _FormatSignals(QObject):
+    # Sent as a Python object so the reference keeps the document alive
+    finished = pyqtSignal(object)
 
-        self.textEdit.setPlainText(cleaned_text)
-        self.update_button_states()
-        self.textEdit.setFocus()
+
+class _FormatTask(QRunnable):
+    """Pretty-print html and lay it into a new document on a pool thread"""
+
+    def __init__(self, html: str, font: QFont, target_thread: QThread):
+        super().__init__()
+        self.html = html
+        self.font = font
+        self.target_thread = target_thread
+        self.signals = _FormatSignals()
+
+    def run(self):
+        document = QTextDocument()
+        document.setDefaultFont(self.font)
+        document.setPlainText(pretty_format_html(self.html))
+        document.moveToThread(self.target_thread)
+        self.signals.finished.emit(document)
 
 
 class CustomTextEdit(QTextEdit):
     """Custom QTextEdit that auto-doubles curly brackets on typing/pasting"""
 
+    # Emitted after pretty-printing swapped in a new document
+    documentReplaced = pyqtSignal(QTextDocument)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.auto_double_checkbox = None
+        self.is_formatting = False
+        self._format_task = None
+
+        self.highlighter = HtmlHighlighter(parent=self)
+        self.highlighter.setDocument(self.document())
+        self.visible_timer = QTimer(self)
+        self.visible_timer.setSingleShot(True)
+        self.visible_timer.setInterval(30)
+        self.visible_timer.timeout.connect(self.update_visible_blocks)
+        self.verticalScrollBar().valueChanged.connect(
+            lambda _value: self.visible_timer.start()
+        )
+        self.textChanged.connect(self.visible_timer.start)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.visible_timer.start()
+
+    def update_visible_blocks(self):
+        """Tell the highlighter which blocks are on screen"""
+        first = self.cursorForPosition(QPoint(0, 0)).blockNumber()
+        last = self.cursorForPosition(
+            QPoint(self.viewport().width(), self.viewport().height())
+        ).blockNumber()
+        self.highlighter.set_visible_range(first, last)
 
     def set_auto_double_checkbox(self, checkbox):
         self.auto_double_checkbox = checkbox
@@ -213,5 +366,27 @@ class CustomTextEdit(QTextEdit):
         self.setTextCursor(cursor)
 
     def pretty_html_struct(self):
-        # TODO: need to add button pretty html and handle it
-        pass
+        """Format the HTML into a new document on a worker thread.
+
+        The GUI thread only swaps the finished document in; its layout is then
+        computed incrementally by Qt and only visible blocks are highlighted.
+        """
+        if self.is_formatting:
+            return
+        self.is_formatting = True
+        self._format_task = _FormatTask(
+            self.toPlainText(), self.font(), QApplication.instance().thread()
+        )
+        self._format_task.signals.finished.connect(self._apply_formatted)
+        QThreadPool.globalInstance().start(self._format_task)
+
+    def _apply_formatted(self, document: QTextDocument):
+        self._format_task = None
+        document.setDefaultTextOption(self.document().defaultTextOption())
+        # The previous document is a child of the editor and gets deleted
+        document.setParent(self)
+        self.setDocument(document)
+        self.highlighter.setDocument(document)
+        self.is_formatting = False
+        self.documentReplaced.emit(document)
+        self.textChanged.emit()
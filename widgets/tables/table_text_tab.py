@@ -2,46 +2,65 @@ from PyQt6.QtWidgets import (
     QTabWidget,
     QWidget,
     QHBoxLayout,
-    QTableWidget,
-    QTextEdit,
     QSizePolicy,
 )
 
+from interface_adapter.controller.controller import Controller
+from models.columnar_result_store import ColumnarResultStore
+from widgets.tables.result_table_view import ResultTableView
+from widgets.tables.table_text import TableTextWidget
+
 
 class TableTextTabWidget(QTabWidget):
-    """Reusable tab widget with table and text edit tabs"""
+    """Reusable tab widget with a results table tab and a text editor tab"""
 
-    def __init__(self, parent=None):
+    def __init__(
+        self,
+        parent=None,
+        store: ColumnarResultStore = None,
+        controller: Controller = None,
+    ):
         super().__init__(parent)
+        self.store = store or ColumnarResultStore(["url", "expression", "result"])
+        self.controller = controller
         self.setupUI()
 
     def setupUI(self):
-        self.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Ignored)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
 
         # Table tab
         tab1 = QWidget()
-        self.tableWidget = QTableWidget(10, 10)
+        self.tableView = ResultTableView(self.store)
         tab1hbox = QHBoxLayout()
         tab1hbox.setContentsMargins(5, 5, 5, 5)
-        tab1hbox.addWidget(self.tableWidget)
+        tab1hbox.addWidget(self.tableView)
         tab1.setLayout(tab1hbox)
 
         # Text edit tab
         tab2 = QWidget()
-        self.textEdit = QTextEdit()
-        self.textEdit.setPlainText(
-            "Twinkle, twinkle, little star,\n"
-            "How I wonder what you are.\n"
-            "Up above the world so high,\n"
-            "Like a diamond in the sky.\n"
-            "Twinkle, twinkle, little star,\n"
-            "How I wonder what you are!\n"
-        )
+        self.tableText = TableTextWidget(controller=self.controller)
 
         tab2hbox = QHBoxLayout()
         tab2hbox.setContentsMargins(5, 5, 5, 5)
-        tab2hbox.addWidget(self.textEdit)
+        tab2hbox.addWidget(self.tableText)
         tab2.setLayout(tab2hbox)
 
         self.addTab(tab1, "&Table")
         self.addTab(tab2, "Text &Edit")
+
+    def append_results(self, rows):
+        """Append rows in column order and show them in the table"""
+        self.store.append_rows(rows)
+        self.tableView.refresh()
+
+    def show_results(self, rows):
+        """Replace the table content with rows in column order"""
+        self.store.clear()
+        self.store.append_rows(rows)
+        self.tableView.reset()
+        self.setCurrentIndex(0)
+
+    def show_text(self, text: str, error: str = ""):
+        """Show a job's text result or its error in the editor tab"""
+        self.tableText.show_result(text, error)
+        self.setCurrentIndex(1)
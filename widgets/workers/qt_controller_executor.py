@@ -0,0 +1,76 @@
+import itertools
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+
+from interface_adapter.controller.controller_executor import ControllerExecutor
+
+
+class QtControllerExecutor(QObject):
+    """Deliver ControllerExecutor results to widgets through Qt signals.
+
+    Worker threads hand results over through a queued signal, so finished is
+    emitted on the GUI thread and the job bookkeeping is only touched there.
+    Jobs submitted under the same key supersede each other: the older one is
+    cancelled if it has not started, and its result is dropped if it has.
+    """
+
+    # job id, result, error message
+    finished = pyqtSignal(int, object, str)
+    # job id, key, result, error message, emitted from worker threads
+    _completed = pyqtSignal(int, object, object, str)
+
+    def __init__(self, executor: ControllerExecutor, parent=None):
+        super().__init__(parent)
+        self.executor = executor
+        self._ids = itertools.count(1)
+        self._latest: dict[str, int] = {}
+        self._futures: dict[str, Future] = {}
+        self._completed.connect(self._on_completed, Qt.ConnectionType.QueuedConnection)
+
+    def submit(self, fn: Callable, *args, key: Optional[str] = None) -> int:
+        """Run fn(*args), which returns a (result, error) tuple, on the I/O pool"""
+        return self.watch(self.executor.submit(fn, *args), key=key)
+
+    def watch(self, future: Future, key: Optional[str] = None) -> int:
+        """Emit finished for a future created on the executor"""
+        job_id = next(self._ids)
+        if key is not None:
+            previous = self._futures.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._latest[key] = job_id
+            self._futures[key] = future
+        future.add_done_callback(lambda done: self._deliver(job_id, key, done))
+        return job_id
+
+    def cancel(self, key: str):
+        future = self._futures.pop(key, None)
+        self._latest.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+    def _deliver(self, job_id: int, key: Optional[str], future: Future):
+        """Pass a finished future's result to the GUI thread, runs on the pool"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self._completed.emit(job_id, key, None, f"An error occurred: {str(error)}")
+            return
+        result, message = future.result()
+        self._completed.emit(job_id, key, result, message)
+
+    def _on_completed(self, job_id: int, key: Optional[str], result, message: str):
+        # Checked here rather than on the pool, a job submitted while this
+        # result was queued supersedes it too
+        if key is not None:
+            if self._latest.get(key) != job_id:
+                return
+            del self._latest[key]
+            self._futures.pop(key, None)
+        self.finished.emit(job_id, result, message)